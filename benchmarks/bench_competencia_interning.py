@@ -0,0 +1,65 @@
+"""
+Benchmark: custo do CompetenciaField.from_db_value em 1M linhas.
+
+Compara a criação de um Competencia novo por linha (comportamento antigo)
+com o from_int com cache de instâncias. Mede tempo e memória retida pela
+lista de resultados, como no _result_cache de um queryset.
+
+Uso: python benchmarks/bench_competencia_interning.py [linhas]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from financeiro.models import Competencia, Lancamento  # noqa: E402
+
+
+def valores_do_banco(linhas, periodos=300):
+    """Simula a coluna AAAAMM: poucas centenas de períodos distintos."""
+    base = Competencia(2020, 1)
+    distintos = [(base + i).as_int for i in range(periodos)]
+    rng = random.Random(42)
+    return [rng.choice(distintos) for _ in range(linhas)]
+
+
+def sem_cache(valor, expression, connection):
+    # Comportamento anterior: valida e aloca um objeto por linha
+    return Competencia(valor // 100, valor % 100)
+
+
+def medir(nome, converter, valores):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = [converter(v, None, None) for v in valores]
+    duracao = time.perf_counter() - inicio
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nome:<12} {duracao * 1000:>9.1f} ms   {atual / 2**20:>7.1f} MiB   "
+          f"{len({id(c) for c in resultado}):>9} objetos distintos")
+    return duracao, atual
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    valores = valores_do_banco(linhas)
+    campo = Lancamento._meta.get_field('competencia')
+
+    print(f"from_db_value em {linhas:,} linhas")
+    t_antes, m_antes = medir("sem cache", sem_cache, valores)
+    t_depois, m_depois = medir("com cache", campo.from_db_value, valores)
+    print(f"tempo: {t_antes / t_depois:.1f}x mais rápido, memória: {m_antes / m_depois:.1f}x menor")
+    print(Competencia.cache_info())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""
+Utilitários de teste de carga local (sem dependências de rede externas).
+
+- Servidor: sobe o projeto num subprocesso (runserver, gunicorn ou uvicorn)
+  numa porta livre de 127.0.0.1 e derruba ao sair do bloco `with`.
+- gerar_carga: N threads, cada uma com sua conexão HTTP keep-alive, executam
+  um "roteiro" até o fim da duração; devolve vazão, percentis e erros (e
+  percentis por etapa, se o roteiro devolver os tempos de cada uma).
+"""
+import http.client
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def comando_servidor(pilha, porta, workers=1, threads=8):
+    """Linha de comando para cada pilha; None se o servidor não estiver instalado."""
+    endereco = f"127.0.0.1:{porta}"
+    if pilha == 'runserver':
+        return [sys.executable, 'manage.py', 'runserver', endereco, '--noreload']
+    if pilha == 'gunicorn':
+        if not shutil.which('gunicorn'):
+            return None
+        return ['gunicorn', 'core.wsgi:application', '-b', endereco,
+                '-w', str(workers), '--threads', str(threads), '--log-level', 'warning']
+    if pilha == 'uvicorn':
+        if not shutil.which('uvicorn'):
+            return None
+        return ['uvicorn', 'core.asgi:application', '--host', '127.0.0.1', '--port', str(porta),
+                '--workers', str(workers), '--log-level', 'warning', '--no-access-log']
+    raise ValueError(f"Pilha desconhecida: {pilha}")
+
+
+class Servidor:
+    """Context manager: sobe o servidor e espera a porta responder."""
+
+    def __init__(self, pilha, workers=1, threads=8, espera=20):
+        self.pilha = pilha
+        self.porta = porta_livre()
+        self.comando = comando_servidor(pilha, self.porta, workers, threads)
+        self.espera = espera
+        self.processo = None
+
+    def __enter__(self):
+        if self.comando is None:
+            raise RuntimeError(f"{self.pilha} não está instalado.")
+        ambiente = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'core.settings'}
+        self.processo = subprocess.Popen(
+            self.comando, cwd=RAIZ, env=ambiente,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        limite = time.monotonic() + self.espera
+        while time.monotonic() < limite:
+            if self.processo.poll() is not None:
+                raise RuntimeError(f"{self.pilha} encerrou ao iniciar (código {self.processo.returncode}).")
+            try:
+                socket.create_connection(('127.0.0.1', self.porta), timeout=0.2).close()
+                return self
+            except OSError:
+                time.sleep(0.1)
+        self.__exit__()
+        raise RuntimeError(f"{self.pilha} não respondeu em {self.espera}s.")
+
+    def __exit__(self, *exc):
+        if self.processo and self.processo.poll() is None:
+            self.processo.terminate()
+            try:
+                self.processo.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.processo.kill()
+
+
+def percentil(ordenados, p):
+    if not ordenados:
+        return None
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+class Cliente:
+    """Conexão keep-alive com cookies, para roteiros de várias requisições."""
+
+    def __init__(self, porta, timeout=30):
+        self.porta = porta
+        self.timeout = timeout
+        self.cookies = {}
+        self.conexao = None
+
+    def requisitar(self, metodo, caminho, corpo=None, cabecalhos=None):
+        """Retorna (status, headers, corpo_bytes). Reabre a conexão se ela cair."""
+        cabecalhos = dict(cabecalhos or {})
+        if self.cookies:
+            cabecalhos['Cookie'] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        for tentativa in (1, 2):
+            if self.conexao is None:
+                self.conexao = http.client.HTTPConnection('127.0.0.1', self.porta, timeout=self.timeout)
+            try:
+                self.conexao.request(metodo, caminho, body=corpo, headers=cabecalhos)
+                resposta = self.conexao.getresponse()
+                conteudo = resposta.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                self.fechar()
+                if tentativa == 2:
+                    raise
+        for valor in resposta.headers.get_all('Set-Cookie') or []:
+            nome, _, resto = valor.partition('=')
+            self.cookies[nome.strip()] = resto.split(';', 1)[0]
+        return resposta.status, resposta.headers, conteudo
+
+    def fechar(self):
+        if self.conexao is not None:
+            self.conexao.close()
+            self.conexao = None
+
+
+def resumir_latencias(ordenadas):
+    """Percentis e máximo, em ms, de uma lista de segundos já ordenada."""
+    return {
+        f"p{p}": round(percentil(ordenadas, p) * 1000, 2) if ordenadas else None
+        for p in (50, 90, 95, 99)
+    } | {'max': round(ordenadas[-1] * 1000, 2) if ordenadas else None}
+
+
+def gerar_carga(porta, roteiro, concorrencia=8, duracao=10.0, aquecimento=1.0):
+    """
+    Executa `roteiro(cliente)` em loop, em `concorrencia` threads, por `duracao`s.
+
+    O roteiro faz uma ou mais requisições e levanta exceção em caso de erro;
+    cada execução completa conta como uma iteração. Se ele devolver um
+    dict {etapa: segundos}, o resultado traz também os percentis por etapa
+    ('etapas_ms'). O aquecimento inicial não entra nas estatísticas.
+    """
+    latencias, erros, etapas = [], {}, {}
+    trava = threading.Lock()
+    inicio_medicao = time.monotonic() + aquecimento
+    fim = inicio_medicao + duracao
+
+    def trabalhador():
+        cliente = Cliente(porta)
+        locais, erros_locais, etapas_locais = [], {}, {}
+        try:
+            while (agora := time.monotonic()) < fim:
+                try:
+                    tempos = roteiro(cliente)
+                    ok = True
+                except Exception as exc:  # erro conta na estatística, não derruba a thread
+                    ok = False
+                    nome = type(exc).__name__ if not str(exc) else f"{type(exc).__name__}: {exc}"
+                    cliente.fechar()
+                if agora >= inicio_medicao:
+                    if ok:
+                        locais.append(time.monotonic() - agora)
+                        for etapa, segundos in (tempos or {}).items():
+                            etapas_locais.setdefault(etapa, []).append(segundos)
+                    else:
+                        erros_locais[nome] = erros_locais.get(nome, 0) + 1
+        finally:
+            cliente.fechar()
+            with trava:
+                latencias.extend(locais)
+                for nome, total in erros_locais.items():
+                    erros[nome] = erros.get(nome, 0) + total
+                for etapa, tempos in etapas_locais.items():
+                    etapas.setdefault(etapa, []).extend(tempos)
+
+    threads = [threading.Thread(target=trabalhador) for _ in range(concorrencia)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencias.sort()
+    total_erros = sum(erros.values())
+    total = len(latencias) + total_erros
+    resultado = {
+        'concorrencia': concorrencia,
+        'duracao_s': duracao,
+        'iteracoes': len(latencias),
+        'iteracoes_por_s': round(len(latencias) / duracao, 2),
+        'latencia_ms': resumir_latencias(latencias),
+        'erros': total_erros,
+        'taxa_erro': round(total_erros / total, 4) if total else 0.0,
+        'erros_por_tipo': erros,
+    }
+    if etapas:
+        resultado['etapas_ms'] = {etapa: resumir_latencias(sorted(t)) for etapa, t in etapas.items()}
+    return resultado
+
+
+def preparar_banco(popular=0):
+    """Aplica as migrations e, opcionalmente, garante `popular` lançamentos no banco."""
+    sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from financeiro.models import Competencia, Lancamento, ResumoCompetencia
+
+    call_command('migrate', verbosity=0)
+    faltam = popular - Lancamento.objects.count()
+    if faltam > 0:
+        base = Competencia(2024, 1)
+        Lancamento.objects.bulk_create(
+            (Lancamento(descricao=f"Carga {i}", valor=i % 1000, competencia=base + i % 39) for i in range(faltam)),
+            batch_size=5000,
+        )
+        ResumoCompetencia.reconstruir()
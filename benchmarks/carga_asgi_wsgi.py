@@ -0,0 +1,61 @@
+"""
+Teste de carga: views síncronas sob WSGI x views assíncronas sob ASGI.
+
+Sobe cada pilha localmente, dispara GETs concorrentes na lista e compara
+requisições/s e latência (p50/p99). Saída em JSON.
+
+Uso:
+    python benchmarks/carga_asgi_wsgi.py --concorrencia 32 --duracao 15 --popular 100000
+
+Pilhas: WSGI usa gunicorn (ou runserver, se gunicorn não estiver instalado);
+ASGI usa uvicorn. Atenção: migra e popula o banco configurado em core.settings.
+"""
+import argparse
+import json
+import shutil
+import sys
+
+from carga import Servidor, gerar_carga, preparar_banco
+
+CENARIOS = [
+    # (nome, pilha, caminho)
+    ('wsgi_sync', 'gunicorn' if shutil.which('gunicorn') else 'runserver', '/lista/'),
+    ('asgi_async', 'uvicorn', '/async/lista/'),
+    # Referência: view síncrona servida por ASGI (adaptada pelo Django)
+    ('asgi_sync', 'uvicorn', '/lista/'),
+]
+
+
+def roteiro_get(caminho):
+    def roteiro(cliente):
+        status, _, _ = cliente.requisitar('GET', caminho)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+    return roteiro
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concorrencia', type=int, default=16)
+    parser.add_argument('--duracao', type=float, default=10.0, help="Segundos medidos por cenário")
+    parser.add_argument('--workers', type=int, default=1, help="Processos do servidor")
+    parser.add_argument('--popular', type=int, default=10_000, help="Lançamentos mínimos no banco")
+    args = parser.parse_args()
+
+    preparar_banco(args.popular)
+
+    resultados = {}
+    for nome, pilha, caminho in CENARIOS:
+        try:
+            with Servidor(pilha, workers=args.workers, threads=args.concorrencia) as servidor:
+                resultado = gerar_carga(servidor.porta, roteiro_get(caminho), args.concorrencia, args.duracao)
+        except RuntimeError as exc:
+            print(f"{nome}: ignorado ({exc})", file=sys.stderr)
+            continue
+        resultados[nome] = {'pilha': pilha, 'caminho': caminho, **resultado}
+
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
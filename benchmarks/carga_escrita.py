@@ -0,0 +1,125 @@
+"""
+Vazão de escrita com N escritores concorrentes, por perfil de banco.
+
+Cada perfil roda num subprocesso próprio (settings são lidos uma vez) com
+um arquivo SQLite temporário: N threads, cada uma com sua conexão, criam
+Lancamentos pelo ORM (com os signals do ResumoCompetencia) durante a
+duração. Conta gravações/s, latência e erros ("database is locked").
+
+Uso:
+    python benchmarks/carga_escrita.py --escritores 1,4,16 --duracao 5
+    python benchmarks/carga_escrita.py --perfis postgresql   # usa PG* do ambiente
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from carga import RAIZ, percentil
+
+PERFIS_PADRAO = 'sqlite-simples,sqlite'
+
+
+def medir(escritores, duracao):
+    """Executado no subprocesso, com o perfil já escolhido pelo ambiente."""
+    sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import OperationalError, connection
+    from financeiro.models import Competencia, Lancamento
+
+    call_command('migrate', verbosity=0)
+    connection.close()
+
+    latencias, erros = [], {}
+    trava = threading.Lock()
+    inicio = time.monotonic()
+    fim = inicio + duracao
+    base = Competencia(2024, 1)
+
+    def escritor(numero):
+        locais, erros_locais, i = [], {}, 0
+        try:
+            while (agora := time.monotonic()) < fim:
+                i += 1
+                try:
+                    Lancamento.objects.create(
+                        descricao=f"Escritor {numero} #{i}", valor=i % 1000, competencia=base + i % 39,
+                    )
+                    locais.append(time.monotonic() - agora)
+                except OperationalError as exc:
+                    erros_locais[str(exc)] = erros_locais.get(str(exc), 0) + 1
+        finally:
+            connection.close()
+            with trava:
+                latencias.extend(locais)
+                for nome, total in erros_locais.items():
+                    erros[nome] = erros.get(nome, 0) + total
+
+    threads = [threading.Thread(target=escritor, args=(n,)) for n in range(escritores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    decorrido = time.monotonic() - inicio
+
+    latencias.sort()
+    total_erros = sum(erros.values())
+    return {
+        'escritores': escritores,
+        'gravacoes': len(latencias),
+        'gravacoes_por_s': round(len(latencias) / decorrido, 1),
+        'latencia_ms': {
+            f"p{p}": round(percentil(latencias, p) * 1000, 2) if latencias else None
+            for p in (50, 99)
+        },
+        'erros': total_erros,
+        'taxa_erro': round(total_erros / (len(latencias) + total_erros), 4) if latencias or total_erros else 0.0,
+        'erros_por_tipo': erros,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--perfis', default=PERFIS_PADRAO, help="Perfis de core/banco.py, separados por vírgula")
+    parser.add_argument('--escritores', default='1,4,16', help="Números de escritores, separados por vírgula")
+    parser.add_argument('--duracao', type=float, default=5.0, help="Segundos por medição")
+    parser.add_argument('--filho', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        print(json.dumps(medir(int(args.escritores), args.duracao)))
+        return
+
+    resultados = {}
+    for perfil in args.perfis.split(','):
+        for escritores in map(int, args.escritores.split(',')):
+            with tempfile.TemporaryDirectory() as pasta:
+                ambiente = {
+                    **os.environ,
+                    'DJANGO_DB_PERFIL': perfil,
+                    'DJANGO_DB_NOME': os.path.join(pasta, 'carga.sqlite3'),
+                    'DJANGO_SETTINGS_MODULE': 'core.settings',
+                }
+                saida = subprocess.run(
+                    [sys.executable, __file__, '--filho', '--escritores', str(escritores),
+                     '--duracao', str(args.duracao)],
+                    env=ambiente, capture_output=True, text=True,
+                )
+            if saida.returncode != 0:
+                print(f"{perfil}/{escritores}: falhou\n{saida.stderr}", file=sys.stderr)
+                continue
+            resultados.setdefault(perfil, []).append(json.loads(saida.stdout))
+
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Teste de carga do fluxo de formulário: quantos POSTs de lançamento por
+segundo a pilha sustenta, com CSRF, LancamentoForm (CompetenciaField.compress
+e validators) e a gravação no banco.
+
+Cada iteração de cada usuário virtual segue o roteiro do navegador:
+
+    GET formulário -> POST (com csrftoken) -> 302 -> GET da lista
+
+No fluxo 'editar', o formulário é o de um lançamento existente. Com
+--invalidos, essa fração dos POSTs leva uma competência anterior a 2020 e
+deve voltar 200 com o form re-renderizado (sem redirect).
+
+Saída em JSON: vazão (iterações/s = POSTs/s), percentis da iteração e de
+cada etapa, e taxa de erro, por pilha.
+
+Uso:
+    python benchmarks/carga_formulario.py --pilhas runserver,gunicorn,uvicorn --concorrencia 8
+    DJANGO_DB_PERFIL=postgresql python benchmarks/carga_formulario.py --fluxo editar
+
+Atenção: migra e grava no banco configurado em core.settings.
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from urllib.parse import urlencode, urlsplit
+
+from carga import Servidor, gerar_carga, preparar_banco
+
+PILHAS_PADRAO = 'runserver,gunicorn,uvicorn'
+TOKEN_CSRF = re.compile(rb'name="csrfmiddlewaretoken" value="([^"]+)"')
+PERIODOS = [(ano, mes) for ano in (2024, 2025, 2026) for mes in range(1, 14)]
+
+
+def _requisitar(cliente, tempos, etapa, metodo, caminho, esperado, corpo=None, cabecalhos=None):
+    inicio = time.monotonic()
+    status, headers, conteudo = cliente.requisitar(metodo, caminho, corpo, cabecalhos)
+    tempos[etapa] = time.monotonic() - inicio
+    if status != esperado:
+        raise RuntimeError(f"{etapa}: HTTP {status} (esperado {esperado})")
+    return headers, conteudo
+
+
+def roteiro_formulario(fluxo='criar', pks=(), invalidos=0.0, semente=None):
+    rng = random.Random(semente)
+
+    def roteiro(cliente):
+        tempos = {}
+        caminho = '/' if fluxo == 'criar' else f"/editar/{rng.choice(pks)}/"
+        _, pagina = _requisitar(cliente, tempos, 'get_form', 'GET', caminho, 200)
+        achado = TOKEN_CSRF.search(pagina)
+        if achado is None:
+            raise RuntimeError("get_form: csrfmiddlewaretoken ausente")
+
+        invalido = rng.random() < invalidos
+        ano, mes = (2019, 1) if invalido else rng.choice(PERIODOS)
+        corpo = urlencode({
+            'csrfmiddlewaretoken': achado.group(1).decode(),
+            'descricao': f"Carga {fluxo} {rng.randrange(10**6)}",
+            'valor': f"{rng.randrange(1, 10**6) / 100:.2f}",
+            'competencia_0': mes,
+            'competencia_1': ano,
+        })
+        cabecalhos = {'Content-Type': 'application/x-www-form-urlencoded'}
+        if invalido:
+            # O form volta com os erros dos validators; não há redirect
+            _requisitar(cliente, tempos, 'post_rejeitado', 'POST', caminho, 200, corpo, cabecalhos)
+            return tempos
+
+        headers, _ = _requisitar(cliente, tempos, 'post', 'POST', caminho, 302, corpo, cabecalhos)
+        destino = urlsplit(headers['Location'])
+        _requisitar(cliente, tempos, 'get_lista', 'GET', destino.path + (f"?{destino.query}" if destino.query else ''), 200)
+        return tempos
+
+    return roteiro
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pilhas', default=PILHAS_PADRAO, help=f"Servidores, separados por vírgula (padrão: {PILHAS_PADRAO})")
+    parser.add_argument('--fluxo', choices=['criar', 'editar'], default='criar')
+    parser.add_argument('--concorrencia', type=int, default=8, help="Usuários virtuais (threads)")
+    parser.add_argument('--duracao', type=float, default=10.0, help="Segundos medidos por pilha")
+    parser.add_argument('--aquecimento', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=1, help="Processos do servidor")
+    parser.add_argument('--popular', type=int, default=1000, help="Lançamentos mínimos no banco")
+    parser.add_argument('--invalidos', type=float, default=0.0, help="Fração de POSTs com competência inválida")
+    parser.add_argument('--semente', type=int, default=None)
+    args = parser.parse_args()
+
+    preparar_banco(args.popular)
+    pks = ()
+    if args.fluxo == 'editar':
+        from financeiro.models import Lancamento
+        pks = list(Lancamento.objects.order_by('-pk').values_list('pk', flat=True)[:1000])
+        if not pks:
+            parser.error("O fluxo 'editar' precisa de lançamentos no banco (use --popular).")
+
+    resultados = {}
+    for pilha in args.pilhas.split(','):
+        roteiro = roteiro_formulario(args.fluxo, pks, args.invalidos, args.semente)
+        try:
+            with Servidor(pilha, workers=args.workers, threads=args.concorrencia) as servidor:
+                resultado = gerar_carga(servidor.porta, roteiro, args.concorrencia, args.duracao, args.aquecimento)
+        except RuntimeError as exc:
+            print(f"{pilha}: ignorado ({exc})", file=sys.stderr)
+            continue
+        resultados[pilha] = {'fluxo': args.fluxo, 'invalidos': args.invalidos, **resultado}
+
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Suíte de benchmarks (pytest-benchmark).
+
+Não roda no `pytest` padrão (testpaths = financeiro). Para gravar uma
+baseline JSON e comparar com a anterior:
+
+    pytest benchmarks --benchmark-storage=benchmarks/baselines --benchmark-autosave
+    pytest benchmarks --benchmark-storage=benchmarks/baselines --benchmark-compare
+    pytest-benchmark --storage benchmarks/baselines compare 0001 0002
+
+Os benchmarks de views rodam para cada tamanho em --linhas
+(padrão: 1000,100000,1000000).
+"""
+import random
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+
+from financeiro.models import Competencia, Lancamento, ResumoCompetencia
+
+LINHAS_PADRAO = "1000,100000,1000000"
+PERIODOS = [(Competencia(2020, 1) + i).as_int for i in range(13 * 6)]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--linhas", default=LINHAS_PADRAO,
+        help="Tamanhos do ledger para os benchmarks de views, separados por vírgula",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "tamanho_ledger" in metafunc.fixturenames:
+        tamanhos = [int(t) for t in metafunc.config.getoption("linhas").split(",")]
+        metafunc.parametrize("tamanho_ledger", tamanhos, scope="module", ids=lambda n: f"{n}linhas")
+
+
+def valores_competencia(quantidade, seed=42):
+    """Coluna AAAAMM sintética: poucas dezenas de períodos, como num ledger real."""
+    rng = random.Random(seed)
+    return [rng.choice(PERIODOS) for _ in range(quantidade)]
+
+
+def _limpar_ledger():
+    # DELETE direto: o .delete() do ORM carregaria cada linha para os signals
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {Lancamento._meta.db_table}")
+        cursor.execute(f"DELETE FROM {ResumoCompetencia._meta.db_table}")
+
+
+@pytest.fixture(scope="module")
+def ledger(tamanho_ledger, django_db_setup, django_db_blocker):
+    """Popula Lancamento com `tamanho_ledger` linhas (uma vez por módulo e tamanho)."""
+    with django_db_blocker.unblock():
+        _limpar_ledger()
+        Lancamento.objects.bulk_create(
+            (
+                Lancamento(descricao=f"Lançamento {i}", valor=Decimal(i % 1000), competencia=comp)
+                for i, comp in enumerate(valores_competencia(tamanho_ledger))
+            ),
+            batch_size=5000,
+        )
+        ResumoCompetencia.reconstruir()
+        yield tamanho_ledger
+        _limpar_ledger()
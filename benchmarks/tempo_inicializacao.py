@@ -0,0 +1,69 @@
+"""
+Tempo de inicialização de comandos e workers, via `python -X importtime`.
+
+Roda django.setup() + o import dos comandos de gerenciamento num
+subprocesso limpo, várias vezes, e mostra o tempo total de import
+(mediana), o tempo próprio dos módulos do financeiro e os módulos mais
+caros. Sai com código 1 se o total passar do orçamento.
+
+Uso:
+    python benchmarks/tempo_inicializacao.py
+    python benchmarks/tempo_inicializacao.py --rodadas 10 --top 15 --orcamento-ms 500
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from carga import RAIZ
+
+CODIGO = (
+    "import django\n"
+    "django.setup()\n"
+    "import financeiro.management.commands.importar_lancamentos\n"
+    "import financeiro.management.commands.exportar_lancamentos\n"
+)
+
+
+def medir():
+    """{modulo: (proprio_us, acumulado_us)} de uma inicialização."""
+    ambiente = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'core.settings', 'PYTHONPATH': str(RAIZ)}
+    saida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CODIGO],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True, check=True,
+    ).stderr
+    modulos = {}
+    for linha in saida.splitlines():
+        partes = linha[len('import time:'):].split('|')
+        if not linha.startswith('import time:') or not partes[0].strip().isdigit():
+            continue
+        modulos[partes[2].strip()] = (int(partes[0]), int(partes[1]))
+    return modulos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rodadas', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--orcamento-ms', type=float, default=600.0)
+    args = parser.parse_args()
+
+    rodadas = [medir() for _ in range(args.rodadas)]
+    total_ms = statistics.median(sum(p for p, _ in m.values()) for m in rodadas) / 1000
+    financeiro_ms = statistics.median(
+        sum(p for nome, (p, _) in m.items() if nome.startswith('financeiro')) for m in rodadas
+    ) / 1000
+    ultima = rodadas[-1]
+
+    print(f"módulos importados: {len(ultima)}")
+    print(f"total (mediana de {args.rodadas}): {total_ms:.1f} ms   orçamento: {args.orcamento_ms:.0f} ms")
+    print(f"financeiro.* (tempo próprio): {financeiro_ms:.1f} ms")
+    print(f"\n{'próprio ms':>10} {'acumulado ms':>13}  módulo")
+    for nome, (proprio, acumulado) in sorted(ultima.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{proprio / 1000:10.2f} {acumulado / 1000:13.2f}  {nome}")
+    return 0 if total_ms <= args.orcamento_ms else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,26 @@
+"""Benchmarks das conversões do CompetenciaField (model field) em fetches grandes."""
+import pytest
+
+from financeiro.models import Competencia, Lancamento
+from conftest import valores_competencia
+
+CAMPO = Lancamento._meta.get_field('competencia')
+VALORES = valores_competencia(100_000)
+
+
+def test_from_db_value(benchmark):
+    benchmark(lambda: [CAMPO.from_db_value(v, None, None) for v in VALORES])
+
+
+def test_get_prep_value(benchmark):
+    competencias = [Competencia.from_int(v) for v in VALORES]
+    benchmark(lambda: [CAMPO.get_prep_value(c) for c in competencias])
+
+
+@pytest.mark.django_db
+def test_fetch_values_list(benchmark, ledger):
+    """Fetch real: o custo inclui o from_db_value de cada linha."""
+    def buscar():
+        return sum(1 for _ in Lancamento.objects.values_list('competencia', flat=True).iterator(chunk_size=5000))
+
+    assert benchmark.pedantic(buscar, rounds=3) == ledger
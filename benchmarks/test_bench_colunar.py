@@ -0,0 +1,41 @@
+"""Cache colunar x ORM: total, faixa de competências e top-N, em cada tamanho de --linhas."""
+import pytest
+from django.db.models import Sum
+
+from financeiro.colunar import LedgerColunar
+from financeiro.models import Lancamento
+
+DE, ATE = 202301, 202413
+
+
+@pytest.fixture(scope="module")
+def cache(ledger, django_db_blocker):
+    with django_db_blocker.unblock():
+        cache = LedgerColunar(limite_bytes=256 * 2**20)
+        assert cache.carregar()
+    return cache
+
+
+@pytest.mark.django_db
+def test_orm_total_faixa(benchmark, ledger):
+    benchmark(lambda: Lancamento.objects.filter(competencia__range=(DE, ATE)).aggregate(Sum('valor')))
+
+
+def test_colunar_total_faixa(benchmark, cache):
+    benchmark(cache.total, DE, ATE)
+
+
+@pytest.mark.django_db
+def test_orm_top10(benchmark, ledger):
+    benchmark(lambda: list(Lancamento.objects.filter(competencia__range=(DE, ATE))
+                           .order_by('-valor', 'id').values_list('id', 'competencia', 'valor')[:10]))
+
+
+def test_colunar_top10(benchmark, cache):
+    benchmark(cache.top, 10, DE, ATE)
+
+
+def test_colunar_memoria(benchmark, cache):
+    """Não é tempo: registra a memória ocupada no extra_info do relatório."""
+    benchmark.extra_info.update(cache.estatisticas())
+    benchmark(len, cache)
@@ -0,0 +1,53 @@
+"""Benchmarks da classe Competencia (valor puro, sem banco)."""
+import pytest
+
+from financeiro.models import Competencia
+from conftest import valores_competencia
+
+VALORES = valores_competencia(10_000)
+
+
+@pytest.fixture
+def competencias():
+    return [Competencia.from_int(v) for v in VALORES]
+
+
+def test_construcao(benchmark):
+    benchmark(lambda: [Competencia(v // 100, v % 100) for v in VALORES])
+
+
+def test_from_int(benchmark):
+    benchmark(lambda: [Competencia.from_int(v) for v in VALORES])
+
+
+def test_soma(benchmark, competencias):
+    benchmark(lambda: [c + 13 for c in competencias])
+
+
+def test_subtracao_meses(benchmark, competencias):
+    benchmark(lambda: [c - 1 for c in competencias])
+
+
+def test_diferenca_entre_competencias(benchmark, competencias):
+    base = Competencia(2020, 1)
+    benchmark(lambda: [c - base for c in competencias])
+
+
+def test_hash(benchmark, competencias):
+    benchmark(lambda: {c: None for c in competencias})
+
+
+def test_ordenacao(benchmark, competencias):
+    benchmark(sorted, competencias)
+
+
+def test_descricao_mes(benchmark, competencias):
+    benchmark(lambda: [c.descricao_mes for c in competencias])
+
+
+def test_str(benchmark, competencias):
+    benchmark(lambda: [str(c) for c in competencias])
+
+
+def test_proxima_e_anterior(benchmark, competencias):
+    benchmark(lambda: [(c.proxima, c.anterior) for c in competencias])
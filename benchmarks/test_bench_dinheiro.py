@@ -0,0 +1,55 @@
+"""
+Valor em centavos (CentavosField/Dinheiro) x o DecimalField anterior.
+
+A referência "decimal" lê a mesma coluna como DecimalField (valor / 100.0),
+o que reproduz o conversor de Decimal que cada linha pagava antes.
+"""
+from decimal import Decimal
+
+import pytest
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum, Value
+
+from financeiro.models import Dinheiro, Lancamento
+
+COMO_DECIMAL = ExpressionWrapper(F('valor') / Value(100.0), output_field=DecimalField(max_digits=10, decimal_places=2))
+
+
+def _valores_dinheiro():
+    return list(Lancamento.objects.values_list('valor', flat=True))
+
+
+def _valores_decimal():
+    return list(Lancamento.objects.annotate(v=COMO_DECIMAL).values_list('v', flat=True))
+
+
+@pytest.mark.django_db
+def test_fetch_dinheiro(benchmark, ledger):
+    assert len(benchmark(_valores_dinheiro)) == ledger
+
+
+@pytest.mark.django_db
+def test_fetch_decimal(benchmark, ledger):
+    assert len(benchmark(_valores_decimal)) == ledger
+
+
+@pytest.mark.django_db
+def test_soma_python_dinheiro(benchmark, ledger):
+    valores = _valores_dinheiro()
+    benchmark(sum, valores)
+
+
+@pytest.mark.django_db
+def test_soma_python_dinheiro_somar(benchmark, ledger):
+    valores = _valores_dinheiro()
+    benchmark(Dinheiro.somar, valores)
+
+
+@pytest.mark.django_db
+def test_soma_python_decimal(benchmark, ledger):
+    valores = _valores_decimal()
+    benchmark(sum, valores, Decimal(0))
+
+
+@pytest.mark.django_db
+def test_soma_banco(benchmark, ledger):
+    benchmark(lambda: Lancamento.objects.aggregate(total=Sum('valor')))
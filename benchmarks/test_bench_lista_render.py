@@ -0,0 +1,35 @@
+"""
+Renderização do lista.html com páginas grandes (sem banco): custo por
+linha do template, com os lançamentos já em memória.
+"""
+import pytest
+from django.template.loader import get_template
+
+from financeiro.models import Competencia, Dinheiro, Lancamento
+from financeiro.views import ListaLancamentosView
+
+from conftest import valores_competencia
+
+
+@pytest.fixture(scope="module")
+def pagina():
+    return [
+        Lancamento(pk=i + 1, descricao=f"Lançamento {i}", valor=Dinheiro.from_centavos(i * 137),
+                   competencia=Competencia.from_int(comp))
+        for i, comp in enumerate(valores_competencia(10_000))
+    ]
+
+
+@pytest.mark.parametrize("linhas", [1_000, 10_000])
+def test_render_lista(benchmark, pagina, linhas):
+    template = get_template('lista.html')
+    lancamentos = pagina[:linhas]
+
+    def renderizar():
+        return template.render(ListaLancamentosView.contexto_da_pagina(lancamentos))
+
+    html = benchmark(renderizar)
+    # Com --benchmark-disable não há estatísticas
+    if benchmark.stats:
+        benchmark.extra_info['us_por_linha'] = benchmark.stats.stats.mean * 1e6 / linhas
+    assert html.count('<tr>') == linhas + 1
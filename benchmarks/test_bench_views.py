@@ -0,0 +1,60 @@
+"""Benchmarks ponta a ponta das views, com o ledger em cada tamanho de --linhas."""
+import pytest
+from django.urls import reverse
+
+from financeiro.models import Lancamento
+
+
+@pytest.fixture
+def sem_cache_de_paginas(settings):
+    """Renderiza a página a cada GET, como antes do cache por versão."""
+    settings.LISTA_CACHE_TTL = 0
+
+
+@pytest.mark.django_db
+def test_lista_primeira_pagina(benchmark, client, ledger, sem_cache_de_paginas):
+    resp = benchmark(client.get, reverse('lista_lancamentos'))
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_lista_do_cache(benchmark, client, ledger):
+    """Ledger inalterado: a página sai do cache (só a leitura da versão)."""
+    client.get(reverse('lista_lancamentos'))
+    resp = benchmark(client.get, reverse('lista_lancamentos'))
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_lista_304(benchmark, client, ledger):
+    """Cliente com a versão atual: 304 sem corpo."""
+    etag = client.get(reverse('lista_lancamentos'))['ETag']
+    resp = benchmark(client.get, reverse('lista_lancamentos'), HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+
+
+@pytest.mark.django_db
+def test_lista_pagina_profunda(benchmark, client, ledger, sem_cache_de_paginas):
+    """Keyset: uma página do meio custa o mesmo que a primeira."""
+    meio = Lancamento.objects.order_by('-competencia', '-id')[ledger // 2]
+    cursor = f"{meio.competencia.as_int}.{meio.pk}"
+    resp = benchmark(client.get, reverse('lista_lancamentos'), {'cursor': cursor})
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_criar_get(benchmark, client, ledger):
+    resp = benchmark(client.get, reverse('criar_lancamento'))
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_criar_post(benchmark, client, ledger):
+    dados = {
+        'descricao': 'Benchmark',
+        'valor': '10.00',
+        'competencia_0': '13',
+        'competencia_1': '2025',
+    }
+    resp = benchmark(client.post, reverse('criar_lancamento'), dados)
+    assert resp.status_code == 302
@@ -0,0 +1,16 @@
+"""Benchmark da renderização do CompetenciaWidget (template com modal)."""
+from financeiro.fields import CompetenciaWidget
+from financeiro.models import Competencia
+
+# Mesmo attrs que o BoundField passa ao renderizar o form
+ATTRS = {'id': 'id_competencia'}
+
+
+def test_render_vazio(benchmark):
+    widget = CompetenciaWidget()
+    benchmark(widget.render, 'competencia', None, ATTRS)
+
+
+def test_render_com_valor(benchmark):
+    widget = CompetenciaWidget()
+    benchmark(widget.render, 'competencia', Competencia(2025, 13), ATTRS)
@@ -0,0 +1,88 @@
+"""
+Perfis de banco de dados do projeto, escolhidos em settings pela variável
+de ambiente DJANGO_DB_PERFIL:
+
+    sqlite          (padrão) SQLite com WAL, pragmas ajustados, conexões
+                    persistentes e transações IMMEDIATE
+    sqlite-simples  SQLite como o startproject gera (referência de benchmark)
+    postgresql      PostgreSQL com pool de conexões (psycopg 3 + psycopg-pool)
+
+DJANGO_DB_NOME troca o arquivo do SQLite; o PostgreSQL lê as variáveis
+padrão da libpq (PGDATABASE, PGHOST, PGPORT, PGUSER, PGPASSWORD).
+"""
+import os
+
+# Executados a cada conexão aberta (OPTIONS['init_command'])
+PRAGMAS_SQLITE = {
+    # Leitores não bloqueiam o escritor (e vice-versa); persiste no arquivo
+    'journal_mode': 'WAL',
+    # Com WAL, NORMAL só faz fsync no checkpoint: seguro contra corrupção,
+    # pode perder as últimas transações numa queda de energia
+    'synchronous': 'NORMAL',
+    # Negativo = KiB: ~64 MB de cache de páginas por conexão
+    'cache_size': -64000,
+    # Leituras via mmap (256 MB)
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+}
+
+
+def sqlite(nome, pragmas=PRAGMAS_SQLITE, conn_max_age=600, timeout=20):
+    """
+    `timeout` é o busy timeout (s) do sqlite3. Com transaction_mode
+    IMMEDIATE a trava de escrita é pedida no BEGIN, onde o busy timeout
+    vale; em DEFERRED, a promoção de leitura para escrita no meio da
+    transação falha na hora com "database is locked".
+    """
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': nome,
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': '; '.join(f'PRAGMA {chave}={valor}' for chave, valor in pragmas.items()),
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': timeout,
+        },
+    }
+
+
+def sqlite_simples(nome):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': nome,
+    }
+
+
+def postgresql(ambiente=os.environ):
+    """
+    Pool do próprio Django (OPTIONS['pool']); exige CONN_MAX_AGE = 0,
+    já que a reutilização das conexões fica por conta do pool.
+    """
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': ambiente.get('PGDATABASE', 'financeiro'),
+        'USER': ambiente.get('PGUSER', ''),
+        'PASSWORD': ambiente.get('PGPASSWORD', ''),
+        'HOST': ambiente.get('PGHOST', ''),
+        'PORT': ambiente.get('PGPORT', ''),
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(ambiente.get('DJANGO_DB_POOL_MIN', 2)),
+                'max_size': int(ambiente.get('DJANGO_DB_POOL_MAX', 10)),
+                'timeout': 10,
+            },
+        },
+    }
+
+
+def perfil(nome_perfil, caminho_sqlite):
+    if nome_perfil == 'sqlite':
+        return sqlite(caminho_sqlite)
+    if nome_perfil == 'sqlite-simples':
+        return sqlite_simples(caminho_sqlite)
+    if nome_perfil == 'postgresql':
+        return postgresql()
+    raise ValueError(f"DJANGO_DB_PERFIL desconhecido: {nome_perfil!r}")
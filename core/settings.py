@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from . import banco
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primeiro da lista para medir a latência total da requisição
+    'financeiro.middleware.InstrumentacaoMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -51,6 +56,27 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Instrumentação (financeiro.middleware): fração de requisições medidas
+# e envio do header Server-Timing. Em produção, use uma amostragem baixa.
+INSTRUMENTACAO_AMOSTRAGEM = 1.0
+INSTRUMENTACAO_SERVER_TIMING = DEBUG
+
+# /metricas/ (MetricasView): desligado fora do DEBUG. A view só confere se
+# REMOTE_ADDR é local; atrás de um proxy reverso na mesma máquina todo
+# cliente chega como 127.0.0.1, então não ligue isto sem bloquear a rota
+# no proxy.
+METRICAS_ATIVAS = DEBUG
+
+# Cache colunar do ledger (financeiro.colunar), local a cada processo.
+# Opt-in; requer numpy. ~20 bytes por lançamento.
+LEDGER_COLUNAR_ATIVO = False
+LEDGER_COLUNAR_LIMITE_MB = 64
+LEDGER_COLUNAR_TTL = 300
+
+# Páginas da lista (ListaLancamentosView) renderizadas e guardadas no cache
+# padrão, pela versão do ledger e cursor. Segundos; 0 desliga o cache.
+LISTA_CACHE_TTL = 300
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
@@ -75,11 +101,14 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Perfis em core/banco.py: 'sqlite' (WAL + pragmas + conexões persistentes),
+# 'sqlite-simples' ou 'postgresql' (com pool).
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': banco.perfil(
+        os.environ.get('DJANGO_DB_PERFIL', 'sqlite'),
+        os.environ.get('DJANGO_DB_NOME', BASE_DIR / 'db.sqlite3'),
+    ),
 }
 
 
@@ -1,10 +1,26 @@
 from django.contrib import admin
 from django.urls import path
-from financeiro.views import CriarLancamentoView, ListaLancamentosView, LancamentoEditView
+from financeiro.api import LancamentoApiView, LancamentosApiView, LancamentosLoteApiView
+from financeiro.views import (
+    CriarLancamentoView, ListaLancamentosView, LancamentoEditView,
+    ResumoCompetenciasView, ExportarLancamentosView, MetricasView, RelatorioSaldosView,
+    CriarLancamentoAsyncView, ListaLancamentosAsyncView, LancamentoEditAsyncView,
+)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', CriarLancamentoView.as_view(), name='criar_lancamento'),
     path('lista/', ListaLancamentosView.as_view(), name='lista_lancamentos'),
     path('editar/<int:pk>/', LancamentoEditView.as_view(), name='editar_lancamento'),
+    # Mesmas telas servidas pelas views assíncronas (para rodar sob ASGI)
+    path('async/', CriarLancamentoAsyncView.as_view(), name='criar_lancamento_async'),
+    path('async/lista/', ListaLancamentosAsyncView.as_view(), name='lista_lancamentos_async'),
+    path('async/editar/<int:pk>/', LancamentoEditAsyncView.as_view(), name='editar_lancamento_async'),
+    path('resumo/', ResumoCompetenciasView.as_view(), name='resumo_competencias'),
+    path('relatorios/saldos/', RelatorioSaldosView.as_view(), name='relatorio_saldos'),
+    path('exportar/', ExportarLancamentosView.as_view(), name='exportar_lancamentos'),
+    path('api/lancamentos/', LancamentosApiView.as_view(), name='api_lancamentos'),
+    path('api/lancamentos/lote/', LancamentosLoteApiView.as_view(), name='api_lancamentos_lote'),
+    path('api/lancamentos/<int:pk>/', LancamentoApiView.as_view(), name='api_lancamento'),
+    path('metricas/', MetricasView.as_view(), name='metricas'),
 ]
\ No newline at end of file
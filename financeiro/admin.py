@@ -1,3 +1,201 @@
+# financeiro/admin.py
+"""
+Admin de Lancamento, pensado para um ledger de dezenas de milhões de linhas.
+
+- Filtros por ano e por competência (13º incluído): as opções saem do
+  ResumoCompetencia (uma linha por período), nunca de um DISTINCT no ledger.
+  Competências fechadas (arquivadas, ver fechamento.py) ficam de fora.
+- Contagens: sem filtro de texto, o total vem do ResumoCompetencia; com
+  busca, é estimado (plano do PostgreSQL) ou contado só até um teto, e a
+  lista mostra "cerca de N" / "mais de N" (templates pagination.html e
+  search_form.html em admin/financeiro/lancamento/).
+  show_full_result_count fica desligado.
+- Só as colunas exibidas são lidas, e só colunas indexadas são ordenáveis.
+"""
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import SEARCH_VAR
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Sum
+from django.http import QueryDict
+from django.utils.functional import cached_property
+
+from .models import Competencia, CompetenciaFechada, CompetenciaField, Lancamento, ResumoCompetencia
+
+# Acima disso, a busca textual mostra "mais de N" em vez de contar tudo
+CONTAGEM_MAXIMA = 10_000
+
+
+def _faixa_do_ano(ano):
+    return ano * 100 + 1, ano * 100 + 99
+
+
+def _resumos_abertos():
+    """ResumoCompetencia sem as competências fechadas (arquivadas fora de Lancamento)."""
+    return ResumoCompetencia.objects.exclude(competencia__in=CompetenciaFechada.objects.values('competencia'))
+
+
+def estimar_contagem(queryset, maximo=None):
+    """
+    Contagem aproximada de um queryset qualquer, como (total, rotulo): no
+    PostgreSQL, as linhas previstas pelo plano (EXPLAIN, sem executar),
+    rotuladas "cerca de N"; nos demais bancos, um COUNT limitado a
+    `maximo` + 1 linhas, rotulado "mais de `maximo`" se passar do teto.
+    `rotulo` é None quando o total é exato.
+    """
+    conexao = connections[queryset.db]
+    if conexao.vendor == 'postgresql':
+        sql, params = queryset.order_by().query.sql_with_params()
+        with conexao.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plano = cursor.fetchone()[0]
+        total = int(plano[0]['Plan']['Plan Rows'])
+        return total, f"cerca de {total}"
+    maximo = maximo or CONTAGEM_MAXIMA
+    # Uma linha além do teto: basta para saber que ele foi ultrapassado
+    total = queryset.order_by()[:maximo + 1].count()
+    return total, (f"mais de {maximo}" if total > maximo else None)
+
+
+class AnoFilter(admin.SimpleListFilter):
+    title = "ano"
+    parameter_name = 'ano'
+
+    def lookups(self, request, model_admin):
+        anos = sorted({c.ano for c in _resumos_abertos().values_list('competencia', flat=True)}, reverse=True)
+        return [(str(ano), str(ano)) for ano in anos]
+
+    def intervalo(self):
+        """(de, ate) em AAAAMM do ano escolhido, ou None."""
+        if self.value() is None:
+            return None
+        try:
+            return _faixa_do_ano(int(self.value()))
+        except ValueError:
+            raise IncorrectLookupParameters(f"Ano inválido: {self.value()!r}.")
+
+    def queryset(self, request, queryset):
+        intervalo = self.intervalo()
+        if intervalo is None:
+            return queryset
+        return queryset.filter(competencia__range=intervalo)
+
+
+class CompetenciaFilter(admin.SimpleListFilter):
+    """
+    Seletor de competência com autocompletar: um campo de texto (MM/AAAA
+    ou AAAAMM) com as competências existentes num <datalist>, em vez de
+    uma lista de links com centenas de períodos.
+    """
+    title = "competência"
+    parameter_name = 'competencia'
+    template = 'admin/financeiro/filtro_competencia.html'
+
+    def lookups(self, request, model_admin):
+        competencias = _resumos_abertos().order_by('-competencia').values_list('competencia', flat=True)
+        ano = request.GET.get(AnoFilter.parameter_name)
+        if ano and ano.isdigit():
+            competencias = competencias.filter(competencia__range=_faixa_do_ano(int(ano)))
+        return [(str(c.as_int), str(c)) for c in competencias]
+
+    def competencia(self):
+        if not self.value():
+            return None
+        try:
+            return Competencia.parse(self.value())
+        except (TypeError, ValueError):
+            raise IncorrectLookupParameters(f"Competência inválida: {self.value()!r}.")
+
+    def queryset(self, request, queryset):
+        competencia = self.competencia()
+        if competencia is None:
+            return queryset
+        return queryset.filter(competencia=competencia)
+
+    def choices(self, changelist):
+        # Os demais parâmetros da lista viram campos ocultos do formulário
+        restantes = changelist.get_query_string(remove=[self.parameter_name])
+        self.parametros_mantidos = list(QueryDict(restantes.lstrip('?')).items())
+        self.valor_atual = self.value() or ''
+        yield from super().choices(changelist)
+
+
+class PaginadorResumo(Paginator):
+    """
+    Paginator cujo total vem de `contar()` em vez de COUNT(*) no ledger.
+    `contar()` devolve (total, rotulo); o rotulo, quando o total não é
+    exato, é o que os templates da lista exibem no lugar do número.
+    """
+
+    def __init__(self, *args, contar, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._contar = contar
+
+    @cached_property
+    def _contagem(self):
+        return self._contar()
+
+    @property
+    def count(self):
+        return self._contagem[0]
+
+    @property
+    def rotulo_contagem(self):
+        return self._contagem[1]
+
+
+@admin.register(Lancamento)
+class LancamentoAdmin(admin.ModelAdmin):
+    list_display = ('id', 'competencia', 'descricao', 'valor')
+    list_display_links = ('id', 'descricao')
+    list_filter = (AnoFilter, CompetenciaFilter)
+    # '^' = istartswith: usa o começo do texto em vez de LIKE '%...%'
+    search_fields = ('^descricao',)
+    # Ordenação só por colunas do índice (competencia, id)
+    ordering = ('-competencia', '-id')
+    sortable_by = ('id', 'competencia')
+    show_full_result_count = False
+    list_per_page = 50
+    list_max_show_all = 500
+    list_select_related = False
+
+    def get_form(self, request, obj=None, **kwargs):
+        # O form do site (com as regras dele); importado aqui porque criar um
+        # ModelForm carrega os form fields, que o django.setup() não carrega
+        from .forms import LancamentoForm
+        return super().get_form(request, obj, **{'form': LancamentoForm, **kwargs})
+
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        # CompetenciaField herda de IntegerField: o override padrão do admin
+        # trocaria o CompetenciaWidget (mês + ano) por um único <input type="number">
+        if isinstance(db_field, CompetenciaField):
+            return db_field.formfield(**kwargs)
+        return super().formfield_for_dbfield(db_field, request, **kwargs)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).only(*self.list_display)
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return PaginadorResumo(
+            queryset, per_page, orphans, allow_empty_first_page,
+            contar=lambda: self.contar(request, queryset),
+        )
 
-# Register your models here.
+    def contar(self, request, queryset):
+        """
+        (total, rotulo) da lista filtrada. Só com filtros de ano/competência,
+        o total é a soma das quantidades do ResumoCompetencia (exata e em
+        O(períodos)) e o rotulo é None; com busca textual, é estimado (ver
+        estimar_contagem).
+        """
+        if request.GET.get(SEARCH_VAR):
+            return estimar_contagem(queryset)
+        resumos = _resumos_abertos()
+        ano = request.GET.get(AnoFilter.parameter_name)
+        if ano:
+            resumos = resumos.filter(competencia__range=_faixa_do_ano(int(ano)))
+        competencia = request.GET.get(CompetenciaFilter.parameter_name)
+        if competencia:
+            resumos = resumos.filter(competencia=Competencia.parse(competencia))
+        return resumos.aggregate(total=Sum('quantidade'))['total'] or 0, None
@@ -0,0 +1,228 @@
+# financeiro/api.py
+"""
+API JSON de Lancamento (sem dependências além do Django).
+
+    GET    /api/lancamentos/?cursor=AAAAMM.id&limite=N   lista (keyset, com os arquivados)
+    POST   /api/lancamentos/                             cria um
+    GET    /api/lancamentos/<id>/                        detalhe
+    PUT    /api/lancamentos/<id>/                        atualiza (todos os campos)
+    PATCH  /api/lancamentos/<id>/                        atualiza (campos enviados)
+    POST   /api/lancamentos/lote/                        cria um array, numa transação
+    PUT    /api/lancamentos/lote/                        atualiza um array [{id, ...}]
+    PATCH  /api/lancamentos/lote/                        idem, parcial
+
+A competência entra como AAAAMM (202513) ou "MM/AAAA" e sai como AAAAMM;
+use ?competencia=texto para recebê-la como "MM/AAAA". Os lotes são
+tudo-ou-nada: qualquer erro devolve 400 com os erros por índice.
+
+As views são csrf_exempt, então POST/PUT/PATCH exigem Content-Type
+application/json (415 sem ele): um formulário ou fetch "simples" de
+outra origem só consegue enviar text/plain, form-urlencoded ou
+multipart, e application/json obriga o navegador a um preflight CORS
+que este servidor não autoriza.
+"""
+import json
+
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from . import fechamento
+from .lotes import CAMPOS, ConversorLancamentos, atualizar_lancamentos, gravar_lancamentos
+from .models import CompetenciaFechada, Lancamento, LancamentoArquivado
+from .views import ListaLancamentosView
+
+METODOS_COM_CORPO = ('POST', 'PUT', 'PATCH')
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 1000
+LIMITE_LOTE = 5000
+
+
+class ErroRequisicao(Exception):
+    def __init__(self, corpo, status=400):
+        super().__init__(corpo)
+        self.corpo = corpo
+        self.status = status
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ApiView(View):
+    """Base: corpo JSON, erros como JSON e serialização compacta."""
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            if request.method in METODOS_COM_CORPO and request.content_type != 'application/json':
+                raise ErroRequisicao({'erro': "Content-Type deve ser application/json."}, status=415)
+            return super().dispatch(request, *args, **kwargs)
+        except ErroRequisicao as exc:
+            return JsonResponse(exc.corpo, status=exc.status, safe=False)
+
+    def ler_json(self, tipo):
+        try:
+            corpo = json.loads(self.request.body)
+        except (ValueError, UnicodeDecodeError):
+            raise ErroRequisicao({'erro': "Corpo da requisição não é um JSON válido."})
+        if not isinstance(corpo, tipo):
+            esperado = "um objeto" if tipo is dict else "um array"
+            raise ErroRequisicao({'erro': f"O corpo deve ser {esperado} JSON."})
+        return corpo
+
+    def serializar(self, lancamento):
+        return self.serializar_valores(lancamento.pk, lancamento.descricao, lancamento.valor, lancamento.competencia)
+
+    def serializar_valores(self, pk, descricao, valor, competencia):
+        if self.request.GET.get('competencia') == 'texto':
+            competencia = str(competencia)
+        else:
+            competencia = competencia.as_int
+        return {
+            'id': pk,
+            'descricao': descricao,
+            'valor': str(valor.decimal),
+            'competencia': competencia,
+        }
+
+    def resposta(self, dados, status=200):
+        return JsonResponse(dados, status=status, safe=False)
+
+
+class LancamentosApiView(ApiView):
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limite = min(int(request.GET.get('limite', LIMITE_PADRAO)), LIMITE_MAXIMO)
+        except ValueError:
+            raise ErroRequisicao({'erro': "Parâmetro 'limite' deve ser numérico."})
+        if limite < 1:
+            raise ErroRequisicao({'erro': "Parâmetro 'limite' deve ser maior que zero."})
+
+        filtrar = None
+        if request.GET.get('cursor'):
+            try:
+                cursor = ListaLancamentosView.decodificar_cursor(request.GET['cursor'])
+            except ValueError:
+                raise ErroRequisicao({'erro': "Cursor de paginação inválido."})
+
+            def filtrar(queryset):
+                return ListaLancamentosView.apos_cursor(queryset, *cursor)
+
+        # Tabela quente e arquivo (competências fechadas), na mesma ordem keyset
+        pagina = list(fechamento.lancamentos(filtrar=filtrar)[:limite + 1])
+        proximo = None
+        if len(pagina) > limite:
+            ultimo = pagina[limite - 1]
+            proximo = f"{ultimo['competencia'].as_int}.{ultimo['id']}"
+        return self.resposta({
+            'resultados': [
+                {**self.serializar_valores(l['id'], l['descricao'], l['valor'], l['competencia']),
+                 'arquivado': l['arquivado']}
+                for l in pagina[:limite]
+            ],
+            'proximo_cursor': proximo,
+        })
+
+    def post(self, request, *args, **kwargs):
+        dados, erros = ConversorLancamentos().limpar(self.ler_json(dict))
+        if erros:
+            raise ErroRequisicao({'erros': erros})
+        lancamento = Lancamento.objects.create(**dados)
+        return self.resposta(self.serializar(lancamento), status=201)
+
+
+class LancamentoApiView(ApiView):
+
+    def get_object(self):
+        """Lançamento quente ou arquivado (competência fechada)."""
+        try:
+            return fechamento.obter(self.kwargs['pk'])
+        except Lancamento.DoesNotExist:
+            raise ErroRequisicao({'erro': "Lançamento não encontrado."}, status=404)
+
+    def get(self, request, *args, **kwargs):
+        return self.resposta(self.serializar(self.get_object()))
+
+    def put(self, request, *args, **kwargs):
+        return self.atualizar(parcial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self.atualizar(parcial=True)
+
+    def atualizar(self, parcial):
+        lancamento = self.get_object()
+        if isinstance(lancamento, LancamentoArquivado):
+            raise ErroRequisicao({'erro': CompetenciaFechada.mensagem(lancamento.competencia)}, status=409)
+        dados, erros = ConversorLancamentos().limpar(self.ler_json(dict), parcial=parcial)
+        if erros:
+            raise ErroRequisicao({'erros': erros})
+        for campo, valor in dados.items():
+            setattr(lancamento, campo, valor)
+        lancamento.save()
+        return self.resposta(self.serializar(lancamento))
+
+
+class LancamentosLoteApiView(ApiView):
+
+    def ler_lote(self):
+        registros = self.ler_json(list)
+        if not registros:
+            raise ErroRequisicao({'erro': "O lote está vazio."})
+        if len(registros) > LIMITE_LOTE:
+            raise ErroRequisicao({'erro': f"O lote excede {LIMITE_LOTE} itens."}, status=413)
+        return registros
+
+    def post(self, request, *args, **kwargs):
+        conversor = ConversorLancamentos()
+        lancamentos, erros = [], {}
+        for indice, registro in enumerate(self.ler_lote()):
+            if not isinstance(registro, dict):
+                erros[indice] = {'erro': "Item deve ser um objeto JSON."}
+                continue
+            dados, erros_item = conversor.limpar(registro)
+            if erros_item:
+                erros[indice] = erros_item
+            else:
+                lancamentos.append(Lancamento(**dados))
+        if erros:
+            raise ErroRequisicao({'erros': erros})
+
+        criados = gravar_lancamentos(lancamentos)
+        return self.resposta({'criados': [self.serializar(l) for l in criados]}, status=201)
+
+    def put(self, request, *args, **kwargs):
+        return self.atualizar(parcial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self.atualizar(parcial=True)
+
+    def atualizar(self, parcial):
+        registros = self.ler_lote()
+        ids = [r.get('id') if isinstance(r, dict) else None for r in registros]
+        ids = [pk if isinstance(pk, int) and not isinstance(pk, bool) else None for pk in ids]
+        existentes = Lancamento.objects.in_bulk([pk for pk in ids if pk is not None])
+
+        conversor = ConversorLancamentos()
+        lancamentos, campos, erros, vistos = [], set(), {}, set()
+        for indice, (registro, pk) in enumerate(zip(registros, ids)):
+            if pk not in existentes:
+                erros[indice] = {'id': f"Lançamento {pk!r} não encontrado."}
+                continue
+            if pk in vistos:
+                erros[indice] = {'id': f"Lançamento {pk} repetido no lote."}
+                continue
+            vistos.add(pk)
+            dados, erros_item = conversor.limpar(registro, parcial=parcial)
+            if erros_item:
+                erros[indice] = erros_item
+                continue
+            lancamento = existentes[pk]
+            for campo, valor in dados.items():
+                setattr(lancamento, campo, valor)
+            campos.update(dados)
+            lancamentos.append(lancamento)
+        if erros:
+            raise ErroRequisicao({'erros': erros})
+
+        if campos:
+            atualizar_lancamentos(lancamentos, [c for c in CAMPOS if c in campos])
+        return self.resposta({'atualizados': [self.serializar(l) for l in lancamentos]})
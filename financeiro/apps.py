@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 
 class FinanceiroConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
     name = 'financeiro'
+
+    def ready(self):
+        # Registra os signals que mantêm ResumoCompetencia atualizado
+        from . import signals  # noqa: F401
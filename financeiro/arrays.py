@@ -0,0 +1,187 @@
+# financeiro/arrays.py
+"""
+CompetenciaArray: versão vetorizada (NumPy) da Competencia.
+
+Guarda AAAAMM num array int32 e faz a mesma aritmética de 13 meses da
+classe escalar, só que para o array inteiro de uma vez. Requer numpy.
+
+Só o calendário padrão (Competencia.calendario) é suportado: LIMITE_MES
+é fixado na importação, e Competencias de outros calendários são
+recusadas.
+"""
+import numpy as np
+from .models import Competencia
+
+LIMITE_MES = Competencia.LIMITE_MES
+
+
+class CompetenciaArray:
+    __slots__ = ('_valores',)
+
+    # Comparações elemento a elemento devolvem arrays: não é hashable
+    __hash__ = None
+
+    # Faz o NumPy devolver NotImplemented (np.int64(1) + arr usa o nosso __radd__)
+    __array_ufunc__ = None
+
+    def __init__(self, valores):
+        """
+        Recebe uma sequência de AAAAMM (int) ou de objetos Competencia.
+        Levanta ValueError se algum mês estiver fora de 1..LIMITE_MES.
+        """
+        if isinstance(valores, CompetenciaArray):
+            valores = valores._valores
+        elif not isinstance(valores, np.ndarray):
+            valores = [self._as_int(v) if isinstance(v, Competencia) else v for v in valores]
+        valores = np.array(valores, dtype=np.int32, ndmin=1)
+
+        invalidos = ~self.mascara_valida(valores)
+        if invalidos.any():
+            mes = int(valores[invalidos][0] % 100)
+            raise ValueError(f"Mês {mes} inválido. Limite é {LIMITE_MES}.")
+        self._valores = valores
+
+    # --- Construção ---
+
+    @staticmethod
+    def _as_int(competencia):
+        if competencia.calendario is not Competencia.calendario:
+            raise ValueError(f"CompetenciaArray só aceita o calendário padrão, não {competencia.calendario!r}.")
+        return competencia.as_int
+
+    @classmethod
+    def _ordinal(cls, competencia):
+        """Índice linear de meses de uma Competencia, como em ordinais()."""
+        ano, mes = divmod(cls._as_int(competencia), 100)
+        return ano * LIMITE_MES + mes - 1
+
+    @classmethod
+    def from_queryset(cls, queryset, campo='competencia'):
+        """Lê uma coluna CompetenciaField via values_list(campo, flat=True)."""
+        linhas = queryset.values_list(campo, flat=True)
+        return cls(np.fromiter((c.as_int for c in linhas.iterator()), dtype=np.int32))
+
+    @classmethod
+    def from_ordinais(cls, ordinais):
+        """Inverso de ordinais(): índice linear de meses -> AAAAMM."""
+        ano, mes_idx = np.divmod(np.asarray(ordinais, dtype=np.int64), LIMITE_MES)
+        return cls._sem_validar((ano * 100 + mes_idx + 1).astype(np.int32))
+
+    @classmethod
+    def _sem_validar(cls, valores):
+        # Resultados de aritmética já são válidos por construção
+        obj = cls.__new__(cls)
+        obj._valores = valores
+        return obj
+
+    # --- Validação ---
+
+    @staticmethod
+    def mascara_valida(valores):
+        """Máscara booleana: True onde o mês de AAAAMM está em 1..LIMITE_MES."""
+        mes = np.asarray(valores) % 100
+        return (mes >= 1) & (mes <= LIMITE_MES)
+
+    # --- Leitura ---
+
+    @property
+    def valores(self):
+        """Array int32 de AAAAMM (o mesmo formato gravado no banco)."""
+        return self._valores
+
+    @property
+    def ano(self):
+        return self._valores // 100
+
+    @property
+    def mes(self):
+        return self._valores % 100
+
+    def ordinais(self):
+        """Índice linear de meses (ano * LIMITE_MES + mes - 1), igual ao escalar."""
+        return self.ano.astype(np.int64) * LIMITE_MES + (self.mes - 1)
+
+    def tolist(self):
+        """Lista de AAAAMM, pronta para filtros como competencia__in."""
+        return self._valores.tolist()
+
+    def __len__(self):
+        return len(self._valores)
+
+    def __iter__(self):
+        return (Competencia.from_int(v) for v in self._valores.tolist())
+
+    def __getitem__(self, indice):
+        item = self._valores[indice]
+        if isinstance(item, np.ndarray):
+            return self._sem_validar(item)
+        return Competencia.from_int(int(item))
+
+    def __repr__(self):
+        return f"CompetenciaArray({self.tolist()!r})"
+
+    # --- Comparação (elemento a elemento) ---
+    # AAAAMM já ordena corretamente com o mês 13 (202513 < 202601)
+
+    @staticmethod
+    def _comparavel(other):
+        if isinstance(other, CompetenciaArray):
+            return other._valores
+        if isinstance(other, Competencia):
+            return CompetenciaArray._as_int(other)
+        if isinstance(other, (int, np.integer, np.ndarray)):
+            return other
+        return NotImplemented
+
+    def _comparar(self, other, operador):
+        other = self._comparavel(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return operador(self._valores, other)
+
+    def __eq__(self, other):
+        return self._comparar(other, np.equal)
+
+    def __ne__(self, other):
+        return self._comparar(other, np.not_equal)
+
+    def __lt__(self, other):
+        return self._comparar(other, np.less)
+
+    def __le__(self, other):
+        return self._comparar(other, np.less_equal)
+
+    def __gt__(self, other):
+        return self._comparar(other, np.greater)
+
+    def __ge__(self, other):
+        return self._comparar(other, np.greater_equal)
+
+    # --- Aritmética (Lógica de 13 Meses) ---
+
+    def __add__(self, meses):
+        """Desloca todas as competências por um int ou por um array de ints."""
+        if not isinstance(meses, (int, np.integer, np.ndarray)):
+            return NotImplemented
+        return self.from_ordinais(self.ordinais() + meses)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        """
+        - int/array de ints: desloca para trás.
+        - Competencia/CompetenciaArray: diferença em meses (array int64).
+        """
+        if isinstance(other, CompetenciaArray):
+            return self.ordinais() - other.ordinais()
+        if isinstance(other, Competencia):
+            return self.ordinais() - self._ordinal(other)
+        if isinstance(other, (int, np.integer, np.ndarray)):
+            return self.__add__(-other)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        # Competencia - CompetenciaArray
+        if isinstance(other, Competencia):
+            return self._ordinal(other) - self.ordinais()
+        return NotImplemented
@@ -0,0 +1,73 @@
+# financeiro/calendarios.py
+"""
+Calendários de períodos da Competencia: quantos períodos o ano tem e o
+nome de cada um (12 meses, 12 meses + 13º, trimestres, períodos fiscais...).
+
+Tudo o que só depende do calendário (nomes, rótulos "MM", choices do
+form) é montado uma vez, na criação; a Competencia só indexa as tabelas.
+Os calendários ficam num registro por nome, que é o que o
+CompetenciaField grava nas migrations.
+"""
+
+MESES = (
+    'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+    'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro',
+)
+
+
+class Calendario:
+    __slots__ = ('nome', 'periodos', 'nomes', 'rotulos', 'choices', 'periodo_do_mes')
+
+    def __init__(self, nome, nomes, periodo_do_mes=None):
+        """
+        `periodo_do_mes`: período em que cai cada mês civil (12 itens). Por
+        padrão, os 12 meses são distribuídos igualmente entre os períodos
+        (identidade para 12 e 13 períodos; 1-3 -> 1 etc. para trimestres).
+        """
+        if not 1 <= len(nomes) <= 99:
+            raise ValueError("Um calendário tem de 1 a 99 períodos (o mês ocupa dois dígitos de AAAAMM).")
+        self.nome = nome
+        self.periodos = len(nomes)
+        # Indexadas pelo número do período (a posição 0 não é usada)
+        self.nomes = (None, *nomes)
+        self.rotulos = (None, *(f"{periodo:02d}" for periodo in range(1, self.periodos + 1)))
+        self.choices = tuple(enumerate(nomes, start=1))
+        if periodo_do_mes is None:
+            periodo_do_mes = [(mes - 1) * self.periodos // 12 + 1 for mes in range(1, 13)]
+        if len(periodo_do_mes) != 12:
+            raise ValueError("periodo_do_mes precisa de um período para cada um dos 12 meses.")
+        self.periodo_do_mes = (None, *periodo_do_mes)
+
+    def valido(self, periodo):
+        return 1 <= periodo <= self.periodos
+
+    def __repr__(self):
+        return f"Calendario({self.nome!r}, {self.periodos} períodos)"
+
+
+_registro = {}
+
+
+def registrar(calendario):
+    existente = _registro.setdefault(calendario.nome, calendario)
+    if existente is not calendario:
+        raise ValueError(f"Já existe um calendário chamado {calendario.nome!r}.")
+    return calendario
+
+
+def obter(calendario):
+    """Aceita um Calendario ou o nome de um calendário registrado."""
+    if isinstance(calendario, Calendario):
+        return calendario
+    try:
+        return _registro[calendario]
+    except KeyError:
+        raise LookupError(f"Calendário desconhecido: {calendario!r}.") from None
+
+
+MENSAL = registrar(Calendario('mensal', MESES))
+MENSAL_13 = registrar(Calendario('mensal-13', MESES + ('13º Salário',)))
+TRIMESTRAL = registrar(Calendario('trimestral', ('1º Trimestre', '2º Trimestre', '3º Trimestre', '4º Trimestre')))
+
+# O calendário do projeto: 12 meses + 13º
+PADRAO = MENSAL_13
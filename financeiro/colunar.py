@@ -0,0 +1,341 @@
+# financeiro/colunar.py
+"""
+Cache colunar do ledger, local ao processo (opt-in).
+
+Guarda só (id, competencia, valor) de cada lançamento do ledger, quente
+ou arquivado (leitura unificada de fechamento.py), em três arrays NumPy
+ordenados por (competencia, id), em vez de instâncias do model:
+
+    ids           int64
+    competencias  int32   AAAAMM, o mesmo valor gravado no banco
+    centavos      int64   Dinheiro.centavos, o mesmo valor gravado no banco
+
+São 20 bytes por lançamento. Uma faixa de competências é uma fatia
+contínua dos arrays (busca binária), e totais e top-N viram operações
+vetorizadas sobre ela, sem ida ao banco.
+
+Configuração (core/settings.py):
+    LEDGER_COLUNAR_ATIVO      liga o cache (padrão False)
+    LEDGER_COLUNAR_LIMITE_MB  teto de memória; acima dele o cache se
+                              desliga e obter() devolve None, sem tentar
+                              recarregar antes do TTL (padrão 64)
+    LEDGER_COLUNAR_TTL        segundos até recarregar do banco (padrão 300)
+
+Atualização: os signals de Lancamento chamam registrar_gravacao() e
+registrar_exclusao() depois do commit. As operações em lote (lotes.py)
+não disparam signals e chamam invalidar(), assim como fechar() e
+reabrir() de fechamento.py. Gravações de outros processos
+só aparecem na próxima recarga (TTL).
+"""
+import threading
+import time
+import numpy as np
+from django.conf import settings
+
+from . import fechamento
+from .models import Competencia, Dinheiro
+
+BYTES_POR_LINHA = 8 + 4 + 8
+CAPACIDADE_MINIMA = 1024
+_LINHA = np.dtype([('id', np.int64), ('competencia', np.int32), ('centavos', np.int64)])
+
+
+def para_centavos(valor):
+    return Dinheiro.parse(valor).centavos
+
+
+def de_centavos(centavos):
+    return Dinheiro.from_centavos(centavos)
+
+
+def _como_int(competencia):
+    if competencia is None:
+        return None
+    return Competencia.parse(competencia).as_int
+
+
+class LimiteExcedido(Exception):
+    pass
+
+
+class LedgerColunar:
+
+    def __init__(self, limite_bytes, ttl=None):
+        self.limite_bytes = limite_bytes
+        self.ttl = ttl
+        self._trava = threading.RLock()
+        self._liberar()
+        self.excedido = False
+        self.excedido_em = None
+        self.recargas = 0
+        self.atualizacoes = 0
+
+    def _liberar(self):
+        self._ids = np.empty(0, dtype=np.int64)
+        self._competencias = np.empty(0, dtype=np.int32)
+        self._centavos = np.empty(0, dtype=np.int64)
+        self._n = 0
+        self.carregado_em = None
+
+    # --- Estado ---
+
+    @property
+    def carregado(self):
+        return self.carregado_em is not None
+
+    @property
+    def expirado(self):
+        return self.ttl is not None and self.carregado and time.monotonic() - self.carregado_em > self.ttl
+
+    @property
+    def em_espera(self):
+        """Excedeu o limite e o TTL ainda não passou: não vale recarregar (seria outro COUNT(*))."""
+        return self.excedido and (self.ttl is None or time.monotonic() - self.excedido_em <= self.ttl)
+
+    def _exceder(self):
+        self._liberar()
+        self.excedido = True
+        self.excedido_em = time.monotonic()
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def capacidade(self):
+        return len(self._ids)
+
+    @property
+    def memoria_bytes(self):
+        return self._ids.nbytes + self._competencias.nbytes + self._centavos.nbytes
+
+    def estatisticas(self):
+        return {
+            'ativo': self.carregado,
+            'excedido': self.excedido,
+            'linhas': self._n,
+            'capacidade': self.capacidade,
+            'memoria_bytes': self.memoria_bytes,
+            'limite_bytes': self.limite_bytes,
+            'recargas': self.recargas,
+            'atualizacoes': self.atualizacoes,
+        }
+
+    def como_prometheus(self):
+        e = self.estatisticas()
+        return "".join(
+            f"financeiro_ledger_colunar_{nome} {int(e[nome])}\n"
+            for nome in ('linhas', 'memoria_bytes', 'limite_bytes', 'recargas', 'atualizacoes', 'excedido')
+        )
+
+    # --- Carga e invalidação ---
+
+    def carregar(self, queryset=None):
+        """
+        Lê (id, competencia, valor) do banco numa passada: sem `queryset`,
+        o ledger inteiro, incluindo as competências fechadas. Retorna False
+        se exceder o limite.
+        """
+        if queryset is None:
+            registros = fechamento.lancamentos(ordem=('competencia', 'id'))
+        else:
+            registros = queryset.order_by('competencia', 'id').values('id', 'competencia', 'valor')
+        with self._trava:
+            self._liberar()
+            self.recargas += 1
+            if registros.count() * BYTES_POR_LINHA > self.limite_bytes:
+                self._exceder()
+                return False
+            linhas = np.fromiter(
+                ((r['id'], r['competencia'].as_int, r['valor'].centavos) for r in registros.iterator()),
+                dtype=_LINHA,
+            )
+            try:
+                self._reservar(len(linhas))
+            except LimiteExcedido:
+                # A tabela cresceu entre o count() e a leitura
+                self._exceder()
+                return False
+            self._n = len(linhas)
+            self._ids[:self._n] = linhas['id']
+            self._competencias[:self._n] = linhas['competencia']
+            self._centavos[:self._n] = linhas['centavos']
+            self.carregado_em = time.monotonic()
+            self.excedido = False
+            return True
+
+    def invalidar(self):
+        with self._trava:
+            self._liberar()
+
+    def _reservar(self, n):
+        if n <= self.capacidade:
+            return
+        maximo = self.limite_bytes // BYTES_POR_LINHA
+        if n > maximo:
+            raise LimiteExcedido(n)
+        nova = min(max(n, 2 * self.capacidade, CAPACIDADE_MINIMA), maximo)
+        for nome in ('_ids', '_competencias', '_centavos'):
+            antigo = getattr(self, nome)
+            novo = np.empty(nova, dtype=antigo.dtype)
+            novo[:self._n] = antigo[:self._n]
+            setattr(self, nome, novo)
+
+    # --- Atualização incremental ---
+
+    def _posicao(self, pk):
+        achados = np.flatnonzero(self._ids[:self._n] == pk)
+        return int(achados[0]) if len(achados) else None
+
+    def _inserir(self, i, pk, competencia, centavos):
+        n = self._n
+        for coluna in (self._ids, self._competencias, self._centavos):
+            coluna[i + 1:n + 1] = coluna[i:n]
+        self._ids[i], self._competencias[i], self._centavos[i] = pk, competencia, centavos
+        self._n = n + 1
+
+    def _remover(self, i):
+        n = self._n
+        for coluna in (self._ids, self._competencias, self._centavos):
+            coluna[i:n - 1] = coluna[i + 1:n]
+        self._n = n - 1
+
+    def gravar(self, pk, competencia, centavos):
+        with self._trava:
+            if not self.carregado:
+                return
+            i = self._posicao(pk)
+            if i is not None and self._competencias[i] == competencia:
+                self._centavos[i] = centavos
+            else:
+                if i is not None:
+                    self._remover(i)
+                else:
+                    try:
+                        self._reservar(self._n + 1)
+                    except LimiteExcedido:
+                        self._exceder()
+                        return
+                # Lançamentos novos costumam cair no fim da competência (id crescente)
+                j = int(np.searchsorted(self._competencias[:self._n], competencia, side='right'))
+                self._inserir(j, pk, competencia, centavos)
+            self.atualizacoes += 1
+
+    def excluir(self, pk):
+        with self._trava:
+            if not self.carregado:
+                return
+            i = self._posicao(pk)
+            if i is not None:
+                self._remover(i)
+                self.atualizacoes += 1
+
+    # --- Consultas ---
+
+    def _faixa(self, de=None, ate=None):
+        """
+        (competencias, centavos, ids) das linhas em [de, ate]. Como as
+        linhas estão ordenadas por competência, a faixa é uma fatia
+        contínua (views, sem cópia) achada por busca binária.
+        """
+        n = self._n
+        competencias = self._competencias[:n]
+        de, ate = _como_int(de), _como_int(ate)
+        inicio = 0 if de is None else int(np.searchsorted(competencias, de, side='left'))
+        fim = n if ate is None else int(np.searchsorted(competencias, ate, side='right'))
+        fatia = slice(inicio, max(inicio, fim))
+        return competencias[fatia], self._centavos[:n][fatia], self._ids[:n][fatia]
+
+    def total(self, de=None, ate=None):
+        with self._trava:
+            _, centavos, _ = self._faixa(de, ate)
+            return de_centavos(centavos.sum())
+
+    def quantidade(self, de=None, ate=None):
+        with self._trava:
+            return len(self._faixa(de, ate)[0])
+
+    def filtrar(self, de=None, ate=None):
+        """Cópias dos arrays da faixa: {'id', 'competencia', 'centavos'}."""
+        with self._trava:
+            competencias, centavos, ids = self._faixa(de, ate)
+            return {'id': ids.copy(), 'competencia': competencias.copy(), 'centavos': centavos.copy()}
+
+    def totais_por_competencia(self, de=None, ate=None):
+        """{Competencia: (total, quantidade)} em ordem de competência."""
+        with self._trava:
+            competencias, centavos, _ = self._faixa(de, ate)
+            if not len(competencias):
+                return {}
+            # Início de cada bloco de competência igual
+            inicios = np.flatnonzero(np.r_[True, competencias[1:] != competencias[:-1]])
+            totais = np.add.reduceat(centavos, inicios)
+            quantidades = np.diff(np.r_[inicios, len(competencias)])
+            unicas = competencias[inicios]
+        return {
+            Competencia.from_int(int(c)): (de_centavos(t), int(q))
+            for c, t, q in zip(unicas, totais, quantidades)
+        }
+
+    def top(self, n, de=None, ate=None, maiores=True):
+        """Os n lançamentos de maior (ou menor) valor: [(id, Competencia, valor)]."""
+        with self._trava:
+            competencias, centavos, ids = self._faixa(de, ate)
+            n = min(n, len(centavos))
+            if n <= 0:
+                return []
+            chave = -centavos if maiores else centavos
+            # argpartition acha os n primeiros sem ordenar o resto; só eles são ordenados
+            indices = np.argpartition(chave, n - 1)[:n] if n < len(chave) else np.arange(len(chave))
+            indices = indices[np.lexsort((ids[indices], chave[indices]))]
+            return [
+                (int(ids[i]), Competencia.from_int(int(competencias[i])), de_centavos(centavos[i]))
+                for i in indices
+            ]
+
+
+# --- Instância do processo ---
+
+_ledger = None
+_trava_global = threading.Lock()
+
+
+def obter():
+    """
+    O cache do processo, carregado e dentro do TTL; None se desligado
+    nas settings ou se o ledger não couber no limite de memória. Depois
+    de exceder o limite, só tenta de novo quando o TTL passar.
+    """
+    global _ledger
+    if not getattr(settings, 'LEDGER_COLUNAR_ATIVO', False):
+        return None
+    with _trava_global:
+        if _ledger is None:
+            _ledger = LedgerColunar(
+                limite_bytes=int(getattr(settings, 'LEDGER_COLUNAR_LIMITE_MB', 64) * 2**20),
+                ttl=getattr(settings, 'LEDGER_COLUNAR_TTL', 300),
+            )
+        if _ledger.em_espera:
+            return None
+        if not _ledger.carregado or _ledger.expirado:
+            _ledger.carregar()
+    return _ledger if _ledger.carregado else None
+
+
+def atual():
+    """O cache do processo sem carregar nada (para métricas)."""
+    return _ledger
+
+
+def registrar_gravacao(pk, competencia, valor):
+    if _ledger is not None and _ledger.carregado:
+        _ledger.gravar(pk, _como_int(competencia), para_centavos(valor))
+
+
+def registrar_exclusao(pk):
+    if _ledger is not None and _ledger.carregado:
+        _ledger.excluir(pk)
+
+
+def invalidar():
+    if _ledger is not None:
+        _ledger.invalidar()
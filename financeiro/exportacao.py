@@ -0,0 +1,63 @@
+# financeiro/exportacao.py
+import csv
+import json
+from . import fechamento
+from .models import Competencia
+
+COLUNAS = ['id', 'descricao', 'valor', 'competencia', 'competencia_formatada']
+FORMATOS = ('csv', 'jsonl')
+
+
+class _Eco:
+    """Pseudo-arquivo: write() devolve a linha em vez de guardá-la."""
+
+    def write(self, valor):
+        return valor
+
+
+def intervalo_competencias(de=None, ate=None):
+    """Converte os limites (AAAAMM ou MM/AAAA) em Competencia. ValueError se inválidos."""
+    return Competencia.parse(de or None), Competencia.parse(ate or None)
+
+
+def registros(de=None, ate=None, chunk_size=2000):
+    """
+    Gerador de tuplas na ordem de COLUNAS, com memória constante.
+
+    Lê a tabela quente e o arquivo das competências fechadas (leitura
+    unificada de fechamento.py) como dicts, com iterator(chunk_size):
+    nenhuma instância de model é criada e o cursor é lido em blocos.
+    """
+    # Poucos períodos distintos: formata cada um só uma vez
+    formatadas = {}
+    linhas = fechamento.lancamentos(de, ate, ordem=('competencia', 'id'))
+    for linha in linhas.iterator(chunk_size=chunk_size):
+        competencia = linha['competencia']
+        bruto = competencia.as_int
+        if bruto not in formatadas:
+            formatadas[bruto] = str(competencia)
+        yield linha['id'], linha['descricao'], linha['valor'].decimal, bruto, formatadas[bruto]
+
+
+def linhas_csv(registros, cabecalho=True):
+    escritor = csv.writer(_Eco())
+    if cabecalho:
+        yield escritor.writerow(COLUNAS)
+    for registro in registros:
+        yield escritor.writerow(registro)
+
+
+def linhas_jsonl(registros):
+    # valor vai como string para não perder precisão decimal
+    for pk, descricao, valor, bruto, formatada in registros:
+        yield json.dumps(
+            {'id': pk, 'descricao': descricao, 'valor': str(valor),
+             'competencia': bruto, 'competencia_formatada': formatada},
+            ensure_ascii=False,
+        ) + "\n"
+
+
+def serializar(registros, formato):
+    if formato == 'csv':
+        return linhas_csv(registros)
+    return linhas_jsonl(registros)
@@ -0,0 +1,204 @@
+# financeiro/fechamento.py
+"""
+Fechamento de competências: um período fechado é imutável e sai da
+tabela quente.
+
+fechar() marca a competência em CompetenciaFechada e move os lançamentos
+dela de Lancamento para LancamentoArquivado (mesmos ids), com um
+INSERT ... SELECT e um DELETE no próprio banco, numa transação. Os
+totais do ResumoCompetencia não mudam: o período continua no ledger, só
+que no arquivo. reabrir() faz o caminho inverso.
+
+Leitura unificada: lancamentos() lê as duas tabelas como uma só (UNION
+ALL), consultando só a tabela que pode ter a faixa pedida. Gravações em
+competências fechadas são recusadas no próprio Lancamento: clean()
+(forms e admin), save() e bulk_create/bulk_update (API e importação,
+que antes já validam pelo ConversorLancamentos de lotes.py).
+
+relatorio() mede o tamanho das tabelas e o tempo de consultas típicas,
+para acompanhar o efeito do arquivamento na tabela quente.
+"""
+import time
+
+from django.db import DatabaseError, connections, router, transaction
+from django.db.models import BooleanField, Sum, Value
+
+from .models import Competencia, CompetenciaFechada, Lancamento, LancamentoArquivado, VersaoLedger
+from .signals import notificar_colunar
+
+CAMPOS = ('id', 'descricao', 'valor', 'competencia')
+
+
+def fechadas():
+    """Competências fechadas, em ordem."""
+    return list(CompetenciaFechada.objects.values_list('competencia', flat=True))
+
+
+def _mover(origem, destino, competencia):
+    """
+    INSERT ... SELECT + DELETE dos lançamentos da competência. Retorna a
+    quantidade movida.
+
+    O DELETE só apaga os ids que já estão no destino: em READ COMMITTED
+    cada comando vê um snapshot novo, e um lançamento gravado por outra
+    sessão entre os dois comandos seria apagado sem ter sido copiado.
+    """
+    conexao = connections[router.db_for_write(origem)]
+    q = conexao.ops.quote_name
+    colunas = ", ".join(q(origem._meta.get_field(campo).column) for campo in CAMPOS)
+    coluna_id = q(origem._meta.get_field('id').column)
+    coluna_competencia = q(origem._meta.get_field('competencia').column)
+    tabela_origem, tabela_destino = q(origem._meta.db_table), q(destino._meta.db_table)
+    params = [competencia.as_int]
+    with conexao.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {tabela_destino} ({colunas}) "
+            f"SELECT {colunas} FROM {tabela_origem} WHERE {coluna_competencia} = %s",
+            params,
+        )
+        # DELETE direto: o .delete() do ORM carregaria cada linha para os signals
+        cursor.execute(
+            f"DELETE FROM {tabela_origem} WHERE {coluna_competencia} = %s AND {coluna_id} IN "
+            f"(SELECT {coluna_id} FROM {tabela_destino} WHERE {coluna_competencia} = %s)",
+            params * 2,
+        )
+        return cursor.rowcount
+
+
+@transaction.atomic
+def fechar(competencia):
+    """
+    Fecha a competência e arquiva os lançamentos dela. Retorna o
+    CompetenciaFechada criado; ValueError se ela já estiver fechada.
+    """
+    competencia = Competencia.parse(competencia)
+    if CompetenciaFechada.esta_fechada(competencia):
+        raise ValueError(f"A competência {competencia} já está fechada.")
+    fechada = CompetenciaFechada.objects.create(competencia=competencia)
+    fechada.quantidade = _mover(Lancamento, LancamentoArquivado, competencia)
+    # Totais do que foi de fato arquivado, não de uma leitura anterior à cópia
+    fechada.total = LancamentoArquivado.objects.filter(competencia=competencia).aggregate(total=Sum('valor'))['total'] or 0
+    fechada.save(update_fields=['quantidade', 'total'])
+    VersaoLedger.incrementar()
+    notificar_colunar('invalidar')
+    return fechada
+
+
+@transaction.atomic
+def reabrir(competencia):
+    """Devolve os lançamentos à tabela quente e remove o fechamento. ValueError se não estiver fechada."""
+    competencia = Competencia.parse(competencia)
+    if not CompetenciaFechada.objects.filter(competencia=competencia).delete()[0]:
+        raise ValueError(f"A competência {competencia} não está fechada.")
+    movidos = _mover(LancamentoArquivado, Lancamento, competencia)
+    VersaoLedger.incrementar()
+    notificar_colunar('invalidar')
+    return movidos
+
+
+# --- Leitura unificada ---
+
+def lancamentos(de=None, ate=None, ordem=('-competencia', '-id'), filtrar=None):
+    """
+    Queryset (values) de todos os lançamentos em [de, ate], quentes e
+    arquivados: dicts com id, descricao, valor, competencia e arquivado.
+
+    Como é um UNION, aceita order_by/fatiamento/iterator, mas não filter:
+    os filtros entram pelos parâmetros, e `filtrar(queryset)` (ex.: o
+    cursor de uma paginação keyset) é aplicado a cada tabela. Só as
+    tabelas que podem ter a faixa pedida entram na consulta.
+    """
+    de, ate = Competencia.parse(de), Competencia.parse(ate)
+    partes = []
+    faixa_fechadas = CompetenciaFechada.objects.all()
+    if de is not None:
+        faixa_fechadas = faixa_fechadas.filter(competencia__gte=de)
+    if ate is not None:
+        faixa_fechadas = faixa_fechadas.filter(competencia__lte=ate)
+    tem_fechadas = faixa_fechadas.exists()
+
+    for modelo, arquivado in ((Lancamento, False), (LancamentoArquivado, True)):
+        if arquivado and not tem_fechadas:
+            continue
+        queryset = modelo.objects.order_by()
+        if de is not None:
+            queryset = queryset.filter(competencia__gte=de)
+        if ate is not None:
+            queryset = queryset.filter(competencia__lte=ate)
+        if filtrar is not None:
+            queryset = filtrar(queryset)
+        partes.append(queryset.annotate(arquivado=Value(arquivado, output_field=BooleanField())).values(*CAMPOS, 'arquivado'))
+
+    unificado = partes[0].union(*partes[1:], all=True) if len(partes) > 1 else partes[0]
+    return unificado.order_by(*ordem)
+
+
+def obter(pk):
+    """Um lançamento pelo id, quente ou arquivado. DoesNotExist se não existir em nenhum."""
+    try:
+        return Lancamento.objects.get(pk=pk)
+    except Lancamento.DoesNotExist:
+        try:
+            return LancamentoArquivado.objects.get(pk=pk)
+        except LancamentoArquivado.DoesNotExist:
+            raise Lancamento.DoesNotExist(f"Lançamento {pk} não encontrado.") from None
+
+
+# --- Relatório da tabela quente ---
+
+def _bytes_da_tabela(conexao, tabela):
+    """Tamanho em disco (tabela + índices), ou None se o banco não informa."""
+    with conexao.cursor() as cursor:
+        if conexao.vendor == 'postgresql':
+            cursor.execute("SELECT pg_total_relation_size(%s)", [tabela])
+            return cursor.fetchone()[0]
+        if conexao.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name = %s "
+                    "OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)",
+                    [tabela, tabela],
+                )
+            except DatabaseError:
+                # SQLite compilado sem a tabela virtual dbstat
+                return None
+            return cursor.fetchone()[0]
+    return None
+
+
+def _cronometrar(funcao, repeticoes):
+    """Melhor tempo, em ms, de `repeticoes` execuções."""
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return round(melhor * 1000, 3)
+
+
+def relatorio(repeticoes=5):
+    """
+    Tamanho (linhas e bytes) da tabela quente e do arquivo, e tempos (ms,
+    melhor de `repeticoes`) de consultas típicas na tabela quente.
+    """
+    conexao = connections[router.db_for_read(Lancamento)]
+    tabelas = {}
+    for nome, modelo in (('quente', Lancamento), ('arquivo', LancamentoArquivado)):
+        tabelas[nome] = {
+            'tabela': modelo._meta.db_table,
+            'linhas': modelo.objects.count(),
+            'bytes': _bytes_da_tabela(conexao, modelo._meta.db_table),
+        }
+    consultas = {
+        'contagem': lambda: Lancamento.objects.count(),
+        'primeira_pagina': lambda: list(Lancamento.objects.order_by('-competencia', '-id')[:50]),
+        'totais_por_competencia': lambda: list(
+            Lancamento.objects.order_by().values('competencia').annotate(total=Sum('valor'))
+        ),
+    }
+    return {
+        'fechadas': [c.as_int for c in fechadas()],
+        'tabelas': tabelas,
+        'consultas_ms': {nome: _cronometrar(consulta, repeticoes) for nome, consulta in consultas.items()},
+    }
@@ -1,45 +1,48 @@
 # financeiro/fields.py
 import datetime
+import hashlib
 from django import forms
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from .validators import validar_ano_inicio, validar_ano_limite_futuro, validar_mes_range
+from django.forms.renderers import get_default_renderer
+from django.utils import translation
+from django.utils.safestring import mark_safe
+from . import calendarios
+from .validators import ValidadorCompetencia
 
 # --- 1. Definição das Opções (Choices) ---
-MESES_CHOICES = [
-    (1, 'Janeiro'),
-    (2, 'Fevereiro'),
-    (3, 'Março'),
-    (4, 'Abril'),
-    (5, 'Maio'),
-    (6, 'Junho'),
-    (7, 'Julho'),
-    (8, 'Agosto'),
-    (9, 'Setembro'),
-    (10, 'Outubro'),
-    (11, 'Novembro'),
-    (12, 'Dezembro'),
-    (13, '13º Salário'),
-]
+MESES_CHOICES = list(calendarios.PADRAO.choices)
+
+def _segundos_ate_amanha():
+    agora = datetime.datetime.now()
+    amanha = datetime.datetime.combine(agora.date() + datetime.timedelta(days=1), datetime.time.min)
+    return max(1, int((amanha - agora).total_seconds()))
+
 
 # --- 2. O Widget (Componente Visual) ---
 class CompetenciaWidget(forms.MultiWidget):
     # O caminho para o seu HTML personalizado com o Modal
     template_name = 'widgets/competencia_arrow.html'
+    # Estilo + modal + script: só dependem do id, então vão para o cache
+    template_estatico = 'widgets/competencia_arrow_estatico.html'
+    cache_prefixo = 'competencia_widget'
 
-    def __init__(self, attrs=None):
+    def __init__(self, attrs=None, choices=MESES_CHOICES):
         # Aqui definimos os widgets que aparecem na tela.
         # Usamos Select e NumberInput para que o usuário veja os campos
         # ao lado do botão de calendário.
         widgets = [
             forms.Select(
                 attrs={'class': 'form-select', 'aria-label': 'Mês'}, 
-                choices=MESES_CHOICES
+                choices=choices
             ),
             forms.NumberInput(
                 attrs={'class': 'form-control', 'placeholder': 'Ano', 'aria-label': 'Ano'}
             ),
         ]
         super().__init__(widgets, attrs)
+        # Entra na chave do cache do Select: calendários diferentes, HTML diferente
+        self.assinatura_choices = hashlib.md5(repr(list(choices)).encode()).hexdigest()[:8]
 
     def decompress(self, value):
         """
@@ -64,6 +67,7 @@ class CompetenciaWidget(forms.MultiWidget):
         return [today.month, today.year]
 
     def get_context(self, name, value, attrs):
+        attrs = dict(attrs or {})
         context = super().get_context(name, value, attrs)
         # Garante que o ID principal esteja disponível no template
         # Isso é crucial para o JavaScript do Modal saber qual campo atualizar
@@ -72,23 +76,71 @@ class CompetenciaWidget(forms.MultiWidget):
         context['widget']['attrs']['id'] = attrs['id']
         return context
 
+    def render(self, name, value, attrs=None, renderer=None):
+        """
+        Monta o HTML com as partes caras vindas do cache: o fragmento
+        estático (por id) e o Select de meses (por id e mês escolhido).
+        Só o NumberInput do ano é renderizado sempre.
+        """
+        renderer = renderer or get_default_renderer()
+        context = self.get_context(name, value, attrs)
+        widget = context['widget']
+        widget['subwidgets_html'] = [self._render_subwidget(sub, renderer) for sub in widget['subwidgets']]
+        widget['fragmento_estatico'] = self.fragmento_estatico(widget['attrs']['id'], renderer)
+        return self._render(self.template_name, context, renderer)
+
+    def fragmento_estatico(self, widget_id, renderer):
+        return self._render_em_cache(
+            ('estatico', widget_id),
+            lambda: renderer.render(self.template_estatico, {'widget': {'attrs': {'id': widget_id}}}),
+        )
+
+    def _render_subwidget(self, subwidget, renderer):
+        def render():
+            return renderer.render(subwidget['template_name'], {'widget': subwidget})
+
+        # Só o Select (13 opções, uma sub-template por opção) compensa o cache;
+        # ele só varia com o mês escolhido, então há no máximo 14 versões por campo
+        if 'optgroups' not in subwidget:
+            return mark_safe(render())
+        chave = (subwidget['name'], sorted(subwidget['attrs'].items()), subwidget['value'], self.assinatura_choices)
+        return self._render_em_cache(('select', chave), render)
+
+    def _render_em_cache(self, partes, render):
+        """
+        Cache por dia e idioma: a chave inclui a data, e a entrada expira à
+        meia-noite, então nada renderizado "ontem" é servido hoje.
+        """
+        assinatura = hashlib.md5(repr(partes).encode()).hexdigest()
+        chave = f"{self.cache_prefixo}:{datetime.date.today().isoformat()}:{translation.get_language()}:{assinatura}"
+        html = cache.get(chave)
+        if html is None:
+            html = render()
+            cache.set(chave, html, _segundos_ate_amanha())
+        return mark_safe(html)
+
 
 # --- O Field (Atualizado com Validators) ---
 class CompetenciaField(forms.MultiValueField):
     widget = CompetenciaWidget
 
-    def __init__(self, **kwargs):
+    def __init__(self, calendario=calendarios.PADRAO, **kwargs):
+        self.calendario = calendarios.obter(calendario)
         fields = (
-            forms.IntegerField(min_value=1, max_value=13),
+            forms.IntegerField(min_value=1, max_value=self.calendario.periodos),
             forms.IntegerField(min_value=1900, max_value=2100),
         )
         
+        if 'widget' not in kwargs:
+            kwargs['widget'] = CompetenciaWidget(choices=self.calendario.choices)
+
         if 'help_text' not in kwargs:
             kwargs['help_text'] = "Selecione o mês e o ano."
         
         # --- A MÁGICA DOS VALIDATORS ACONTECE AQUI ---
         # Pegamos os validadores que o usuário passou (se houver) e adicionamos os nossos padrões
-        validators_padrao = [validar_ano_inicio, validar_ano_limite_futuro, validar_mes_range]
+        # Um validator composto: decodifica o valor uma vez e roda todas as regras
+        validators_padrao = [ValidadorCompetencia(calendario=self.calendario)]
         
         if 'validators' in kwargs:
             kwargs['validators'] += validators_padrao
@@ -118,4 +170,25 @@ class CompetenciaField(forms.MultiValueField):
         # AQUI ESTÁ A MUDANÇA:
         # Agora podemos instanciar passando (ano, mes) direto!
         # Muito mais limpo que fazer a conta (ano * 100 + mes) manualmente.
-        return Competencia(ano, mes)
\ No newline at end of file
+        return Competencia.para_calendario(self.calendario)(ano, mes)
+
+class DinheiroField(forms.DecimalField):
+    """
+    Campo de formulário do CentavosField: valida como DecimalField
+    (10 dígitos, 2 casas) e entrega um Dinheiro no cleaned_data.
+    """
+
+    def __init__(self, *, max_digits=None, decimal_places=2, **kwargs):
+        from .models import Dinheiro
+        super().__init__(max_digits=max_digits or Dinheiro.MAX_DIGITOS, decimal_places=decimal_places, **kwargs)
+
+    def prepare_value(self, value):
+        from .models import Dinheiro
+        if isinstance(value, Dinheiro):
+            return value.decimal
+        return super().prepare_value(value)
+
+    def clean(self, value):
+        from .models import Dinheiro
+        valor = super().clean(value)
+        return None if valor is None else Dinheiro(valor)
@@ -8,4 +8,6 @@ class LancamentoForm(forms.ModelForm):
         widgets = {
             'descricao': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Ex: Adiantamento'}),
             'valor': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': '0,00'}),
-        }
\ No newline at end of file
+        }
+
+    # Competências fechadas são recusadas no Lancamento.clean() (full_clean do ModelForm)
@@ -0,0 +1,111 @@
+# financeiro/lookups.py
+"""
+Lookups e transforms do CompetenciaField.
+
+Todos compilam para comparações de intervalo na coluna AAAAMM, sem
+calcular "competencia / 100" por linha, para que o banco use o índice:
+
+    Lancamento.objects.filter(competencia__ano=2025)
+    Lancamento.objects.filter(competencia__ano__gte=2024)
+    Lancamento.objects.filter(competencia__between=('12/2025', 202601))
+    Lancamento.objects.filter(competencia__ultimos=13)
+"""
+from django.db.models import IntegerField, Lookup, Transform
+from django.db.models import lookups
+
+
+def limites_ano(ano):
+    """Menor e maior AAAAMM possíveis de um ano (inclui o mês 13)."""
+    ano = int(ano)
+    return ano * 100, ano * 100 + 99
+
+
+# --- 1. Transform "ano" ---
+class AnoCompetencia(Transform):
+    """
+    competencia__ano. Usado sozinho (values/annotate) vira "competencia / 100";
+    nas comparações abaixo vira um intervalo na própria coluna.
+    """
+    lookup_name = 'ano'
+    template = '(%(expressions)s / 100)'
+    output_field = IntegerField()
+
+
+class _AnoPorIntervalo:
+    """Reescreve "ano OP valor" como predicado na coluna AAAAMM."""
+
+    def predicado(self, inicio, fim):
+        raise NotImplementedError
+
+    def as_sql(self, compiler, connection):
+        if not self.rhs_is_direct_value():
+            return super().as_sql(compiler, connection)
+        coluna, params = compiler.compile(self.lhs.lhs)
+        sql, limites = self.predicado(*limites_ano(self.rhs))
+        return f"{coluna} {sql}", (*params, *limites)
+
+
+@AnoCompetencia.register_lookup
+class AnoExact(_AnoPorIntervalo, lookups.Exact):
+    def predicado(self, inicio, fim):
+        return "BETWEEN %s AND %s", (inicio, fim)
+
+
+@AnoCompetencia.register_lookup
+class AnoGt(_AnoPorIntervalo, lookups.GreaterThan):
+    def predicado(self, inicio, fim):
+        return "> %s", (fim,)
+
+
+@AnoCompetencia.register_lookup
+class AnoGte(_AnoPorIntervalo, lookups.GreaterThanOrEqual):
+    def predicado(self, inicio, fim):
+        return ">= %s", (inicio,)
+
+
+@AnoCompetencia.register_lookup
+class AnoLt(_AnoPorIntervalo, lookups.LessThan):
+    def predicado(self, inicio, fim):
+        return "< %s", (inicio,)
+
+
+@AnoCompetencia.register_lookup
+class AnoLte(_AnoPorIntervalo, lookups.LessThanOrEqual):
+    def predicado(self, inicio, fim):
+        return "<= %s", (fim,)
+
+
+# --- 2. Intervalo de competências ---
+class Entre(lookups.Range):
+    """
+    competencia__between=(de, ate), inclusivo. Aceita Competencia,
+    AAAAMM ou "MM/AAAA" em cada ponta.
+    """
+    lookup_name = 'between'
+
+    def get_prep_lookup(self):
+        from .models import Competencia
+
+        de, ate = self.rhs
+        return [Competencia.parse(de).as_int, Competencia.parse(ate).as_int]
+
+
+# --- 3. Últimos N períodos ---
+class Ultimos(Lookup):
+    """
+    competencia__ultimos=N: as N competências que terminam na do mês atual,
+    contando no calendário do campo (no padrão, N=13 cobre um ano inteiro).
+    """
+    lookup_name = 'ultimos'
+    prepare_rhs = False
+
+    def limites(self):
+        quantidade = int(self.rhs)
+        if quantidade < 1:
+            raise ValueError("competencia__ultimos exige N >= 1.")
+        atual = self.lhs.output_field.competencia.hoje()
+        return (atual - (quantidade - 1)).as_int, atual.as_int
+
+    def as_sql(self, compiler, connection):
+        coluna, params = self.process_lhs(compiler, connection)
+        return f"{coluna} BETWEEN %s AND %s", (*params, *self.limites())
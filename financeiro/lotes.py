@@ -0,0 +1,161 @@
+# financeiro/lotes.py
+"""
+Operações em lote sobre Lancamento, compartilhadas pelo comando
+importar_lancamentos e pela API JSON.
+
+- ConversorLancamentos: converte/valida registros brutos (dicts).
+- gravar_lancamentos / atualizar_lancamentos: bulk_create / bulk_update
+  numa transação, mantendo o ResumoCompetencia e a VersaoLedger (bulk_* não
+  disparam signals) e invalidando o cache colunar, se ativo.
+"""
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+
+from .models import CompetenciaFechada, Dinheiro, Lancamento, ResumoCompetencia, VersaoLedger
+from .signals import notificar_colunar
+from .validators import ValidadorCompetencia
+
+CAMPOS = ('descricao', 'valor', 'competencia')
+DESCRICAO_MAX = Lancamento._meta.get_field('descricao').max_length
+# Calendário e classe de Competencia do campo (o validator segue os períodos dele)
+CALENDARIO = Lancamento._meta.get_field('competencia').calendario
+COMPETENCIA = Lancamento._meta.get_field('competencia').competencia
+# Mesmos limites do formulário (DinheiroField)
+VALOR_CASAS = Dinheiro.CASAS
+VALOR_LIMITE = Decimal(10) ** (Dinheiro.MAX_DIGITOS + VALOR_CASAS.as_tuple().exponent)
+
+
+class ConversorLancamentos:
+    """
+    Converte registros brutos em valores de Lancamento, validando cada campo.
+
+    O resultado dos validators (e a checagem de competência fechada) é
+    memorizado por competência: um ledger tem poucas centenas de períodos
+    distintos, então a validação roda uma vez por período e não uma vez
+    por linha. "Hoje" é fixado na criação do conversor (um por lote ou
+    requisição).
+    """
+
+    def __init__(self, hoje=None):
+        self.validador = ValidadorCompetencia(hoje=hoje or datetime.date.today(), calendario=CALENDARIO)
+        self._erros_por_competencia = {}
+
+    def erro_competencia(self, competencia):
+        chave = competencia.as_int
+        if chave not in self._erros_por_competencia:
+            mensagens = [m for exc in self.validador.erros(competencia) for m in exc.messages]
+            if not mensagens and CompetenciaFechada.esta_fechada(competencia):
+                mensagens = [CompetenciaFechada.mensagem(competencia)]
+            self._erros_por_competencia[chave] = "; ".join(mensagens) or None
+        return self._erros_por_competencia[chave]
+
+    # --- Conversão campo a campo (ValueError com a mensagem) ---
+
+    def descricao(self, bruto):
+        descricao = str(bruto or '').strip()
+        if not descricao:
+            raise ValueError("Descrição obrigatória.")
+        if len(descricao) > DESCRICAO_MAX:
+            raise ValueError(f"Descrição maior que {DESCRICAO_MAX} caracteres.")
+        return descricao
+
+    def valor(self, bruto):
+        # Mesmo parse do form e do banco ("1.234,56", "R$ 10,00"), sem arredondar
+        try:
+            valor = Dinheiro.parse(bruto if isinstance(bruto, str) else str(bruto), estrito=True)
+        except ValueError:
+            raise ValueError(f"Valor inválido: {bruto!r}.")
+        if abs(valor.decimal) >= VALOR_LIMITE:
+            raise ValueError(f"Valor inválido: {bruto!r}.")
+        return valor
+
+    def competencia(self, bruto):
+        try:
+            competencia = COMPETENCIA.parse(bruto)
+        except (ValueError, TypeError):
+            competencia = None
+        if competencia is None:
+            raise ValueError(f"Competência inválida: {bruto!r}.")
+        erro = self.erro_competencia(competencia)
+        if erro:
+            raise ValueError(erro)
+        return competencia
+
+    def limpar(self, registro, parcial=False):
+        """
+        Retorna (dados, erros), ambos dicts por campo. Com parcial=True
+        (PATCH), só os campos presentes no registro são convertidos.
+        """
+        dados, erros = {}, {}
+        for campo in CAMPOS:
+            if parcial and campo not in registro:
+                continue
+            try:
+                dados[campo] = getattr(self, campo)(registro.get(campo))
+            except ValueError as exc:
+                erros[campo] = str(exc)
+        return dados, erros
+
+    def converter(self, registro):
+        """Retorna (Lancamento, None) ou (None, mensagem_de_erro)."""
+        if '_erro' in registro:
+            return None, registro['_erro']
+        dados, erros = self.limpar(registro)
+        if erros:
+            return None, " ".join(erros.values())
+        return Lancamento(**dados), None
+
+
+def _somar_deltas(deltas, competencia, valor, quantidade):
+    delta = deltas[competencia]
+    delta[0] += valor
+    delta[1] += quantidade
+
+
+def _aplicar_deltas(deltas):
+    for competencia, (valor, quantidade) in deltas.items():
+        if valor or quantidade:
+            ResumoCompetencia.aplicar_delta(competencia, valor, quantidade)
+    VersaoLedger.incrementar()
+
+
+def gravar_lancamentos(lancamentos):
+    """bulk_create + deltas do ResumoCompetencia, numa única transação."""
+    if not lancamentos:
+        return lancamentos
+    deltas = defaultdict(lambda: [Dinheiro(0), 0])
+    for lancamento in lancamentos:
+        _somar_deltas(deltas, lancamento.competencia, lancamento.valor, 1)
+
+    with transaction.atomic():
+        criados = Lancamento.objects.bulk_create(lancamentos)
+        _aplicar_deltas(deltas)
+        notificar_colunar('invalidar')
+    return criados
+
+
+def atualizar_lancamentos(lancamentos, campos):
+    """
+    bulk_update dos `campos` + deltas do ResumoCompetencia, numa transação.
+    Os valores antigos são lidos (com lock, onde suportado) antes da escrita.
+    """
+    if not lancamentos:
+        return
+    deltas = defaultdict(lambda: [Dinheiro(0), 0])
+    with transaction.atomic():
+        antigos = (
+            Lancamento.objects.select_for_update()
+            .filter(pk__in=[l.pk for l in lancamentos])
+            .values_list('pk', 'competencia', 'valor')
+        )
+        for _, competencia, valor in antigos:
+            _somar_deltas(deltas, competencia, -valor, -1)
+        for lancamento in lancamentos:
+            _somar_deltas(deltas, lancamento.competencia, lancamento.valor, 1)
+
+        Lancamento.objects.bulk_update(lancamentos, campos)
+        _aplicar_deltas(deltas)
+        notificar_colunar('invalidar')
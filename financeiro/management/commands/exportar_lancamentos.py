@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from financeiro.exportacao import FORMATOS, intervalo_competencias, registros, serializar
+
+
+class Command(BaseCommand):
+    help = "Exporta os lançamentos em CSV ou JSONL, em streaming (memória constante)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--formato', choices=FORMATOS, default='csv')
+        parser.add_argument('--de', help="Competência inicial (AAAAMM ou MM/AAAA)")
+        parser.add_argument('--ate', help="Competência final (AAAAMM ou MM/AAAA)")
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help="Linhas lidas do banco por vez (padrão: 2000)")
+        parser.add_argument('--saida', help="Arquivo de destino (padrão: stdout)")
+
+    def handle(self, *args, **options):
+        try:
+            de, ate = intervalo_competencias(options['de'], options['ate'])
+        except (ValueError, TypeError):
+            raise CommandError("Competência inválida em --de/--ate.")
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size deve ser maior que zero.")
+
+        linhas = serializar(registros(de, ate, options['chunk_size']), options['formato'])
+
+        if options['saida']:
+            with open(options['saida'], 'w', newline='', encoding='utf-8') as destino:
+                destino.writelines(linhas)
+        else:
+            for linha in linhas:
+                self.stdout.write(linha, ending='')
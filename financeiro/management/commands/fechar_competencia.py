@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from financeiro import fechamento
+from financeiro.models import Competencia, CompetenciaFechada, ResumoCompetencia
+
+
+class Command(BaseCommand):
+    help = (
+        "Fecha competências (lançamentos vão para o arquivo e o período fica imutável), "
+        "reabre, ou mostra o tamanho da tabela quente e o tempo de consultas típicas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('competencias', nargs='*', help="Competências (AAAAMM ou MM/AAAA)")
+        parser.add_argument('--ate',
+                            help="Fecha todas as competências abertas com lançamentos até esta (inclusive)")
+        parser.add_argument('--reabrir', action='store_true',
+                            help="Reabre as competências informadas em vez de fechá-las")
+        parser.add_argument('--relatorio', action='store_true',
+                            help="Imprime o relatório (JSON) antes e depois; sozinho, só o relatório")
+
+    def handle(self, *args, **options):
+        try:
+            competencias = [Competencia.parse(c) for c in options['competencias']]
+            ate = Competencia.parse(options['ate'])
+        except (TypeError, ValueError) as exc:
+            raise CommandError(f"Competência inválida: {exc}")
+        if ate is not None:
+            if options['reabrir']:
+                raise CommandError("--ate não se combina com --reabrir.")
+            competencias += list(
+                ResumoCompetencia.objects.filter(competencia__lte=ate)
+                .exclude(competencia__in=CompetenciaFechada.objects.values('competencia'))
+                .values_list('competencia', flat=True)
+            )
+        if not competencias and not options['relatorio']:
+            raise CommandError("Informe competências, --ate ou --relatorio.")
+
+        antes = fechamento.relatorio() if options['relatorio'] else None
+        for competencia in sorted(set(competencias)):
+            try:
+                if options['reabrir']:
+                    movidos = fechamento.reabrir(competencia)
+                    self.stdout.write(f"{competencia}: reaberta, {movidos} lançamento(s) de volta à tabela quente.")
+                else:
+                    fechada = fechamento.fechar(competencia)
+                    self.stdout.write(f"{competencia}: fechada, {fechada.quantidade} lançamento(s) arquivado(s).")
+            except ValueError as exc:
+                raise CommandError(str(exc))
+
+        if antes is not None:
+            relatorio = {'antes': antes, 'depois': fechamento.relatorio()} if competencias else antes
+            self.stdout.write(json.dumps(relatorio, indent=2, ensure_ascii=False))
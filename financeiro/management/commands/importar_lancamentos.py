@@ -0,0 +1,92 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from financeiro.lotes import ConversorLancamentos, gravar_lancamentos
+
+
+def ler_registros(caminho, formato):
+    """
+    Gerador: produz (numero_linha, dict) sem carregar o arquivo na memória.
+    Linhas JSONL malformadas viram dict vazio com a chave '_erro'.
+    """
+    # utf-8-sig: um BOM (comum em CSV exportado por planilhas) não entra no primeiro cabeçalho
+    with open(caminho, newline='', encoding='utf-8-sig') as arquivo:
+        if formato == 'csv':
+            # Linha 1 é o cabeçalho
+            for numero, registro in enumerate(csv.DictReader(arquivo), start=2):
+                yield numero, registro
+        else:
+            for numero, linha in enumerate(arquivo, start=1):
+                if not linha.strip():
+                    continue
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError as exc:
+                    registro = {'_erro': f"JSON inválido: {exc.msg}"}
+                if not isinstance(registro, dict):
+                    registro = {'_erro': "Cada linha deve ser um objeto JSON."}
+                yield numero, registro
+
+
+def em_lotes(iteravel, tamanho):
+    iterador = iter(iteravel)
+    while lote := list(islice(iterador, tamanho)):
+        yield lote
+
+
+class Command(BaseCommand):
+    help = "Importa lançamentos em massa de um arquivo CSV ou JSONL (descricao, valor, competencia)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help="Caminho do arquivo .csv ou .jsonl")
+        parser.add_argument('--formato', choices=['csv', 'jsonl'],
+                            help="Formato do arquivo (padrão: deduzido pela extensão)")
+        parser.add_argument('--lote', type=int, default=1000,
+                            help="Registros por bulk_create/transação (padrão: 1000)")
+        parser.add_argument('--rejeitados',
+                            help="Arquivo CSV para as linhas rejeitadas (padrão: <arquivo>.rejeitados.csv)")
+
+    def handle(self, *args, **options):
+        caminho = Path(options['arquivo'])
+        if not caminho.exists():
+            raise CommandError(f"Arquivo não encontrado: {caminho}")
+        if options['lote'] < 1:
+            raise CommandError("--lote deve ser maior que zero.")
+
+        formato = options['formato'] or ('csv' if caminho.suffix.lower() == '.csv' else 'jsonl')
+        caminho_rejeitados = Path(options['rejeitados'] or f"{caminho}.rejeitados.csv")
+
+        conversor = ConversorLancamentos()
+        importados = rejeitados = 0
+        inicio = time.perf_counter()
+
+        with open(caminho_rejeitados, 'w', newline='', encoding='utf-8') as arquivo_rejeitados:
+            saida_rejeitados = csv.writer(arquivo_rejeitados)
+            saida_rejeitados.writerow(['linha', 'erro', 'registro'])
+
+            for lote in em_lotes(ler_registros(caminho, formato), options['lote']):
+                validos = []
+                for numero, registro in lote:
+                    lancamento, erro = conversor.converter(registro)
+                    if erro:
+                        rejeitados += 1
+                        saida_rejeitados.writerow([numero, erro, json.dumps(registro, ensure_ascii=False)])
+                    else:
+                        validos.append(lancamento)
+
+                gravar_lancamentos(validos)
+                importados += len(validos)
+
+        duracao = time.perf_counter() - inicio
+        taxa = (importados + rejeitados) / duracao if duracao else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{importados} lançamento(s) importado(s), {rejeitados} rejeitado(s) "
+            f"em {duracao:.2f}s ({taxa:,.0f} linhas/s)."
+        ))
+        if rejeitados:
+            self.stdout.write(f"Linhas rejeitadas em {caminho_rejeitados}")
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from financeiro.reprocessamento import TRANSFORMACOES, reprocessar
+
+
+class Command(BaseCommand):
+    help = (
+        "Revalida (e opcionalmente reescreve) a competência de todos os lançamentos, "
+        "em faixas de pk processadas em paralelo, com checkpoint para retomar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--transformacao', choices=sorted(TRANSFORMACOES), default='nenhuma',
+                            help="Reescrita aplicada antes da validação (padrão: nenhuma, só valida)")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Processos do pool (padrão: núcleos da máquina; 0 = no próprio processo)")
+        parser.add_argument('--faixa', type=int, default=50_000,
+                            help="Pks por faixa, a unidade de trabalho e de checkpoint (padrão: 50000)")
+        parser.add_argument('--lote', type=int, default=1000,
+                            help="Lançamentos por SELECT/bulk_update/transação (padrão: 1000)")
+        parser.add_argument('--checkpoint',
+                            help="Arquivo JSON de progresso; se existir, retoma de onde parou")
+        parser.add_argument('--reiniciar', action='store_true',
+                            help="Ignora o checkpoint existente e começa do zero")
+        parser.add_argument('--simular', action='store_true',
+                            help="Conta o que seria alterado, sem gravar")
+        parser.add_argument('--hoje', help="Data (AAAA-MM-DD) usada pelos validators (padrão: hoje)")
+
+    def handle(self, *args, **options):
+        if options['faixa'] < 1 or options['lote'] < 1:
+            raise CommandError("--faixa e --lote devem ser maiores que zero.")
+        if options['workers'] is not None and options['workers'] < 0:
+            raise CommandError("--workers não pode ser negativo.")
+
+        try:
+            totais = reprocessar(
+                transformacao=options['transformacao'],
+                workers=options['workers'],
+                faixa=options['faixa'],
+                lote=options['lote'],
+                checkpoint=options['checkpoint'],
+                reiniciar=options['reiniciar'],
+                simular=options['simular'],
+                hoje=options['hoje'],
+                progresso=self.progresso,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        taxa = totais['lidos'] / totais['segundos'] if totais['segundos'] else 0
+        verbo = "seriam alterado(s)" if options['simular'] else "alterado(s)"
+        self.stdout.write(self.style.SUCCESS(
+            f"{totais['lidos']} lançamento(s) lido(s), {totais['alterados']} {verbo}, "
+            f"{totais['invalidos']} inválido(s) em {totais['faixas']} faixa(s), "
+            f"{totais['segundos']:.2f}s ({taxa:,.0f} linhas/s)."
+        ))
+
+    def progresso(self, resultado, estado):
+        inicio, fim = resultado['faixa']
+        percentual = 100 * estado['concluidas'] / estado['total_faixas']
+        self.stdout.write(
+            f"[{estado['concluidas']}/{estado['total_faixas']} {percentual:5.1f}%] "
+            f"pk {inicio}-{fim - 1}: {resultado['lidos']} lido(s), {resultado['alterados']} alterado(s), "
+            f"{resultado['invalidos']} inválido(s) | {estado['linhas_por_segundo']:,.0f} linhas/s"
+        )
+        for pk, competencia, erro in resultado['exemplos']:
+            self.stdout.write(f"    #{pk} ({competencia}): {erro}")
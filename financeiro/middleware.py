@@ -0,0 +1,216 @@
+# financeiro/middleware.py
+"""
+Instrumentação por requisição: nº de queries, tempo no banco, tempo de
+renderização de template, validação de form e latência total.
+
+Os números vão para o header Server-Timing e para um registro em memória
+exposto em texto Prometheus pela MetricasView (/metricas/, só com
+METRICAS_ATIVAS).
+
+Respostas em streaming (ex.: a exportação) rodam as queries enquanto o
+corpo é consumido, depois do get_response: o corpo é envolvido para
+medir até o fim e o registro acontece quando ele termina. Elas não levam
+Server-Timing, porque os headers saem antes do corpo. Conteúdo async
+(async iterator) não é medido depois dos headers.
+
+Configuração (core/settings.py):
+    INSTRUMENTACAO_AMOSTRAGEM     fração de requisições medidas (0.0 a 1.0)
+    INSTRUMENTACAO_SERVER_TIMING  envia o header Server-Timing
+"""
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+ATRIBUTO_REQUEST = '_instrumentacao'
+
+
+def registrar_tempo(request, etapa, segundos):
+    """Soma tempo numa etapa da requisição (ex.: 'form'), se ela estiver sendo medida."""
+    medicao = getattr(request, ATRIBUTO_REQUEST, None)
+    if medicao is not None:
+        medicao.tempos[etapa] = medicao.tempos.get(etapa, 0.0) + segundos
+
+
+class _Medicao:
+    __slots__ = ('queries', 'tempos')
+
+    def __init__(self):
+        self.queries = 0
+        self.tempos = {'db': 0.0}
+
+    def __call__(self, execute, sql, params, many, context):
+        # execute_wrapper: envolve cada query em todas as conexões
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.tempos['db'] += time.perf_counter() - inicio
+
+
+class RegistroMetricas:
+    """Agregados por url_name, no formato summary (_count/_sum) do Prometheus."""
+
+    ETAPAS = ('total', 'db', 'template', 'form')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dados = {}
+
+    def registrar(self, url_name, status, queries, tempos):
+        with self._lock:
+            dados = self._dados.setdefault(url_name, {
+                'requisicoes': 0, 'erros': 0, 'queries': 0,
+                **{etapa: 0.0 for etapa in self.ETAPAS},
+            })
+            dados['requisicoes'] += 1
+            dados['erros'] += status >= 500
+            dados['queries'] += queries
+            for etapa in self.ETAPAS:
+                dados[etapa] += tempos.get(etapa, 0.0)
+
+    def limpar(self):
+        with self._lock:
+            self._dados.clear()
+
+    def como_prometheus(self):
+        with self._lock:
+            dados = {url: dict(valores) for url, valores in self._dados.items()}
+
+        linhas = [
+            '# HELP financeiro_requisicoes_total Requisições medidas por url_name.',
+            '# TYPE financeiro_requisicoes_total counter',
+        ]
+        linhas += [f'financeiro_requisicoes_total{{url="{url}"}} {d["requisicoes"]}' for url, d in dados.items()]
+        linhas += [
+            '# HELP financeiro_erros_total Respostas 5xx por url_name.',
+            '# TYPE financeiro_erros_total counter',
+        ]
+        linhas += [f'financeiro_erros_total{{url="{url}"}} {d["erros"]}' for url, d in dados.items()]
+        linhas += [
+            '# HELP financeiro_queries_total Queries SQL executadas por url_name.',
+            '# TYPE financeiro_queries_total counter',
+        ]
+        linhas += [f'financeiro_queries_total{{url="{url}"}} {d["queries"]}' for url, d in dados.items()]
+        linhas += [
+            '# HELP financeiro_tempo_segundos Tempo gasto por etapa (total, db, template, form).',
+            '# TYPE financeiro_tempo_segundos summary',
+        ]
+        for url, d in dados.items():
+            for etapa in self.ETAPAS:
+                rotulos = f'url="{url}",etapa="{etapa}"'
+                linhas.append(f'financeiro_tempo_segundos_sum{{{rotulos}}} {d[etapa]:.6f}')
+                linhas.append(f'financeiro_tempo_segundos_count{{{rotulos}}} {d["requisicoes"]}')
+        return "\n".join(linhas) + "\n"
+
+
+# Registro do processo (cada worker tem o seu)
+metricas = RegistroMetricas()
+
+
+def _instalar_wrappers(medicao):
+    pilha = ExitStack()
+    for conexao in connections.all():
+        pilha.enter_context(conexao.execute_wrapper(medicao))
+    return pilha
+
+
+class InstrumentacaoMiddleware:
+    # Funciona em WSGI e em ASGI sem forçar a troca de thread nas views async
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.amostragem = getattr(settings, 'INSTRUMENTACAO_AMOSTRAGEM', 1.0)
+        self.server_timing = getattr(settings, 'INSTRUMENTACAO_SERVER_TIMING', True)
+        self.modo_async = iscoroutinefunction(get_response)
+        if self.modo_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.modo_async:
+            return self.__acall__(request)
+        # Fora da amostra: nenhum custo além do sorteio
+        if not self.amostrar():
+            return self.get_response(request)
+
+        medicao = self.iniciar(request)
+        inicio = time.perf_counter()
+        with _instalar_wrappers(medicao):
+            response = self.get_response(request)
+        return self.finalizar(request, response, medicao, inicio)
+
+    async def __acall__(self, request):
+        if not self.amostrar():
+            return await self.get_response(request)
+
+        medicao = self.iniciar(request)
+        inicio = time.perf_counter()
+        # O ORM assíncrono executa as queries na thread "sync" da requisição;
+        # os wrappers precisam ser instalados nas conexões daquela thread
+        pilha = await sync_to_async(_instalar_wrappers)(medicao)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(pilha.close)()
+        return self.finalizar(request, response, medicao, inicio)
+
+    def amostrar(self):
+        return self.amostragem >= 1.0 or random.random() < self.amostragem
+
+    @staticmethod
+    def iniciar(request):
+        medicao = _Medicao()
+        setattr(request, ATRIBUTO_REQUEST, medicao)
+        return medicao
+
+    def finalizar(self, request, response, medicao, inicio):
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._medir_corpo(response.streaming_content, request, response, medicao, inicio)
+            return response
+        self.registrar(request, response, medicao, inicio)
+        if self.server_timing:
+            response['Server-Timing'] = self.server_timing_header(medicao)
+        return response
+
+    def _medir_corpo(self, conteudo, request, response, medicao, inicio):
+        # Roda na thread que consome o corpo (a da requisição no WSGI; a
+        # thread "sync" no ASGI), cujas conexões são as que fazem as queries
+        try:
+            with _instalar_wrappers(medicao):
+                yield from conteudo
+        finally:
+            self.registrar(request, response, medicao, inicio)
+
+    @staticmethod
+    def registrar(request, response, medicao, inicio):
+        medicao.tempos['total'] = time.perf_counter() - inicio
+        url_name = getattr(request.resolver_match, 'url_name', None) or 'desconhecida'
+        metricas.registrar(url_name, response.status_code, medicao.queries, medicao.tempos)
+
+    def process_template_response(self, request, response):
+        # Chamado logo antes do render(); o callback marca o fim
+        medicao = getattr(request, ATRIBUTO_REQUEST, None)
+        if medicao is not None:
+            inicio = time.perf_counter()
+
+            def fim_render(resp):
+                registrar_tempo(request, 'template', time.perf_counter() - inicio)
+
+            response.add_post_render_callback(fim_render)
+        return response
+
+    @staticmethod
+    def server_timing_header(medicao):
+        partes = [f'db;dur={medicao.tempos["db"] * 1000:.2f};desc="{medicao.queries} queries"']
+        for etapa in ('template', 'form'):
+            if etapa in medicao.tempos:
+                partes.append(f'{etapa};dur={medicao.tempos[etapa] * 1000:.2f}')
+        partes.append(f'total;dur={medicao.tempos["total"] * 1000:.2f}')
+        return ", ".join(partes)
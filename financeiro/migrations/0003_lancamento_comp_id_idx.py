@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:26
+
+import financeiro.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financeiro', '0002_alter_lancamento_competencia'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lancamento',
+            name='competencia',
+            field=financeiro.models.CompetenciaField(verbose_name='Competência'),
+        ),
+        migrations.AddIndex(
+            model_name='lancamento',
+            index=models.Index(fields=['competencia', 'id'], name='lancamento_comp_id_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:26
+
+import financeiro.models
+from django.db import migrations, models
+
+
+def popular_resumo(apps, schema_editor):
+    Lancamento = apps.get_model('financeiro', 'Lancamento')
+    ResumoCompetencia = apps.get_model('financeiro', 'ResumoCompetencia')
+    agregados = (
+        Lancamento.objects.order_by()
+        .values('competencia')
+        .annotate(soma=models.Sum('valor'), qtd=models.Count('id'))
+    )
+    ResumoCompetencia.objects.bulk_create(
+        ResumoCompetencia(competencia=linha['competencia'], total=linha['soma'], quantidade=linha['qtd'])
+        for linha in agregados
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financeiro', '0003_lancamento_comp_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoCompetencia',
+            fields=[
+                ('competencia', financeiro.models.CompetenciaField(primary_key=True, serialize=False, verbose_name='Competência')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total (R$)')),
+                ('quantidade', models.PositiveIntegerField(default=0, verbose_name='Quantidade')),
+            ],
+            options={
+                'ordering': ['competencia'],
+            },
+        ),
+        migrations.RunPython(popular_resumo, migrations.RunPython.noop),
+    ]
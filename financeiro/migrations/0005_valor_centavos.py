@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:02
+
+import financeiro.models
+from django.db import migrations, models
+from django.db.models.functions import Cast, Round
+
+# (model, campo decimal, coluna temporária em centavos)
+COLUNAS = [
+    ('Lancamento', 'valor', 'valor_centavos'),
+    ('ResumoCompetencia', 'total', 'total_centavos'),
+]
+
+
+def para_centavos(apps, schema_editor):
+    for model, decimal, centavos in COLUNAS:
+        Model = apps.get_model('financeiro', model)
+        # Um UPDATE por tabela, sem trazer as linhas para o Python
+        Model.objects.update(**{
+            centavos: Cast(Round(models.F(decimal) * 100), models.BigIntegerField()),
+        })
+
+
+def para_decimal(apps, schema_editor):
+    for model, decimal, centavos in COLUNAS:
+        Model = apps.get_model('financeiro', model)
+        # Divisão por 100.0: no SQLite, inteiro / 100 truncaria os centavos
+        Model.objects.update(**{
+            decimal: models.ExpressionWrapper(
+                models.F(centavos) / models.Value(100.0),
+                output_field=models.DecimalField(max_digits=16, decimal_places=2),
+            ),
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financeiro', '0004_resumocompetencia'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lancamento',
+            name='valor_centavos',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='resumocompetencia',
+            name='total_centavos',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(para_centavos, para_decimal),
+        # Só para o caminho de volta: a coluna decimal é recriada com default
+        # antes de receber os valores de para_decimal
+        migrations.AlterField(
+            model_name='lancamento',
+            name='valor',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Valor (R$)'),
+        ),
+        migrations.RemoveField(
+            model_name='lancamento',
+            name='valor',
+        ),
+        migrations.RemoveField(
+            model_name='resumocompetencia',
+            name='total',
+        ),
+        migrations.RenameField(
+            model_name='lancamento',
+            old_name='valor_centavos',
+            new_name='valor',
+        ),
+        migrations.RenameField(
+            model_name='resumocompetencia',
+            old_name='total_centavos',
+            new_name='total',
+        ),
+        migrations.AlterField(
+            model_name='lancamento',
+            name='valor',
+            field=financeiro.models.CentavosField(verbose_name='Valor (R$)'),
+        ),
+        migrations.AlterField(
+            model_name='resumocompetencia',
+            name='total',
+            field=financeiro.models.CentavosField(default=0, verbose_name='Total (R$)'),
+        ),
+    ]
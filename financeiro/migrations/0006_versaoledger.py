@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def criar_versao(apps, schema_editor):
+    VersaoLedger = apps.get_model('financeiro', 'VersaoLedger')
+    VersaoLedger.objects.create(pk=1, versao=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financeiro', '0005_valor_centavos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersaoLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('versao', models.PositiveBigIntegerField(default=0, verbose_name='Versão')),
+                ('alterado_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Alterado em')),
+            ],
+        ),
+        migrations.RunPython(criar_versao, migrations.RunPython.noop),
+    ]
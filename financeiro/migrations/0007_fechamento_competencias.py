@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:07
+
+import django.utils.timezone
+import financeiro.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financeiro', '0006_versaoledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompetenciaFechada',
+            fields=[
+                ('competencia', financeiro.models.CompetenciaField(primary_key=True, serialize=False, verbose_name='Competência')),
+                ('fechada_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fechada em')),
+                ('quantidade', models.PositiveIntegerField(default=0, verbose_name='Lançamentos arquivados')),
+                ('total', financeiro.models.CentavosField(default=0, verbose_name='Total (R$)')),
+            ],
+            options={
+                'ordering': ['competencia'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LancamentoArquivado',
+            fields=[
+                ('descricao', models.CharField(max_length=100, verbose_name='Descrição')),
+                ('valor', financeiro.models.CentavosField(verbose_name='Valor (R$)')),
+                ('competencia', financeiro.models.CompetenciaField(verbose_name='Competência')),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['competencia', 'id'], name='arquivado_comp_id_idx')],
+            },
+        ),
+    ]
@@ -1,35 +1,127 @@
+import datetime
+from decimal import Decimal, InvalidOperation
 from functools import total_ordering
-from django.db import models
-from . import fields
+from django.core import exceptions
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+# Sem `fields` aqui: o form field (widget, templates, cache) é importado só
+# no formfield(), para que django.setup() em comandos e workers não o carregue
+from . import calendarios, lookups
 
 @total_ordering
 class Competencia:
-    # Otimização de memória: armazena apenas o inteiro combinado (sem __dict__)
-    __slots__ = ('_valor',)
-    
-    # Configuração direta para o projeto (13 meses)
-    LIMITE_MES = 13
+    # Otimização de memória: AAAAMM, o índice linear do período e o texto
+    # formatado (preenchido no primeiro str()); sem __dict__
+    __slots__ = ('_valor', '_ordinal', '_texto')
+
+    # Calendário de períodos (ver calendarios.py): 12 meses + 13º
+    calendario = calendarios.PADRAO
+    LIMITE_MES = calendario.periodos
+
+    # Máximo de competências distintas mantidas no cache do from_int
+    LIMITE_CACHE = 4096
+
+    # Flyweights por AAAAMM e por ordinal (cada subclasse tem os seus)
+    _por_valor = {}
+    _por_ordinal = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.LIMITE_MES = cls.calendario.periodos
+        cls._por_valor = {}
+        cls._por_ordinal = {}
 
     def __init__(self, ano: int, mes: int):
         """
         Construtor padrão: recebe ano e mês separados.
         """
+        ano, mes = int(ano), int(mes)
         # Validação
         if not (1 <= mes <= self.LIMITE_MES):
             raise ValueError(f"Mês {mes} inválido. Limite é {self.LIMITE_MES}.")
-            
-        # Armazenamento interno otimizado
-        self._valor = (int(ano) * 100) + int(mes)
+
+        # Armazenamento interno otimizado (direto nos slots, por ser imutável).
+        # O ordinal (períodos desde o ano 0) transforma soma e distância em
+        # aritmética de inteiros, sem divmod.
+        _definir_valor(self, ano * 100 + mes)
+        _definir_ordinal(self, ano * self.LIMITE_MES + mes - 1)
 
     @classmethod
     def from_int(cls, yyyymm: int):
-        """Factory Method: Cria a partir de inteiro (ex: 202513)."""
+        """
+        Factory Method: Cria a partir de inteiro (ex: 202513).
+
+        As instâncias são compartilhadas (flyweight): um ledger tem poucas
+        centenas de períodos, então um queryset de 1M linhas reaproveita os
+        mesmos objetos e valida cada AAAAMM uma única vez.
+        """
         if yyyymm is None:
             return None
+        try:
+            return cls._por_valor[yyyymm]
+        except KeyError:
+            pass
         yyyymm = int(yyyymm)
-        ano = yyyymm // 100
-        mes = yyyymm % 100
-        return cls(ano, mes)
+        instancia = cls._por_valor.get(yyyymm)
+        if instancia is None:
+            # Mês inválido levanta ValueError aqui e não entra no cache
+            instancia = cls(yyyymm // 100, yyyymm % 100)
+            if len(cls._por_valor) < cls.LIMITE_CACHE:
+                instancia = cls._por_valor.setdefault(yyyymm, instancia)
+                cls._por_ordinal.setdefault(instancia._ordinal, instancia)
+        return instancia
+
+    @classmethod
+    def from_ordinal(cls, ordinal: int):
+        """Factory Method: inverso de .ordinal (também compartilha instâncias)."""
+        instancia = cls._por_ordinal.get(ordinal)
+        if instancia is None:
+            ano, indice = divmod(ordinal, cls.LIMITE_MES)
+            instancia = cls.from_int(ano * 100 + indice + 1)
+        return instancia
+
+    @classmethod
+    def hoje(cls, data=None):
+        """Competência de uma data (padrão: hoje) no calendário da classe."""
+        data = data or datetime.date.today()
+        return cls.from_int(data.year * 100 + cls.calendario.periodo_do_mes[data.month])
+
+    @classmethod
+    def para_calendario(cls, calendario):
+        """
+        Classe de Competencia presa a outro calendário (objeto ou nome
+        registrado). Uma classe por calendário, criada na primeira chamada.
+        """
+        calendario = calendarios.obter(calendario)
+        if calendario is Competencia.calendario:
+            return Competencia
+        classe = _classes_por_calendario.get(calendario.nome)
+        if classe is None:
+            classe = type(f"Competencia_{calendario.nome}", (Competencia,), {
+                '__slots__': (), '__module__': __name__, 'calendario': calendario,
+            })
+            classe = _classes_por_calendario.setdefault(calendario.nome, classe)
+        return classe
+
+    @classmethod
+    def cache_info(cls):
+        """Ocupação do cache de instâncias."""
+        return {'instancias': len(cls._por_valor), 'limite': cls.LIMITE_CACHE}
+
+    @classmethod
+    def parse(cls, valor):
+        """
+        Factory Method: aceita Competencia, int/str AAAAMM (202513)
+        ou texto "MM/AAAA" (13/2025). Levanta ValueError se inválido.
+        """
+        if valor is None or isinstance(valor, Competencia):
+            return valor
+        if isinstance(valor, str):
+            valor = valor.strip()
+            if '/' in valor:
+                mes, ano = valor.split('/', 1)
+                return cls(int(ano), int(mes))
+        return cls.from_int(valor)
 
     # --- Properties (Leitura) ---
 
@@ -38,6 +130,11 @@ class Competencia:
         """Retorna o valor primitivo para o banco (YYYYMM)."""
         return self._valor
 
+    @property
+    def ordinal(self):
+        """Índice linear do período: ano * períodos do calendário + (mês - 1)."""
+        return self._ordinal
+
     @property
     def ano(self):
         return self._valor // 100
@@ -48,15 +145,9 @@ class Competencia:
 
     @property
     def descricao_mes(self):
-        """Retorna o nome do mês."""
-        nomes = {
-            1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril',
-            5: 'Maio', 6: 'Junho', 7: 'Julho', 8: 'Agosto',
-            9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro',
-            13: '13º Salário'
-        }
-        return nomes.get(self.mes, "Inválido")
-    
+        """Retorna o nome do mês (tabela do calendário)."""
+        return self.calendario.nomes[self._valor % 100]
+
     # --- Navegação Temporal ---
 
     @property
@@ -67,14 +158,36 @@ class Competencia:
     def anterior(self):
         return self - 1
 
+    # --- Imutabilidade ---
+    # Instâncias são compartilhadas pelo cache do from_int; alterar uma
+    # alteraria todos os lançamentos daquele período.
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("Competencia é imutável.")
+
+    def __delattr__(self, nome):
+        raise AttributeError("Competencia é imutável.")
+
+    def __reduce__(self):
+        # pickle/copy passam pelo factory (e pelo cache) em vez de setattr;
+        # as classes por calendário são recriadas pelo nome do calendário
+        if type(self) is Competencia.para_calendario(self.calendario):
+            return (_competencia_do_calendario, (self.calendario.nome, self._valor))
+        return (type(self).from_int, (self._valor,))
+
     # --- Representação ---
 
     def __repr__(self):
         return f"Competencia({self.ano}, {self.mes})"
 
     def __str__(self):
-        # Formato padrão solicitado: MM/AAAA
-        return f"{self.mes:02d}/{self.ano}"
+        # Formato padrão solicitado: MM/AAAA (montado uma vez por instância)
+        try:
+            return self._texto
+        except AttributeError:
+            texto = f"{self.calendario.rotulos[self._valor % 100]}/{self._valor // 100}"
+            _definir_texto(self, texto)
+            return texto
 
     # --- Comparação (Otimizada) ---
 
@@ -95,46 +208,61 @@ class Competencia:
     def __hash__(self):
         return hash(self._valor)
 
-    # --- Aritmética (Lógica de 13 Meses) ---
+    # --- Aritmética (pelo ordinal, no calendário da classe) ---
 
     def __add__(self, meses_para_adicionar):
         if not isinstance(meses_para_adicionar, int):
             return NotImplemented
-        
-        # Lineariza o tempo (índice 0)
-        total_meses = (self.ano * self.LIMITE_MES) + (self.mes - 1) + meses_para_adicionar
-        
-        # Calcula novo ano e mês
-        novo_ano, novo_mes_idx = divmod(total_meses, self.LIMITE_MES)
-        
-        # Retorna nova instância (novo_mes_idx + 1 restaura para índice 1-13)
-        return Competencia(novo_ano, novo_mes_idx + 1)
+        return type(self).from_ordinal(self._ordinal + meses_para_adicionar)
 
     def __sub__(self, other):
         if isinstance(other, int):
-            return self.__add__(-other)
+            return type(self).from_ordinal(self._ordinal - other)
         elif isinstance(other, Competencia):
-            total_self = (self.ano * self.LIMITE_MES) + (self.mes - 1)
-            total_other = (other.ano * self.LIMITE_MES) + (other.mes - 1)
-            return total_self - total_other
+            if other.calendario is not self.calendario:
+                raise ValueError("Competências de calendários diferentes não se subtraem.")
+            return self._ordinal - other._ordinal
         return NotImplemented
 
 
+_definir_valor = Competencia._valor.__set__
+_definir_ordinal = Competencia._ordinal.__set__
+_definir_texto = Competencia._texto.__set__
+_classes_por_calendario = {}
+
+
+def _competencia_do_calendario(nome_calendario, yyyymm):
+    return Competencia.para_calendario(nome_calendario).from_int(yyyymm)
+
+
 # --- O MODEL FIELD ---
 class CompetenciaField(models.IntegerField):
     description = "Armazena AAAAMM mas retorna um objeto Competencia"
 
+    def __init__(self, *args, calendario=None, **kwargs):
+        self.calendario = calendarios.obter(calendario) if calendario is not None else Competencia.calendario
+        # Classe de Competencia do calendário do campo
+        self.competencia = Competencia.para_calendario(self.calendario)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.calendario is not Competencia.calendario:
+            kwargs['calendario'] = self.calendario.nome
+        return name, path, args, kwargs
+
     def formfield(self, **kwargs):
-        return fields.CompetenciaField(**kwargs)
+        from . import fields
+        return fields.CompetenciaField(**{'calendario': self.calendario, **kwargs})
 
     def from_db_value(self, value, expression, connection):
         if value is None: return None
-        return Competencia.from_int(value)
+        return self.competencia.from_int(value)
 
     def to_python(self, value):
         if isinstance(value, Competencia): return value
         if value is None: return None
-        if isinstance(value, int): return Competencia.from_int(value)
+        if isinstance(value, int): return self.competencia.from_int(value)
         return value
     
     def get_prep_value(self, value):
@@ -143,11 +271,471 @@ class CompetenciaField(models.IntegerField):
         return int(value)
 
 
+# Lookups que viram intervalos na coluna AAAAMM (ver lookups.py)
+CompetenciaField.register_lookup(lookups.AnoCompetencia)
+CompetenciaField.register_lookup(lookups.Entre)
+CompetenciaField.register_lookup(lookups.Ultimos)
+
+
+# --- DINHEIRO ---
+@total_ordering
+class Dinheiro:
+    """
+    Valor monetário guardado como centavos inteiros (imutável).
+
+    Assim como Competencia guarda AAAAMM num int, Dinheiro guarda só os
+    centavos: somas e comparações são aritmética de inteiros, sem o custo
+    de decimal.Decimal. O construtor recebe reais (Decimal, int ou str);
+    use from_centavos() para o valor cru do banco.
+    """
+    __slots__ = ('_centavos',)
+
+    CASAS = Decimal('0.01')
+    # Dígitos aceitos na entrada (form, importação, API), como o antigo DecimalField(10, 2)
+    MAX_DIGITOS = 10
+
+    def __init__(self, reais=0):
+        try:
+            reais = reais if isinstance(reais, Decimal) else Decimal(str(reais))
+            centavos = int(reais.quantize(self.CASAS).scaleb(2))
+        except (InvalidOperation, ValueError):
+            raise ValueError(f"Valor monetário inválido: {reais!r}.")
+        object.__setattr__(self, '_centavos', centavos)
+
+    @classmethod
+    def from_centavos(cls, centavos):
+        """Factory Method: cria a partir de centavos (o valor gravado no banco)."""
+        if centavos is None:
+            return None
+        if cls is not Dinheiro:
+            obj = cls.__new__(cls)
+            object.__setattr__(obj, '_centavos', int(centavos))
+            return obj
+        return _dinheiro(int(centavos))
+
+    @classmethod
+    def parse(cls, valor, estrito=False):
+        """
+        Aceita Dinheiro, Decimal, int (reais) ou texto "1234.56" / "1.234,56" / "R$ 1.234,56".
+        Com estrito=True, mais de 2 casas decimais é ValueError em vez de arredondar.
+        """
+        if valor is None or isinstance(valor, Dinheiro):
+            return valor
+        if isinstance(valor, str):
+            valor = valor.replace('R$', '').strip()
+            if ',' in valor:
+                valor = valor.replace('.', '').replace(',', '.')
+        if estrito:
+            try:
+                decimal = valor if isinstance(valor, Decimal) else Decimal(str(valor))
+                exato = decimal.is_finite() and decimal == decimal.quantize(cls.CASAS)
+            except InvalidOperation:
+                exato = False
+            if not exato:
+                raise ValueError(f"Valor monetário inválido: {valor!r}.")
+        return cls(valor)
+
+    @staticmethod
+    def somar(valores):
+        """sum() em centavos inteiros, sem criar um Dinheiro por parcela."""
+        return _dinheiro(sum([valor._centavos for valor in valores]))
+
+    # --- Properties (Leitura) ---
+
+    @property
+    def centavos(self):
+        """Retorna o valor primitivo para o banco (centavos)."""
+        return self._centavos
+
+    @property
+    def decimal(self):
+        return Decimal(self._centavos).scaleb(-2)
+
+    # --- Imutabilidade ---
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("Dinheiro é imutável.")
+
+    def __delattr__(self, nome):
+        raise AttributeError("Dinheiro é imutável.")
+
+    def __reduce__(self):
+        return (type(self).from_centavos, (self._centavos,))
+
+    # --- Representação ---
+
+    def __repr__(self):
+        return f"Dinheiro('{self.decimal}')"
+
+    def __str__(self):
+        # Formato brasileiro: R$ 1.234,56 (negativos: -R$ 1.234,56)
+        reais, centavos = divmod(abs(self._centavos), 100)
+        sinal = '-' if self._centavos < 0 else ''
+        return f"{sinal}R$ {reais:,}".replace(',', '.') + f",{centavos:02d}"
+
+    # --- Comparação ---
+
+    def _centavos_de(self, other):
+        """Centavos de outro operando (Dinheiro, int ou Decimal em reais); None se não suportado."""
+        if isinstance(other, Dinheiro):
+            return other._centavos
+        if isinstance(other, int) and not isinstance(other, bool):
+            return other * 100
+        if isinstance(other, Decimal):
+            centavos = other.scaleb(2)
+            return int(centavos) if centavos == centavos.to_integral_value() else None
+        return None
+
+    def __eq__(self, other):
+        if isinstance(other, Decimal):
+            return self.decimal == other
+        return self._centavos == self._centavos_de(other)
+
+    def __lt__(self, other):
+        if isinstance(other, Decimal):
+            return self.decimal < other
+        centavos = self._centavos_de(other)
+        if centavos is None:
+            return NotImplemented
+        return self._centavos < centavos
+
+    def __hash__(self):
+        # Igual ao hash do Decimal/int equivalente, já que __eq__ os considera iguais
+        if self._centavos % 100 == 0:
+            return hash(self._centavos // 100)
+        return hash(self.decimal)
+
+    def __bool__(self):
+        return self._centavos != 0
+
+    # --- Aritmética (exata, em centavos) ---
+
+    def __add__(self, other):
+        # Caminho rápido para sum() de uma coluna
+        if type(other) is Dinheiro:
+            return _dinheiro(self._centavos + other._centavos)
+        centavos = self._centavos_de(other)
+        if centavos is None:
+            if isinstance(other, Decimal):
+                return self + Dinheiro(other)
+            return NotImplemented
+        return _dinheiro(self._centavos + centavos)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __neg__(self):
+        return _dinheiro(-self._centavos)
+
+    def __abs__(self):
+        return _dinheiro(abs(self._centavos))
+
+    def __mul__(self, fator):
+        if not isinstance(fator, int) or isinstance(fator, bool):
+            return NotImplemented
+        return _dinheiro(self._centavos * fator)
+
+    __rmul__ = __mul__
+
+
+_novo_objeto = object.__new__
+_definir_centavos = Dinheiro._centavos.__set__
+
+
+def _dinheiro(centavos):
+    # Construção sem passar pelo __setattr__ bloqueado nem pelo Decimal:
+    # é o que roda uma vez por linha no from_db_value
+    obj = _novo_objeto(Dinheiro)
+    _definir_centavos(obj, centavos)
+    return obj
+
+
+class CentavosField(models.BigIntegerField):
+    description = "Armazena centavos (inteiro) mas retorna um objeto Dinheiro"
+
+    def formfield(self, **kwargs):
+        from . import fields
+        # Pula o IntegerField.formfield: os limites de min/max dele são em centavos
+        return models.Field.formfield(self, **{'form_class': fields.DinheiroField, **kwargs})
+
+    def from_db_value(self, value, expression, connection):
+        if value is None: return None
+        # _dinheiro() em linha: roda uma vez por linha lida
+        obj = _novo_objeto(Dinheiro)
+        _definir_centavos(obj, value)
+        return obj
+
+    def to_python(self, value):
+        if value is None or isinstance(value, Dinheiro): return value
+        try:
+            return Dinheiro.parse(value)
+        except ValueError:
+            raise exceptions.ValidationError(
+                self.error_messages['invalid'], code='invalid', params={'value': value},
+            )
+
+    def get_prep_value(self, value):
+        if value is None: return None
+        return Dinheiro.parse(value).centavos
+
+
 # --- SEU MODELO ---
-class Lancamento(models.Model):
+class LancamentoBase(models.Model):
+    """Campos comuns ao ledger (Lancamento) e ao arquivo (LancamentoArquivado)."""
     descricao = models.CharField("Descrição", max_length=100)
-    valor = models.DecimalField("Valor (R$)", max_digits=10, decimal_places=2)
+    valor = CentavosField("Valor (R$)")
     competencia = CompetenciaField("Competência")
 
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.descricao} - {self.competencia}"
+
+
+class LancamentoQuerySet(models.QuerySet):
+    """Gravações em lote também recusam competências fechadas."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        CompetenciaFechada.verificar(*(obj.competencia for obj in objs))
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if 'competencia' in fields:
+            CompetenciaFechada.verificar(*(obj.competencia for obj in objs))
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+
+class Lancamento(LancamentoBase):
+    objects = LancamentoQuerySet.as_manager()
+
+    def clean(self):
+        # Períodos fechados são imutáveis (ver fechamento.py): vale para o
+        # LancamentoForm, o admin e qualquer full_clean()
+        super().clean()
+        try:
+            CompetenciaFechada.verificar(self.competencia)
+        except exceptions.ValidationError as exc:
+            raise exceptions.ValidationError({'competencia': exc})
+        self._competencia_verificada = self.competencia
+
+    def save(self, *args, **kwargs):
+        # O post_save (resumo e versão, ver signals.py) roda depois do
+        # atomic do próprio Model.save(): sem este bloco, uma falha nele
+        # deixaria a linha gravada e o delta do resumo perdido.
+        with transaction.atomic():
+            # Sem repetir a query se o clean() já conferiu esta competência
+            if getattr(self, '_competencia_verificada', None) != self.competencia:
+                CompetenciaFechada.verificar(self.competencia)
+            super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            # Suporta a paginação keyset da lista (ORDER BY competencia, id)
+            models.Index(fields=['competencia', 'id'], name='lancamento_comp_id_idx'),
+        ]
+
+
+# --- FECHAMENTO DE PERÍODOS (ver fechamento.py) ---
+class LancamentoArquivado(LancamentoBase):
+    """
+    Lançamentos de competências fechadas, fora da tabela quente, com o
+    mesmo id que tinham em Lancamento. Só o fechamento e a reabertura
+    escrevem aqui.
+    """
+    id = models.BigIntegerField(primary_key=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['competencia', 'id'], name='arquivado_comp_id_idx'),
+        ]
+
+
+class CompetenciaFechada(models.Model):
+    """Competência fechada: imutável, com os lançamentos em LancamentoArquivado."""
+    competencia = CompetenciaField("Competência", primary_key=True)
+    fechada_em = models.DateTimeField("Fechada em", default=timezone.now)
+    quantidade = models.PositiveIntegerField("Lançamentos arquivados", default=0)
+    total = CentavosField("Total (R$)", default=0)
+
+    class Meta:
+        ordering = ['competencia']
+
     def __str__(self):
-        return f"{self.descricao} - {self.competencia}"
\ No newline at end of file
+        return f"{self.competencia} (fechada em {self.fechada_em:%d/%m/%Y})"
+
+    @classmethod
+    def esta_fechada(cls, competencia):
+        return cls.objects.filter(competencia=competencia).exists()
+
+    @staticmethod
+    def mensagem(competencia):
+        return f"A competência {competencia} está fechada."
+
+    @classmethod
+    def verificar(cls, *competencias):
+        """
+        ValidationError (code='fechada') se alguma das competências estiver
+        fechada. Uma query para todas; nenhuma se não houver competência.
+        """
+        distintas = {Competencia.parse(c) for c in competencias if c is not None}
+        if not distintas:
+            return
+        fechada = cls.objects.filter(competencia__in=distintas).values_list('competencia', flat=True).first()
+        if fechada is not None:
+            raise exceptions.ValidationError(cls.mensagem(fechada), code='fechada')
+
+# --- ROLLUP POR COMPETÊNCIA ---
+class ResumoCompetencia(models.Model):
+    """
+    Tabela materializada com SUM(valor)/COUNT por competência (em centavos).
+
+    Mantida pelos signals de Lancamento (ver signals.py), para que os
+    totais saiam em O(número de períodos) em vez de varrer o ledger.
+    """
+    competencia = CompetenciaField("Competência", primary_key=True)
+    total = CentavosField("Total (R$)", default=0)
+    quantidade = models.PositiveIntegerField("Quantidade", default=0)
+
+    class Meta:
+        ordering = ['competencia']
+
+    def __str__(self):
+        return f"{self.competencia}: {self.quantidade} lançamento(s), {self.total}"
+
+    @classmethod
+    def aplicar_delta(cls, competencia, valor, quantidade):
+        """
+        Soma (ou subtrai) valor/quantidade no resumo de uma competência.
+
+        Deltas positivos são um upsert de um comando só (INSERT ... ON
+        CONFLICT DO UPDATE, no SQLite e no PostgreSQL): duas primeiras
+        gravações concorrentes numa competência nova não colidem no
+        INSERT. Deltas negativos são um UPDATE da linha existente; se ela
+        não existe ou ficaria com quantidade negativa (resumo fora de
+        sincronia, ex.: bulk_create sem reconstruir()), a competência é
+        recalculada a partir do ledger.
+        """
+        valor = Dinheiro.parse(valor)
+        competencia = Competencia.parse(competencia)
+        with transaction.atomic():
+            if quantidade >= 0:
+                cls._upsert(competencia, valor.centavos, quantidade)
+            elif not cls.objects.filter(competencia=competencia, quantidade__gte=-quantidade).update(
+                total=models.F('total') + valor.centavos,
+                quantidade=models.F('quantidade') + quantidade,
+            ):
+                cls.reconstruir_competencia(competencia)
+                return
+            # Períodos que ficaram vazios saem da tabela
+            cls.objects.filter(competencia=competencia, quantidade=0).delete()
+
+    @classmethod
+    def _upsert(cls, competencia, centavos, quantidade):
+        conexao = connections[router.db_for_write(cls)]
+        q = conexao.ops.quote_name
+        tabela = q(cls._meta.db_table)
+        comp, total, qtd = (q(cls._meta.get_field(campo).column) for campo in ('competencia', 'total', 'quantidade'))
+        with conexao.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {tabela} ({comp}, {total}, {qtd}) VALUES (%s, %s, %s) "
+                f"ON CONFLICT ({comp}) DO UPDATE SET "
+                f"{total} = {tabela}.{total} + excluded.{total}, "
+                f"{qtd} = {tabela}.{qtd} + excluded.{qtd}",
+                [competencia.as_int, centavos, quantidade],
+            )
+
+    @classmethod
+    def reconstruir_competencia(cls, competencia):
+        """Recalcula o resumo de uma competência a partir do ledger (tabela quente e arquivo)."""
+        competencia = Competencia.parse(competencia)
+        with transaction.atomic():
+            total, quantidade = Dinheiro(0), 0
+            for modelo in (Lancamento, LancamentoArquivado):
+                agregado = modelo.objects.filter(competencia=competencia).aggregate(
+                    soma=models.Sum('valor'), qtd=models.Count('id'),
+                )
+                total += agregado['soma'] or 0
+                quantidade += agregado['qtd']
+            if quantidade:
+                cls.objects.update_or_create(
+                    competencia=competencia, defaults={'total': total, 'quantidade': quantidade},
+                )
+            else:
+                cls.objects.filter(competencia=competencia).delete()
+
+    @classmethod
+    def reconstruir(cls):
+        """
+        Recalcula a tabela inteira a partir de Lancamento e do arquivo das
+        competências fechadas. Necessário após operações que não disparam
+        signals (bulk_create, QuerySet.update).
+        """
+        with transaction.atomic():
+            cls.objects.all().delete()
+            # Uma competência fechada pode ter linhas nas duas tabelas (um
+            # lançamento gravado durante o fechamento fica na quente)
+            somas = {}
+            for modelo in (Lancamento, LancamentoArquivado):
+                agregados = (
+                    modelo.objects.order_by()
+                    .values_list('competencia')
+                    .annotate(soma=models.Sum('valor'), qtd=models.Count('id'))
+                )
+                for competencia, soma, qtd in agregados:
+                    total, quantidade = somas.get(competencia, (0, 0))
+                    somas[competencia] = (soma + total, qtd + quantidade)
+            cls.objects.bulk_create(
+                cls(competencia=competencia, total=total, quantidade=quantidade)
+                for competencia, (total, quantidade) in somas.items()
+            )
+            VersaoLedger.incrementar()
+
+
+# --- VERSÃO DO LEDGER ---
+class VersaoLedger(models.Model):
+    """
+    Carimbo de versão do ledger: uma única linha, incrementada a cada
+    escrita em Lancamento (signals e operações em lote de lotes.py).
+
+    Ler a versão é um SELECT por pk; as telas que só dependem do ledger
+    usam (versao, alterado_em) como ETag e como chave de cache.
+    """
+    PK = 1
+
+    versao = models.PositiveBigIntegerField("Versão", default=0)
+    alterado_em = models.DateTimeField("Alterado em", default=timezone.now)
+
+    def __str__(self):
+        return f"v{self.versao} ({self.alterado_em:%d/%m/%Y %H:%M:%S})"
+
+    @property
+    def etag(self):
+        return f"{self.versao}.{int(self.alterado_em.timestamp() * 1_000_000)}"
+
+    @classmethod
+    def incrementar(cls):
+        linha = cls.objects.filter(pk=cls.PK)
+        if not linha.update(versao=models.F('versao') + 1, alterado_em=timezone.now()):
+            # A migration cria a linha; isto só cobre um banco sem ela
+            cls.objects.get_or_create(pk=cls.PK)
+            linha.update(versao=models.F('versao') + 1, alterado_em=timezone.now())
+
+    @classmethod
+    def atual(cls):
+        """A versão corrente (versão 0 se o ledger nunca foi alterado)."""
+        return cls.objects.filter(pk=cls.PK).first() or cls(pk=cls.PK, alterado_em=_INICIO_DOS_TEMPOS)
+
+    @classmethod
+    async def aatual(cls):
+        return await cls.objects.filter(pk=cls.PK).afirst() or cls(pk=cls.PK, alterado_em=_INICIO_DOS_TEMPOS)
+
+
+_INICIO_DOS_TEMPOS = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
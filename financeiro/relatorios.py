@@ -0,0 +1,132 @@
+# financeiro/relatorios.py
+"""
+Relatório de saldos por competência: total do período, saldo acumulado,
+variação contra o período anterior e acumulado no ano (13 períodos).
+
+Uma única query por relatório, sobre a tabela quente e o arquivo das
+competências fechadas. Onde o banco tem funções de janela
+(OVER), o acumulado e o LAG são calculados no próprio SQL, em cima do
+GROUP BY por competência; sem suporte (SQLite < 3.25), os totais
+agrupados são lidos em ordem e acumulados numa só passada.
+"""
+from django.db import connections
+from django.db.models import Count, Sum
+
+from .models import Competencia, Dinheiro, Lancamento, LancamentoArquivado
+
+
+def _agrupado(queryset):
+    return (
+        queryset.order_by()
+        .values('competencia')
+        .annotate(total=Sum('valor'), quantidade=Count('id'))
+    )
+
+
+def _agrupado_do_ledger(de=None, ate=None):
+    """
+    GROUP BY da tabela quente UNION ALL o do arquivo das competências
+    fechadas, cada um filtrado por [de, ate]. Continua sendo uma única
+    query. Uma competência fechada pode aparecer nas duas partes (um
+    lançamento gravado durante o fechamento fica na quente): quem lê
+    soma as linhas de mesma competência.
+    """
+    partes = []
+    for modelo in (Lancamento, LancamentoArquivado):
+        queryset = modelo.objects.all()
+        if de is not None:
+            queryset = queryset.filter(competencia__gte=de)
+        if ate is not None:
+            queryset = queryset.filter(competencia__lte=ate)
+        partes.append(_agrupado(queryset))
+    return partes[0].union(partes[1], all=True)
+
+
+def _com_janelas(agrupado):
+    """Gera (competencia, total, quantidade, acumulado, acumulado_ano, comp_anterior, total_anterior)."""
+    sql_interno, params = agrupado.query.sql_with_params()
+    conexao = connections[agrupado.db]
+    q = conexao.ops.quote_name
+    comp, total, qtd = q('competencia'), q('total'), q('quantidade')
+    ordem = f"ORDER BY {comp} ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW"
+    # Reagrupa: no UNION ALL, a mesma competência pode vir das duas tabelas
+    sql_interno = (
+        f"SELECT {comp}, SUM({total}) AS {total}, SUM({qtd}) AS {qtd} "
+        f"FROM ({sql_interno}) {q('partes')} GROUP BY {comp}"
+    )
+    sql = (
+        f"SELECT {comp}, {total}, {qtd}, "
+        f"SUM({total}) OVER ({ordem}), "
+        f"SUM({total}) OVER (PARTITION BY {comp} / 100 {ordem}), "
+        f"LAG({comp}) OVER (ORDER BY {comp}), "
+        f"LAG({total}) OVER (ORDER BY {comp}) "
+        f"FROM ({sql_interno}) {q('agrupado')} ORDER BY {comp}"
+    )
+    with conexao.cursor() as cursor:
+        cursor.execute(sql, params)
+        for linha in cursor:
+            # SQL cru: as somas voltam em centavos, sem o conversor do CentavosField
+            yield (linha[0], Dinheiro.from_centavos(linha[1]), linha[2], Dinheiro.from_centavos(linha[3]),
+                   Dinheiro.from_centavos(linha[4]), linha[5], Dinheiro.from_centavos(linha[6]))
+
+
+def _em_uma_passada(agrupado):
+    """Mesma saída de _com_janelas, acumulando em Python sobre o GROUP BY ordenado."""
+    acumulado = Dinheiro(0)
+    ano_corrente, acumulado_ano = None, Dinheiro(0)
+    comp_anterior = total_anterior = None
+    for competencia, total, quantidade in _somar_repetidas(agrupado.order_by('competencia').iterator()):
+        if competencia // 100 != ano_corrente:
+            ano_corrente, acumulado_ano = competencia // 100, Dinheiro(0)
+        acumulado += total
+        acumulado_ano += total
+        yield (competencia, total, quantidade, acumulado, acumulado_ano, comp_anterior, total_anterior)
+        comp_anterior, total_anterior = competencia, total
+
+
+def _somar_repetidas(linhas):
+    """(competencia, total, quantidade) com as linhas consecutivas de mesma competência somadas."""
+    atual = None
+    for linha in linhas:
+        competencia = linha['competencia'].as_int
+        if atual is not None and atual[0] == competencia:
+            atual = (competencia, atual[1] + linha['total'], atual[2] + linha['quantidade'])
+            continue
+        if atual is not None:
+            yield atual
+        atual = (competencia, linha['total'], linha['quantidade'])
+    if atual is not None:
+        yield atual
+
+
+def saldos_por_competencia(queryset=None, usar_janelas=None, de=None, ate=None):
+    """
+    Lista de dicts, em ordem de competência:
+        competencia, total, quantidade, acumulado, acumulado_ano, variacao
+
+    `variacao` segue Competencia.anterior: se o período imediatamente
+    anterior (ex.: 13/2025 para 01/2026) não tem lançamentos, conta como 0.
+
+    Sem `queryset`, o relatório cobre o ledger em [de, ate] (ambos
+    opcionais), incluindo as competências fechadas (arquivadas). Com
+    `queryset`, só ele é agrupado e `de`/`ate` são ignorados.
+    """
+    agrupado = _agrupado_do_ledger(de, ate) if queryset is None else _agrupado(queryset)
+    if usar_janelas is None:
+        usar_janelas = connections[agrupado.db].features.supports_over_clause
+    linhas = _com_janelas(agrupado) if usar_janelas else _em_uma_passada(agrupado)
+
+    relatorio = []
+    for comp_int, total, quantidade, acumulado, acumulado_ano, comp_anterior, total_anterior in linhas:
+        competencia = Competencia.from_int(comp_int)
+        if comp_anterior is None or comp_anterior != competencia.anterior.as_int:
+            total_anterior = Dinheiro(0)
+        relatorio.append({
+            'competencia': competencia,
+            'total': total,
+            'quantidade': quantidade,
+            'acumulado': acumulado,
+            'acumulado_ano': acumulado_ano,
+            'variacao': total - total_anterior,
+        })
+    return relatorio
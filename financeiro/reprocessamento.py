@@ -0,0 +1,256 @@
+# financeiro/reprocessamento.py
+"""
+Reprocessamento do ledger em paralelo, para quando as regras de
+validators.py mudam e as competências já gravadas precisam ser
+conferidas (e às vezes reescritas).
+
+A tabela é dividida em faixas de pk ([inicio, fim)), processadas por um
+ProcessPoolExecutor; cada worker abre a própria conexão. Em cada faixa,
+os lançamentos são lidos em lotes, passam pela transformação escolhida e
+pelos validators, e os alterados são gravados com atualizar_lancamentos
+(bulk_update + deltas do ResumoCompetencia, numa transação por lote).
+
+O progresso fica num arquivo de checkpoint (JSON) com as faixas já
+concluídas: rodar de novo com o mesmo checkpoint continua de onde parou.
+As faixas são alinhadas em múltiplos do tamanho, então continuam as
+mesmas se o menor pk sumir entre uma execução e outra.
+
+Uma faixa interrompida no meio é refeita desde o início, inclusive os
+lotes já gravados. Por isso as transformações precisam ser idempotentes
+(f(f(c)) == f(c)): reaplicá-las a um lançamento já transformado não
+muda nada. reprocessar() confere isso em todas as competências do
+ResumoCompetencia antes da primeira gravação; processar_faixa confere
+de novo em cada lançamento, e aí os lotes anteriores da faixa já podem
+ter sido gravados.
+"""
+import datetime
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from django.db import connections
+from django.db.models import Max, Min
+
+from .lotes import ConversorLancamentos, atualizar_lancamentos
+from .models import Lancamento, ResumoCompetencia
+
+EXEMPLOS_POR_FAIXA = 10
+
+
+# --- Transformações: Competencia -> Competencia (a mesma, se nada muda) ---
+
+def decimo_terceiro_para_dezembro(competencia):
+    if competencia.mes == 13:
+        return type(competencia)(competencia.ano, 12)
+    return competencia
+
+
+TRANSFORMACOES = {
+    'nenhuma': None,
+    'decimo-terceiro-para-dezembro': decimo_terceiro_para_dezembro,
+}
+
+
+def registrar_transformacao(nome, funcao):
+    """Registra uma transformação; ela deve ser idempotente (ver o docstring do módulo)."""
+    TRANSFORMACOES[nome] = funcao
+    return funcao
+
+
+# --- Faixas e checkpoint ---
+
+def faixas(tamanho, queryset=None):
+    """
+    Faixas [inicio, fim) de `tamanho` pks cobrindo a tabela, alinhadas em
+    múltiplos de `tamanho`: não dependem do menor pk atual, então batem
+    com as de um checkpoint mesmo depois de exclusões ou fechamentos.
+    """
+    queryset = Lancamento.objects.all() if queryset is None else queryset
+    limites = queryset.aggregate(menor=Min('pk'), maior=Max('pk'))
+    if limites['menor'] is None:
+        return []
+    return [
+        (inicio, inicio + tamanho)
+        for inicio in range(limites['menor'] // tamanho * tamanho, limites['maior'] + 1, tamanho)
+    ]
+
+
+class Checkpoint:
+    """
+    Arquivo JSON com os parâmetros da execução, o "hoje" da validação, as
+    faixas concluídas e os totais acumulados. Ao retomar, o "hoje" gravado
+    é reaproveitado, para que todas as faixas sigam as mesmas regras.
+    Gravado inteiro a cada faixa (arquivo temporário + os.replace), então
+    uma interrupção nunca deixa o arquivo pela metade.
+    """
+
+    def __init__(self, caminho, parametros, hoje=None):
+        self.caminho = Path(caminho) if caminho else None
+        self.parametros = parametros
+        self.hoje = hoje
+        self.concluidas = set()
+        self.totais = {'lidos': 0, 'alterados': 0, 'invalidos': 0}
+
+    def carregar(self):
+        """Retoma um checkpoint existente. ValueError se os parâmetros forem outros."""
+        if self.caminho is None or not self.caminho.exists():
+            return False
+        dados = json.loads(self.caminho.read_text(encoding='utf-8'))
+        if dados['parametros'] != self.parametros:
+            raise ValueError(
+                f"O checkpoint {self.caminho} é de outra execução "
+                f"({dados['parametros']}); use outro arquivo ou --reiniciar."
+            )
+        self.hoje = self.hoje or dados['hoje']
+        self.concluidas = {tuple(faixa) for faixa in dados['concluidas']}
+        self.totais = dados['totais']
+        return True
+
+    def concluir(self, faixa, resultado):
+        self.concluidas.add(tuple(faixa))
+        for chave in self.totais:
+            self.totais[chave] += resultado[chave]
+        self.gravar()
+
+    def gravar(self):
+        if self.caminho is None:
+            return
+        temporario = self.caminho.with_name(self.caminho.name + '.tmp')
+        temporario.write_text(json.dumps({
+            'parametros': self.parametros,
+            'hoje': self.hoje,
+            'concluidas': sorted(self.concluidas),
+            'totais': self.totais,
+        }), encoding='utf-8')
+        os.replace(temporario, self.caminho)
+
+
+# --- Trabalho de uma faixa (roda no worker) ---
+
+def iniciar_worker():
+    """
+    Initializer do pool: com spawn, o processo filho precisa do
+    django.setup(); com fork, o pai já fechou as conexões antes de criar
+    o pool, e cada worker abre a sua na primeira query.
+    """
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def processar_faixa(inicio, fim, transformacao='nenhuma', lote=1000, hoje=None, simular=False):
+    """
+    Processa os lançamentos com pk em [inicio, fim). Retorna um dict com
+    faixa, lidos, alterados, invalidos e exemplos [(pk, competencia, erro)].
+    """
+    transformar = TRANSFORMACOES[transformacao]
+    conversor = ConversorLancamentos(hoje=datetime.date.fromisoformat(hoje) if hoje else None)
+    resultado = {'faixa': (inicio, fim), 'lidos': 0, 'alterados': 0, 'invalidos': 0, 'exemplos': []}
+
+    faixa = Lancamento.objects.filter(pk__lt=fim).order_by('pk').only('pk', 'competencia', 'valor')
+    ultimo = inicio - 1
+    # Paginação por pk (e não um cursor aberto): cada lote é lido e gravado
+    # antes do próximo SELECT, sem cursor atravessando as transações
+    while lancamentos := list(faixa.filter(pk__gt=ultimo)[:lote]):
+        ultimo = lancamentos[-1].pk
+        alterados = []
+        for lancamento in lancamentos:
+            competencia = lancamento.competencia
+            nova = transformar(competencia) if transformar else competencia
+            if nova != competencia and transformar(nova) != nova:
+                # Refazer uma faixa interrompida reaplicaria a transformação
+                raise ValueError(
+                    f"A transformação {transformacao!r} não é idempotente: "
+                    f"{competencia} -> {nova} -> {transformar(nova)} (lançamento {lancamento.pk}). "
+                    f"Os lotes anteriores da faixa [{inicio}, {fim}) já foram gravados."
+                )
+            erro = conversor.erro_competencia(nova)
+            if erro:
+                resultado['invalidos'] += 1
+                if len(resultado['exemplos']) < EXEMPLOS_POR_FAIXA:
+                    resultado['exemplos'].append((lancamento.pk, str(nova), erro))
+            elif nova != competencia:
+                lancamento.competencia = nova
+                alterados.append(lancamento)
+        if alterados and not simular:
+            atualizar_lancamentos(alterados, ['competencia'])
+        resultado['lidos'] += len(lancamentos)
+        resultado['alterados'] += len(alterados)
+    return resultado
+
+
+# --- Orquestração ---
+
+def verificar_idempotencia(transformacao):
+    """
+    ValueError se f(f(c)) != f(c) para alguma competência do ledger (lidas
+    do ResumoCompetencia, uma por período), antes de qualquer gravação.
+    """
+    transformar = TRANSFORMACOES[transformacao]
+    if transformar is None:
+        return
+    for competencia in ResumoCompetencia.objects.values_list('competencia', flat=True):
+        nova = transformar(competencia)
+        if transformar(nova) != nova:
+            raise ValueError(
+                f"A transformação {transformacao!r} não é idempotente: "
+                f"{competencia} -> {nova} -> {transformar(nova)}. Nada foi gravado."
+            )
+
+def reprocessar(transformacao='nenhuma', workers=None, faixa=50_000, lote=1000,
+                checkpoint=None, reiniciar=False, simular=False, hoje=None, progresso=None):
+    """
+    Reprocessa o ledger inteiro. `workers=0` roda tudo no próprio processo
+    (útil em testes e com SQLite em memória). `progresso(resultado, estado)`
+    é chamado a cada faixa concluída, com estado = {'concluidas',
+    'total_faixas', 'lidos', 'segundos', 'linhas_por_segundo'}.
+
+    Retorna os totais: lidos, alterados, invalidos, faixas, segundos.
+    """
+    if transformacao not in TRANSFORMACOES:
+        raise ValueError(f"Transformação desconhecida: {transformacao!r}.")
+    if not simular:
+        verificar_idempotencia(transformacao)
+    estado = Checkpoint(checkpoint, {'transformacao': transformacao, 'faixa': faixa, 'simular': simular}, hoje)
+    if not reiniciar:
+        estado.carregar()
+    estado.hoje = hoje = estado.hoje or datetime.date.today().isoformat()
+
+    todas = faixas(faixa)
+    pendentes = [f for f in todas if f not in estado.concluidas]
+    # Faixas concluídas que ficaram vazias (fora de `todas`) não contam de novo
+    total_faixas = len(set(todas) | estado.concluidas)
+    argumentos = {'transformacao': transformacao, 'lote': lote, 'hoje': hoje, 'simular': simular}
+    inicio = time.perf_counter()
+    lidos_agora = 0
+
+    def registrar(resultado):
+        nonlocal lidos_agora
+        estado.concluir(resultado['faixa'], resultado)
+        lidos_agora += resultado['lidos']
+        if progresso:
+            segundos = time.perf_counter() - inicio
+            progresso(resultado, {
+                'concluidas': len(estado.concluidas),
+                'total_faixas': total_faixas,
+                'lidos': estado.totais['lidos'],
+                'segundos': segundos,
+                'linhas_por_segundo': lidos_agora / segundos if segundos else 0,
+            })
+
+    if workers == 0:
+        for inicio_faixa, fim_faixa in pendentes:
+            registrar(processar_faixa(inicio_faixa, fim_faixa, **argumentos))
+    elif pendentes:
+        # Os filhos não podem herdar conexões abertas do pai
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=iniciar_worker) as pool:
+            futuros = [pool.submit(processar_faixa, i, f, **argumentos) for i, f in pendentes]
+            for futuro in as_completed(futuros):
+                registrar(futuro.result())
+
+    return {**estado.totais, 'faixas': total_faixas, 'segundos': time.perf_counter() - inicio}
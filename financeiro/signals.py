@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .models import Dinheiro, Lancamento, ResumoCompetencia, VersaoLedger
+
+
+def _dinheiro(valor):
+    # O form entrega Dinheiro, mas testes e scripts costumam passar Decimal/str/int
+    return Dinheiro.parse(valor)
+
+
+def notificar_colunar(nome, *args):
+    """
+    Chama colunar.<nome>(*args) depois do commit, se o cache colunar
+    estiver ligado. O import é tardio: numpy só é exigido com o cache ativo.
+    """
+    if not getattr(settings, 'LEDGER_COLUNAR_ATIVO', False):
+        return
+    from . import colunar
+    transaction.on_commit(lambda: getattr(colunar, nome)(*args))
+
+
+@receiver(pre_save, sender=Lancamento)
+def guardar_estado_anterior(sender, instance, raw=False, **kwargs):
+    """Lembra competência/valor gravados antes de uma edição."""
+    instance._resumo_anterior = None
+    if raw or instance.pk is None:
+        return
+    instance._resumo_anterior = (
+        Lancamento.objects.filter(pk=instance.pk).values_list('competencia', 'valor').first()
+    )
+
+
+@receiver(post_save, sender=Lancamento)
+def atualizar_resumo_ao_salvar(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    anterior = getattr(instance, '_resumo_anterior', None)
+    if anterior is not None:
+        competencia_antiga, valor_antigo = anterior
+        ResumoCompetencia.aplicar_delta(competencia_antiga, -valor_antigo, -1)
+    ResumoCompetencia.aplicar_delta(instance.competencia, _dinheiro(instance.valor), 1)
+    VersaoLedger.incrementar()
+    notificar_colunar('registrar_gravacao', instance.pk, instance.competencia, instance.valor)
+
+
+@receiver(post_delete, sender=Lancamento)
+def atualizar_resumo_ao_excluir(sender, instance, **kwargs):
+    ResumoCompetencia.aplicar_delta(instance.competencia, -_dinheiro(instance.valor), -1)
+    VersaoLedger.incrementar()
+    notificar_colunar('registrar_exclusao', instance.pk)
@@ -0,0 +1,97 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from financeiro import admin as financeiro_admin
+from financeiro.models import Competencia, Lancamento, ResumoCompetencia
+
+URL = reverse('admin:financeiro_lancamento_changelist')
+
+
+@pytest.fixture
+def ledger(db):
+    Lancamento.objects.bulk_create(
+        Lancamento(descricao=f"{nome} {i}", valor=10, competencia=Competencia.from_int(c))
+        for i, (nome, c) in enumerate([
+            ('Salário', 202501), ('Salário', 202512), ('13º', 202513),
+            ('Aluguel', 202513), ('Aluguel', 202601),
+        ])
+    )
+    ResumoCompetencia.reconstruir()
+
+
+def _contagens_no_ledger(contexto):
+    tabela = Lancamento._meta.db_table
+    return [q['sql'] for q in contexto.captured_queries if 'COUNT(' in q['sql'] and tabela in q['sql']]
+
+
+def test_lista_conta_pelo_resumo(admin_client, ledger):
+    with CaptureQueriesContext(connection) as contexto:
+        resposta = admin_client.get(URL)
+    assert resposta.status_code == 200
+    assert resposta.context['cl'].result_count == 5
+    assert _contagens_no_ledger(contexto) == []
+    # Anos e competências vêm do resumo
+    conteudo = resposta.content.decode()
+    assert '?ano=2025' in conteudo and '?ano=2026' in conteudo
+    assert '<option value="13/2025">' in conteudo
+
+
+def test_filtros_por_ano_e_competencia(admin_client, ledger):
+    resposta = admin_client.get(URL, {'ano': '2025'})
+    assert resposta.context['cl'].result_count == 4
+    assert {l.competencia.as_int for l in resposta.context['cl'].result_list} == {202501, 202512, 202513}
+
+    resposta = admin_client.get(URL, {'ano': '2025', 'competencia': '13/2025'})
+    assert resposta.context['cl'].result_count == 2
+    assert [l.competencia.as_int for l in resposta.context['cl'].result_list] == [202513, 202513]
+    # O ano escolhido continua no formulário da competência
+    assert '<input type="hidden" name="ano" value="2025">' in resposta.content.decode()
+
+
+def test_competencia_invalida(admin_client, ledger):
+    resposta = admin_client.get(URL, {'competencia': '14/2025'})
+    assert resposta.status_code == 302
+    assert resposta.url.endswith('?e=1')
+
+
+def test_busca_usa_contagem_limitada(admin_client, ledger, monkeypatch):
+    monkeypatch.setattr(financeiro_admin, 'CONTAGEM_MAXIMA', 1)
+    with CaptureQueriesContext(connection) as contexto:
+        resposta = admin_client.get(URL, {'q': 'aluguel'})
+    # Dois resultados: a contagem para uma linha depois do teto
+    assert resposta.context['cl'].result_count == 2
+    assert len(resposta.context['cl'].result_list) == 2
+    contagens = _contagens_no_ledger(contexto)
+    assert contagens and all('LIMIT 2' in sql for sql in contagens)
+    conteudo = resposta.content.decode()
+    assert 'mais de 1 resultados' in conteudo
+    assert f'mais de 1 {Lancamento._meta.verbose_name_plural}' in conteudo
+
+
+def test_busca_abaixo_do_teto_mostra_total_exato(admin_client, ledger):
+    resposta = admin_client.get(URL, {'q': 'aluguel'})
+    assert resposta.context['cl'].result_count == 2
+    assert resposta.context['cl'].paginator.rotulo_contagem is None
+    assert 'mais de' not in resposta.content.decode()
+
+
+def test_adicionar_e_editar_pelo_admin(admin_client, db):
+    resposta = admin_client.post(reverse('admin:financeiro_lancamento_add'), {
+        'descricao': 'Pelo admin', 'valor': '12.50', 'competencia_0': '13', 'competencia_1': '2025',
+    })
+    assert resposta.status_code == 302
+    lancamento = Lancamento.objects.get()
+    assert (lancamento.competencia.as_int, lancamento.valor.decimal) == (202513, Decimal("12.50"))
+
+    url = reverse('admin:financeiro_lancamento_change', args=[lancamento.pk])
+    assert 'name="competencia_0"' in admin_client.get(url).content.decode()
+    resposta = admin_client.post(url, {
+        'descricao': 'Editado', 'valor': '1.00', 'competencia_0': '1', 'competencia_1': '2026',
+    })
+    assert resposta.status_code == 302
+    lancamento.refresh_from_db()
+    assert (lancamento.descricao, lancamento.competencia.as_int) == ("Editado", 202601)
@@ -0,0 +1,117 @@
+import json
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from financeiro.models import Lancamento, ResumoCompetencia
+
+
+def enviar(client, metodo, url, corpo):
+    return getattr(client, metodo)(url, data=json.dumps(corpo), content_type='application/json')
+
+
+@pytest.mark.django_db
+class TestApiLancamentos:
+
+    def test_criar_e_detalhar(self, client):
+        resp = enviar(client, 'post', reverse('api_lancamentos'),
+                      {'descricao': 'API', 'valor': '12.5', 'competencia': '13/2025'})
+
+        assert resp.status_code == 201
+        criado = resp.json()
+        assert criado['competencia'] == 202513
+        assert criado['valor'] == "12.50"
+
+        url = reverse('api_lancamento', args=[criado['id']])
+        assert client.get(url, {'competencia': 'texto'}).json()['competencia'] == "13/2025"
+
+    def test_criar_invalido_devolve_erros_por_campo(self, client):
+        resp = enviar(client, 'post', reverse('api_lancamentos'),
+                      {'descricao': '', 'valor': 'abc', 'competencia': 201901})
+
+        assert resp.status_code == 400
+        assert set(resp.json()['erros']) == {'descricao', 'valor', 'competencia'}
+
+    def test_json_invalido(self, client):
+        resp = client.post(reverse('api_lancamentos'), data='{', content_type='application/json')
+        assert resp.status_code == 400
+
+    @pytest.mark.parametrize('content_type', ['text/plain', 'application/x-www-form-urlencoded'])
+    def test_escrita_exige_json(self, client, content_type):
+        """Sem CSRF, só application/json (que exige preflight CORS) é aceito"""
+        corpo = json.dumps({'descricao': 'X', 'valor': '1', 'competencia': 202501})
+        for url in (reverse('api_lancamentos'), reverse('api_lancamentos_lote')):
+            resp = client.post(url, data=corpo, content_type=content_type)
+            assert resp.status_code == 415
+        assert not Lancamento.objects.exists()
+
+    def test_patch_parcial(self, client):
+        lanc = Lancamento.objects.create(descricao="A", valor=1, competencia=202501)
+
+        resp = enviar(client, 'patch', reverse('api_lancamento', args=[lanc.pk]), {'competencia': 202502})
+
+        assert resp.status_code == 200
+        lanc.refresh_from_db()
+        assert lanc.competencia == 202502
+        assert lanc.descricao == "A"
+
+    def test_lista_keyset(self, client):
+        for comp in (202501, 202502, 202503):
+            Lancamento.objects.create(descricao=str(comp), valor=1, competencia=comp)
+
+        primeira = client.get(reverse('api_lancamentos'), {'limite': 2}).json()
+        segunda = client.get(reverse('api_lancamentos'), {'limite': 2, 'cursor': primeira['proximo_cursor']}).json()
+
+        assert [r['competencia'] for r in primeira['resultados']] == [202503, 202502]
+        assert [r['competencia'] for r in segunda['resultados']] == [202501]
+        assert segunda['proximo_cursor'] is None
+
+
+@pytest.mark.django_db
+class TestApiLote:
+
+    def test_criar_lote(self, client):
+        corpo = [
+            {'descricao': 'A', 'valor': '1.00', 'competencia': 202513},
+            {'descricao': 'B', 'valor': '2.00', 'competencia': '13/2025'},
+        ]
+        resp = enviar(client, 'post', reverse('api_lancamentos_lote'), corpo)
+
+        assert resp.status_code == 201
+        assert all(item['id'] for item in resp.json()['criados'])
+        assert ResumoCompetencia.objects.get(competencia=202513).total == Decimal("3.00")
+
+    def test_lote_tudo_ou_nada(self, client):
+        corpo = [
+            {'descricao': 'A', 'valor': '1.00', 'competencia': 202501},
+            {'descricao': 'B', 'valor': '2.00', 'competencia': 202514},
+        ]
+        resp = enviar(client, 'post', reverse('api_lancamentos_lote'), corpo)
+
+        assert resp.status_code == 400
+        assert list(resp.json()['erros']) == ['1']
+        assert not Lancamento.objects.exists()
+
+    def test_atualizar_lote(self, client):
+        a = Lancamento.objects.create(descricao="A", valor=1, competencia=202501)
+        b = Lancamento.objects.create(descricao="B", valor=2, competencia=202501)
+
+        resp = enviar(client, 'patch', reverse('api_lancamentos_lote'), [
+            {'id': a.pk, 'competencia': 202502},
+            {'id': b.pk, 'valor': '5.00'},
+        ])
+
+        assert resp.status_code == 200
+        a.refresh_from_db()
+        b.refresh_from_db()
+        assert (a.competencia, b.valor) == (202502, Decimal("5.00"))
+        # O resumo acompanha o bulk_update
+        assert ResumoCompetencia.objects.get(competencia=202501).total == Decimal("5.00")
+        assert ResumoCompetencia.objects.get(competencia=202502).total == Decimal("1.00")
+
+    def test_atualizar_lote_id_inexistente(self, client):
+        resp = enviar(client, 'put', reverse('api_lancamentos_lote'), [
+            {'id': 999, 'descricao': 'X', 'valor': '1', 'competencia': 202501},
+        ])
+        assert resp.status_code == 400
+        assert 'id' in resp.json()['erros']['0']
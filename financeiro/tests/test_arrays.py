@@ -0,0 +1,75 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from financeiro.arrays import CompetenciaArray  # noqa: E402
+from financeiro.models import Competencia, Lancamento  # noqa: E402
+
+# Todos os períodos de 2024 a 2026, incluindo as viradas 12 -> 13 -> 01
+ESCALARES = [Competencia(ano, mes) for ano in range(2024, 2027) for mes in range(1, 14)]
+
+
+class TestCompetenciaArray:
+
+    def test_construcao_e_validacao(self):
+        arr = CompetenciaArray([202513, Competencia(2026, 1)])
+        assert arr.valores.dtype == np.int32
+        assert arr.tolist() == [202513, 202601]
+
+        with pytest.raises(ValueError) as excinfo:
+            CompetenciaArray([202501, 202514])
+        assert "Mês 14 inválido" in str(excinfo.value)
+
+        assert CompetenciaArray.mascara_valida([202500, 202513, 202514]).tolist() == [False, True, False]
+
+        # Só o calendário padrão: o LIMITE_MES do array é o dele
+        trimestral = Competencia.para_calendario('trimestral')(2025, 1)
+        with pytest.raises(ValueError, match="calendário padrão"):
+            CompetenciaArray([trimestral])
+        # ...nem como operando de comparação ou de diferença
+        arr = CompetenciaArray([202501])
+        for operacao in (lambda: arr == trimestral, lambda: arr < trimestral,
+                         lambda: arr - trimestral, lambda: trimestral - arr):
+            with pytest.raises(ValueError, match="calendário padrão"):
+                operacao()
+
+    @pytest.mark.parametrize("meses", [-27, -14, -13, -1, 0, 1, 12, 13, 40])
+    def test_soma_e_subtracao_iguais_ao_escalar(self, meses):
+        arr = CompetenciaArray(ESCALARES)
+        assert (arr + meses).tolist() == [(c + meses).as_int for c in ESCALARES]
+        assert (arr - meses).tolist() == [(c - meses).as_int for c in ESCALARES]
+
+    def test_soma_por_array_de_deslocamentos(self):
+        arr = CompetenciaArray([202512, 202513, 202601])
+        deslocado = arr + np.array([1, 1, -1])
+        assert deslocado.tolist() == [202513, 202601, 202513]
+
+    def test_diferenca_entre_periodos(self):
+        arr = CompetenciaArray(ESCALARES)
+        base = Competencia(2025, 13)
+        assert (arr - base).tolist() == [c - base for c in ESCALARES]
+        assert (base - arr).tolist() == [base - c for c in ESCALARES]
+        assert (arr - arr).tolist() == [0] * len(ESCALARES)
+
+    def test_comparacao_com_mes_13(self):
+        arr = CompetenciaArray([202512, 202513, 202601])
+        assert (arr < Competencia(2026, 1)).tolist() == [True, True, False]
+        assert (arr == 202513).tolist() == [False, True, False]
+        assert (arr >= CompetenciaArray([202601, 202513, 202513])).tolist() == [False, True, True]
+
+    def test_indexacao_devolve_escalar(self):
+        arr = CompetenciaArray([202512, 202513])
+        assert arr[1] is Competencia.from_int(202513)
+        assert list(arr) == [Competencia(2025, 12), Competencia(2025, 13)]
+        assert arr[1:].tolist() == [202513]
+
+    @pytest.mark.django_db
+    def test_ida_e_volta_com_queryset(self):
+        for comp in (202512, 202513, 202601):
+            Lancamento.objects.create(descricao="X", valor=1, competencia=comp)
+
+        arr = CompetenciaArray.from_queryset(Lancamento.objects.order_by('competencia'))
+        assert arr.tolist() == [202512, 202513, 202601]
+
+        proximas = (arr + 1).tolist()
+        assert Lancamento.objects.filter(competencia__in=proximas).count() == 2
@@ -0,0 +1,34 @@
+import pytest
+from django.db import connection
+
+from core import banco
+
+
+@pytest.mark.django_db
+def test_pragmas_aplicados_na_conexao():
+    if connection.vendor != 'sqlite':
+        pytest.skip("Pragmas só se aplicam ao SQLite")
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1  # NORMAL
+        cursor.execute("PRAGMA cache_size")
+        assert cursor.fetchone()[0] == banco.PRAGMAS_SQLITE['cache_size']
+
+
+def test_perfil_sqlite():
+    config = banco.perfil('sqlite', '/tmp/x.sqlite3')
+    assert config['CONN_MAX_AGE'] > 0
+    assert config['OPTIONS']['transaction_mode'] == 'IMMEDIATE'
+    assert 'PRAGMA journal_mode=WAL' in config['OPTIONS']['init_command']
+
+
+def test_perfil_postgresql_usa_pool_sem_conexao_persistente():
+    config = banco.postgresql({'PGDATABASE': 'teste', 'DJANGO_DB_POOL_MAX': '4'})
+    assert config['NAME'] == 'teste'
+    assert config['CONN_MAX_AGE'] == 0
+    assert config['OPTIONS']['pool']['max_size'] == 4
+
+
+def test_perfil_desconhecido():
+    with pytest.raises(ValueError):
+        banco.perfil('oracle', None)
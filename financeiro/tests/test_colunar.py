@@ -0,0 +1,123 @@
+import time
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from financeiro import colunar, fechamento
+from financeiro.lotes import gravar_lancamentos
+from financeiro.models import Competencia, Lancamento
+
+
+@pytest.fixture
+def ledger(db, settings):
+    settings.LEDGER_COLUNAR_ATIVO = True
+    settings.LEDGER_COLUNAR_TTL = None
+    colunar._ledger = None
+    for comp, valor in [(202512, "10.10"), (202513, "-2.25"), (202601, "300.00"), (202601, "0.99")]:
+        Lancamento.objects.create(descricao=str(comp), valor=valor, competencia=comp)
+    yield colunar.obter()
+    colunar._ledger = None
+
+
+def test_desligado_por_padrao(db):
+    assert colunar.obter() is None
+
+
+def test_consultas(ledger):
+    assert len(ledger) == 4
+    assert ledger.total() == Decimal("308.84")
+    assert ledger.total(de=202513, ate="01/2026") == Decimal("298.74")
+    assert ledger.quantidade(de=202601) == 2
+    assert list(ledger.filtrar(ate=202513)['competencia']) == [202512, 202513]
+    assert ledger.totais_por_competencia(de=202513) == {
+        Competencia(2025, 13): (Decimal("-2.25"), 1),
+        Competencia(2026, 1): (Decimal("300.99"), 2),
+    }
+
+
+def test_inclui_competencias_fechadas(ledger, django_capture_on_commit_callbacks):
+    recargas = ledger.recargas
+    with django_capture_on_commit_callbacks(execute=True):
+        fechamento.fechar(202513)
+    cache = colunar.obter()
+
+    # Recarregado do banco (fechar invalida), com o arquivo
+    assert cache.recargas == recargas + 1
+    assert len(cache) == 4
+    assert cache.total() == Decimal("308.84")
+    assert cache.totais_por_competencia(ate=202513)[Competencia(2025, 13)] == (Decimal("-2.25"), 1)
+
+
+def test_top(ledger):
+    maiores = ledger.top(2)
+    assert [(c.as_int, v) for _, c, v in maiores] == [(202601, Decimal("300.00")), (202512, Decimal("10.10"))]
+    assert ledger.top(1, maiores=False)[0][2] == Decimal("-2.25")
+    assert ledger.top(10, de=202601)[-1][2] == Decimal("0.99")
+
+
+def test_atualizacao_incremental_pelos_signals(ledger, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        novo = Lancamento.objects.create(descricao="novo", valor="5.00", competencia=202602)
+    assert ledger.total(de=202602) == Decimal("5.00")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        novo.valor = Decimal("7.50")
+        novo.save()
+    assert ledger.total(de=202602) == Decimal("7.50")
+    assert len(ledger) == 5
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Lancamento.objects.filter(competencia=202512).get().delete()
+    assert len(ledger) == 4
+    assert ledger.total() == Decimal("306.24")
+
+
+def test_sem_commit_nao_altera(ledger):
+    # Dentro da transação do teste o on_commit não roda (equivale a um rollback)
+    Lancamento.objects.create(descricao="novo", valor="5.00", competencia=202602)
+    assert len(ledger) == 4
+
+
+def test_lote_invalida(ledger, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        gravar_lancamentos([Lancamento(descricao="lote", valor=1, competencia=202603)])
+    assert not ledger.carregado
+    assert colunar.obter().total(de=202603) == Decimal("1.00")
+
+
+def test_limite_de_memoria(ledger, settings):
+    colunar._ledger = None
+    settings.LEDGER_COLUNAR_LIMITE_MB = 3 * colunar.BYTES_POR_LINHA / 2**20
+    assert colunar.obter() is None
+    assert colunar.atual().estatisticas()['excedido']
+
+
+def test_limite_excedido_espera_o_ttl(ledger, settings, django_assert_num_queries, monkeypatch):
+    colunar._ledger = None
+    settings.LEDGER_COLUNAR_TTL = 60
+    settings.LEDGER_COLUNAR_LIMITE_MB = 3 * colunar.BYTES_POR_LINHA / 2**20
+    assert colunar.obter() is None
+
+    # Dentro do TTL, nada de COUNT(*) a cada chamada
+    with django_assert_num_queries(0):
+        assert colunar.obter() is None
+        colunar.invalidar()
+        assert colunar.obter() is None
+
+    agora = time.monotonic()
+    monkeypatch.setattr(colunar.time, 'monotonic', lambda: agora + settings.LEDGER_COLUNAR_TTL + 1)
+    colunar.atual().limite_bytes = 2**20
+    assert colunar.obter() is not None
+    assert not colunar.atual().excedido
+
+
+def test_crescimento_respeita_limite(db):
+    cache = colunar.LedgerColunar(limite_bytes=5 * colunar.BYTES_POR_LINHA)
+    cache.carregar()
+    for pk in range(1, 6):
+        cache.gravar(pk, 202601, 100)
+    assert len(cache) == 5 and cache.memoria_bytes <= cache.limite_bytes
+    cache.gravar(6, 202601, 100)
+    assert not cache.carregado and cache.excedido
@@ -1,5 +1,9 @@
+import copy
+import datetime
+import pickle
 import pytest
-from financeiro.models import Competencia
+from financeiro import calendarios
+from financeiro.models import Competencia, CompetenciaField
 
 class TestCompetenciaLogic:
     
@@ -68,4 +72,83 @@ class TestCompetenciaLogic:
         futuro = Competencia(2026, 2)
         passado = Competencia(2025, 13)
         # Diferença: 13/25 -> 01/26 -> 02/26 = 2 passos
-        assert (futuro - passado) == 2
\ No newline at end of file
+        assert (futuro - passado) == 2
+
+class TestCompetenciaInterning:
+
+    def test_from_int_compartilha_instancias(self):
+        """O mesmo AAAAMM devolve sempre o mesmo objeto"""
+        assert Competencia.from_int(202513) is Competencia.from_int(202513)
+        assert Competencia.from_int("202513") is Competencia.from_int(202513)
+        # Aritmética também passa pelo cache
+        assert Competencia.from_int(202512) + 1 is Competencia.from_int(202513)
+
+    def test_from_int_invalido_nao_fica_em_cache(self):
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                Competencia.from_int(202514)
+
+    def test_imutavel(self):
+        c = Competencia.from_int(202501)
+        with pytest.raises(AttributeError):
+            c._valor = 202502
+        with pytest.raises(AttributeError):
+            del c._valor
+        assert c.as_int == 202501
+
+    def test_pickle_e_copy(self):
+        c = Competencia(2025, 13)
+        assert pickle.loads(pickle.dumps(c)) == c
+        assert copy.deepcopy(c) == c
+
+
+class TestCalendario:
+
+    def test_ordinal(self):
+        c = Competencia(2025, 13)
+        assert c.ordinal == 2025 * 13 + 12
+        assert Competencia.from_ordinal(c.ordinal) is Competencia.from_int(202513)
+        assert Competencia.from_ordinal(c.ordinal + 1) == 202601
+
+    def test_tabelas_de_nomes_e_texto(self):
+        c = Competencia.from_int(202513)
+        assert c.descricao_mes == "13º Salário"
+        assert Competencia(2025, 3).descricao_mes == "Março"
+        assert str(c) == "13/2025"
+        assert str(c) is str(c)
+
+    def test_calendario_de_12_meses(self):
+        Mensal = Competencia.para_calendario('mensal')
+        assert Mensal is Competencia.para_calendario(calendarios.MENSAL)
+        assert Mensal(2025, 12) + 1 == 202601
+        assert Mensal(2026, 1) - Mensal(2025, 1) == 12
+        with pytest.raises(ValueError):
+            Mensal(2025, 13)
+
+    def test_calendario_trimestral(self):
+        Trimestre = Competencia.para_calendario(calendarios.TRIMESTRAL)
+        c = Trimestre.hoje(datetime.date(2025, 5, 10))
+        assert c == 202502
+        assert c.descricao_mes == "2º Trimestre"
+        assert c + 3 == 202601
+        assert pickle.loads(pickle.dumps(c)) is c
+
+    def test_calendario_personalizado(self):
+        fiscal = calendarios.Calendario('fiscal-teste', [f"P{i}" for i in range(1, 15)])
+        Fiscal = Competencia.para_calendario(fiscal)
+        assert Fiscal(2025, 14) + 1 == 202601
+        assert str(Fiscal(2025, 14)) == "14/2025"
+
+    def test_calendarios_diferentes_nao_se_subtraem(self):
+        Mensal = Competencia.para_calendario('mensal')
+        with pytest.raises(ValueError):
+            Competencia(2025, 1) - Mensal(2025, 1)
+
+    def test_campo_com_calendario(self):
+        campo = CompetenciaField(calendario='trimestral')
+        assert campo.deconstruct()[3]['calendario'] == 'trimestral'
+        assert 'calendario' not in CompetenciaField().deconstruct()[3]
+        assert campo.from_db_value(202504, None, None).descricao_mes == "4º Trimestre"
+        form_field = campo.formfield()
+        assert form_field.fields[0].max_value == 4
+        assert form_field.clean(['4', '2025']) == 202504
@@ -0,0 +1,79 @@
+import pickle
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.db.models import Sum
+from django.urls import reverse
+from financeiro.models import Dinheiro, Lancamento
+
+
+class TestDinheiro:
+
+    @pytest.mark.parametrize("valor, esperado", [
+        ("1234.56", "R$ 1.234,56"),
+        ("0.05", "R$ 0,05"),
+        ("-1234.5", "-R$ 1.234,50"),
+        (1000000, "R$ 1.000.000,00"),
+        (Decimal("999.99"), "R$ 999,99"),
+    ])
+    def test_formatacao(self, valor, esperado):
+        assert str(Dinheiro(valor)) == esperado
+
+    def test_centavos(self):
+        d = Dinheiro("12.34")
+        assert d.centavos == 1234
+        assert d.decimal == Decimal("12.34")
+        assert Dinheiro.from_centavos(1234) == d
+
+    @pytest.mark.parametrize("texto", ["1234.56", "1.234,56", "R$ 1.234,56", " 1234,56 "])
+    def test_parse(self, texto):
+        assert Dinheiro.parse(texto).centavos == 123456
+
+    def test_parse_invalido(self):
+        with pytest.raises(ValueError):
+            Dinheiro.parse("abc")
+
+    def test_aritmetica_exata(self):
+        assert Dinheiro("0.10") + Dinheiro("0.20") == Decimal("0.30")
+        assert Dinheiro("5.00") - 2 == Dinheiro("3.00")
+        assert Decimal("1.25") + Dinheiro("1.00") == Dinheiro("2.25")
+        assert -Dinheiro("1.00") * 3 == Dinheiro("-3.00")
+        assert sum([Dinheiro("0.01")] * 100) == 1
+        assert Dinheiro.somar([Dinheiro("0.01")] * 100) == Dinheiro(1)
+
+    def test_comparacao_e_hash_com_decimal(self):
+        assert Dinheiro("10.10") == Decimal("10.10")
+        assert Dinheiro("10.10") < Decimal("10.11")
+        assert Dinheiro("10.00") == 10
+        assert Dinheiro("10.10") in {Decimal("10.10")}
+        assert Dinheiro("10.10") != "10.10"
+
+    def test_imutavel_e_pickle(self):
+        d = Dinheiro("1.00")
+        with pytest.raises(AttributeError):
+            d._centavos = 5
+        assert pickle.loads(pickle.dumps(d)) == d
+
+
+@pytest.mark.django_db
+class TestCentavosField:
+
+    def test_grava_centavos_e_le_dinheiro(self):
+        lanc = Lancamento.objects.create(descricao="X", valor="10.10", competencia=202513)
+        lanc.refresh_from_db()
+        assert isinstance(lanc.valor, Dinheiro) and lanc.valor == Decimal("10.10")
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT valor FROM financeiro_lancamento WHERE id = %s", [lanc.pk])
+            assert cursor.fetchone()[0] == 1010
+
+    def test_filtro_e_soma(self):
+        for valor in ("0.10", "0.20", "100"):
+            Lancamento.objects.create(descricao="X", valor=valor, competencia=202513)
+        assert Lancamento.objects.filter(valor__lt=1).count() == 2
+        assert Lancamento.objects.aggregate(total=Sum('valor'))['total'] == Dinheiro("100.30")
+
+    def test_form_exibe_decimal(self, client):
+        lanc = Lancamento.objects.create(descricao="X", valor="1234.50", competencia=202513)
+        resp = client.get(reverse('editar_lancamento', args=[lanc.pk]))
+        assert 'value="1234.50"' in resp.content.decode()
@@ -0,0 +1,48 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from financeiro.models import Lancamento
+
+
+@pytest.fixture
+def ledger(db):
+    for descricao, comp in [("A", 202512), ("B", 202513), ("C", 202601)]:
+        Lancamento.objects.create(descricao=descricao, valor="10.50", competencia=comp)
+
+
+@pytest.mark.django_db
+class TestExportarLancamentos:
+
+    def test_view_csv_em_streaming(self, client, ledger):
+        resp = client.get(reverse('exportar_lancamentos'), {'de': '202513'})
+
+        assert resp.streaming
+        linhas = b"".join(resp.streaming_content).decode().splitlines()
+        assert linhas[0] == "id,descricao,valor,competencia,competencia_formatada"
+        assert [l.split(",")[3:] for l in linhas[1:]] == [
+            ["202513", "13/2025"],
+            ["202601", "01/2026"],
+        ]
+
+    def test_view_jsonl_com_intervalo(self, client, ledger):
+        resp = client.get(reverse('exportar_lancamentos'),
+                          {'formato': 'jsonl', 'de': '12/2025', 'ate': '13/2025'})
+
+        registros = [json.loads(l) for l in b"".join(resp.streaming_content).splitlines()]
+        assert [r['competencia'] for r in registros] == [202512, 202513]
+        assert registros[0]['valor'] == "10.50"
+
+    def test_view_intervalo_invalido(self, client):
+        resp = client.get(reverse('exportar_lancamentos'), {'de': '14/2025'})
+        assert resp.status_code == 400
+
+    def test_comando(self, ledger, tmp_path):
+        destino = tmp_path / "saida.csv"
+        call_command('exportar_lancamentos', '--ate', '202513', '--saida', str(destino), stdout=StringIO())
+
+        linhas = destino.read_text(encoding='utf-8').splitlines()
+        assert len(linhas) == 3
+        assert linhas[-1].endswith("202513,13/2025")
@@ -0,0 +1,222 @@
+import json
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.urls import reverse
+
+from financeiro import exportacao, fechamento
+from financeiro.forms import LancamentoForm
+from financeiro.models import (
+    Competencia, CompetenciaFechada, Lancamento, LancamentoArquivado, ResumoCompetencia, VersaoLedger,
+)
+from financeiro.relatorios import saldos_por_competencia
+
+
+@pytest.fixture
+def ledger(db):
+    return {
+        descricao: Lancamento.objects.create(descricao=descricao, valor=valor, competencia=comp).pk
+        for descricao, valor, comp in [
+            ("A", 10, 202512), ("B", 5, 202513), ("C", 1, 202513), ("D", 2, 202601),
+        ]
+    }
+
+
+def _fechar_com_lancamento_tardio(competencia):
+    """fechar() com outra sessão gravando R$ 7,00 na competência entre o INSERT ... SELECT e o DELETE."""
+    tabela_arquivo = LancamentoArquivado._meta.db_table
+
+    def gravar_outro_depois_da_copia(execute, sql, params, many, context):
+        resultado = execute(sql, params, many, context)
+        if sql.startswith(f'INSERT INTO "{tabela_arquivo}"'):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO "{Lancamento._meta.db_table}" (descricao, valor, competencia) '
+                    f"VALUES ('Tardio', 700, {competencia})"
+                )
+        return resultado
+
+    with connection.execute_wrapper(gravar_outro_depois_da_copia):
+        return fechamento.fechar(competencia)
+
+
+@pytest.mark.django_db
+class TestFecharCompetencia:
+
+    def test_move_para_o_arquivo_com_os_mesmos_ids(self, ledger):
+        versao = VersaoLedger.atual().versao
+        resumo_antes = list(ResumoCompetencia.objects.values_list('competencia', 'total', 'quantidade'))
+
+        fechada = fechamento.fechar('13/2025')
+
+        assert (fechada.quantidade, fechada.total) == (2, Decimal("6.00"))
+        assert not Lancamento.objects.filter(competencia=202513).exists()
+        assert sorted(LancamentoArquivado.objects.values_list('id', flat=True)) == sorted([ledger["B"], ledger["C"]])
+        # O período continua no ledger: o resumo não muda
+        assert list(ResumoCompetencia.objects.values_list('competencia', 'total', 'quantidade')) == resumo_antes
+        assert VersaoLedger.atual().versao > versao
+
+        ResumoCompetencia.reconstruir()
+        assert list(ResumoCompetencia.objects.values_list('competencia', 'total', 'quantidade')) == resumo_antes
+
+    def test_lancamento_gravado_durante_a_copia_nao_se_perde(self, ledger):
+        fechada = _fechar_com_lancamento_tardio(202513)
+
+        assert (fechada.quantidade, fechada.total) == (2, Decimal("6.00"))
+        assert LancamentoArquivado.objects.filter(competencia=202513).count() == 2
+        assert list(Lancamento.objects.filter(competencia=202513).values_list('descricao', flat=True)) == ["Tardio"]
+        assert CompetenciaFechada.objects.get().quantidade == 2
+
+    @pytest.mark.parametrize('usar_janelas', [True, False])
+    def test_resumo_e_relatorio_com_lancamento_tardio(self, ledger, usar_janelas):
+        """A competência fechada com linhas nas duas tabelas conta uma vez só"""
+        _fechar_com_lancamento_tardio(202513)
+
+        ResumoCompetencia.reconstruir()
+        resumo = ResumoCompetencia.objects.get(competencia=202513)
+        assert (resumo.quantidade, resumo.total) == (3, Decimal("13.00"))
+
+        saldos = saldos_por_competencia(usar_janelas=usar_janelas)
+        assert [(s['competencia'].as_int, s['total'], s['quantidade']) for s in saldos] == [
+            (202512, Decimal("10"), 1), (202513, Decimal("13"), 3), (202601, Decimal("2"), 1),
+        ]
+        assert saldos[-1]['acumulado'] == Decimal("25")
+
+    def test_fechar_duas_vezes(self, ledger):
+        fechamento.fechar(202513)
+        with pytest.raises(ValueError, match="já está fechada"):
+            fechamento.fechar(202513)
+
+    def test_reabrir(self, ledger):
+        fechamento.fechar(202513)
+        assert fechamento.reabrir(202513) == 2
+        assert Lancamento.objects.filter(competencia=202513).count() == 2
+        assert not LancamentoArquivado.objects.exists()
+        assert not CompetenciaFechada.objects.exists()
+        with pytest.raises(ValueError, match="não está fechada"):
+            fechamento.reabrir(202513)
+
+
+@pytest.mark.django_db
+class TestLeituraUnificada:
+
+    def test_quentes_e_arquivados(self, ledger):
+        fechamento.fechar(202513)
+
+        linhas = list(fechamento.lancamentos())
+
+        assert [(l['descricao'], l['arquivado']) for l in linhas] == [
+            ("D", False), ("C", True), ("B", True), ("A", False),
+        ]
+        assert linhas[1]['competencia'].as_int == 202513
+        assert fechamento.obter(ledger["B"]).descricao == "B"
+        with pytest.raises(Lancamento.DoesNotExist):
+            fechamento.obter(10**9)
+
+    def test_faixa_sem_fechadas_le_so_a_tabela_quente(self, ledger, django_assert_num_queries):
+        fechamento.fechar(202513)
+        with django_assert_num_queries(2) as contexto:
+            linhas = list(fechamento.lancamentos(de=202601))
+        assert [l['descricao'] for l in linhas] == ["D"]
+        assert LancamentoArquivado._meta.db_table not in contexto.captured_queries[-1]['sql']
+
+    def test_exportacao_e_relatorio_incluem_arquivados(self, ledger):
+        fechamento.fechar(202513)
+
+        assert [r[1] for r in exportacao.registros()] == ["A", "B", "C", "D"]
+        totais = {l['competencia'].as_int: l['total'] for l in saldos_por_competencia()}
+        assert totais == {202512: Decimal("10"), 202513: Decimal("6"), 202601: Decimal("2")}
+
+    def test_relatorio_de_saldos_inclui_arquivados(self, client, ledger):
+        fechamento.fechar(202513)
+
+        saldos = client.get(reverse('relatorio_saldos'), {'de': '13/2025'}).json()['saldos']
+
+        assert [(s['competencia'], s['acumulado']) for s in saldos] == [(202513, "6.00"), (202601, "8.00")]
+
+    def test_api_lista_arquivados_na_ordem_keyset(self, client, ledger):
+        fechamento.fechar(202513)
+        url = reverse('api_lancamentos')
+
+        primeira = client.get(url, {'limite': 2}).json()
+        segunda = client.get(url, {'limite': 2, 'cursor': primeira['proximo_cursor']}).json()
+
+        assert [(r['descricao'], r['arquivado']) for r in primeira['resultados']] == [("D", False), ("C", True)]
+        assert [(r['descricao'], r['arquivado']) for r in segunda['resultados']] == [("B", True), ("A", False)]
+        assert segunda['proximo_cursor'] is None
+
+    def test_api_le_arquivado_e_recusa_alteracao(self, client, ledger):
+        fechamento.fechar(202513)
+        url = reverse('api_lancamento', args=[ledger["B"]])
+
+        assert client.get(url).json()['descricao'] == "B"
+        resp = client.patch(url, data=json.dumps({'descricao': 'Y'}), content_type='application/json')
+        assert resp.status_code == 409
+        assert LancamentoArquivado.objects.get(pk=ledger["B"]).descricao == "B"
+
+
+@pytest.mark.django_db
+class TestGravacaoEmCompetenciaFechada:
+
+    def test_form_recusa(self, ledger):
+        fechamento.fechar(202513)
+        form = LancamentoForm(data={
+            'descricao': 'X', 'valor': '1.00', 'competencia_0': '13', 'competencia_1': '2025',
+        })
+        assert not form.is_valid()
+        assert "está fechada" in form.errors['competencia'][0]
+
+    def test_modelo_recusa_save_e_bulk_create(self, ledger):
+        fechamento.fechar(202513)
+        with pytest.raises(ValidationError, match="está fechada"):
+            Lancamento.objects.create(descricao='X', valor=1, competencia=202513)
+        with pytest.raises(ValidationError, match="está fechada"):
+            Lancamento.objects.bulk_create([
+                Lancamento(descricao='Y', valor=1, competencia=Competencia(2026, 1)),
+                Lancamento(descricao='Z', valor=1, competencia=Competencia(2025, 13)),
+            ])
+        assert Lancamento.objects.count() == 2
+
+    def test_admin_recusa(self, admin_client, ledger):
+        fechamento.fechar(202513)
+        resp = admin_client.post(reverse('admin:financeiro_lancamento_add'), {
+            'descricao': 'X', 'valor': '1.00', 'competencia_0': '13', 'competencia_1': '2025',
+        })
+        assert resp.status_code == 200
+        assert "está fechada" in resp.content.decode()
+        assert Lancamento.objects.count() == 2
+
+    def test_view_recusa(self, client, ledger):
+        fechamento.fechar(202513)
+        resp = client.post(reverse('criar_lancamento'), {
+            'descricao': 'X', 'valor': '1.00', 'competencia_0': '13', 'competencia_1': '2025',
+        })
+        assert resp.status_code == 200
+        assert Lancamento.objects.count() == 2
+
+    def test_api_recusa(self, client, ledger):
+        fechamento.fechar(202513)
+        resp = client.post(reverse('api_lancamentos'), data=json.dumps(
+            {'descricao': 'API', 'valor': '1', 'competencia': 202513}), content_type='application/json')
+        assert resp.status_code == 400
+        assert "está fechada" in resp.json()['erros']['competencia']
+
+
+@pytest.mark.django_db
+def test_comando_fecha_ate_e_relata(ledger):
+    saida = StringIO()
+    call_command('fechar_competencia', '--ate', '13/2025', '--relatorio', stdout=saida)
+
+    texto = saida.getvalue()
+    assert "12/2025: fechada, 1 lançamento(s) arquivado(s)." in texto
+    assert "13/2025: fechada, 2 lançamento(s) arquivado(s)." in texto
+    relatorio = json.loads(texto[texto.index('{'):])
+    assert relatorio['antes']['tabelas']['quente']['linhas'] == 4
+    assert relatorio['depois']['tabelas']['quente']['linhas'] == 1
+    assert relatorio['depois']['tabelas']['arquivo']['linhas'] == 3
+    assert relatorio['depois']['fechadas'] == [202512, 202513]
+    assert set(relatorio['depois']['consultas_ms']) == {'contagem', 'primeira_pagina', 'totais_por_competencia'}
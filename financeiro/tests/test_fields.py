@@ -0,0 +1,41 @@
+import pytest
+from django.core.cache import cache
+from financeiro.fields import CompetenciaWidget
+from financeiro.models import Competencia
+
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestCompetenciaWidgetCache:
+
+    def test_render_completo(self):
+        html = CompetenciaWidget().render('competencia', Competencia(2025, 13), {'id': 'id_competencia'})
+
+        assert '<div id="wrapper_id_competencia">' in html
+        assert 'id="modal_id_competencia"' in html
+        assert '<option value="13" selected>13º Salário</option>' in html
+        assert 'name="competencia_1" value="2025"' in html
+
+    def test_valores_por_campo_com_cache_quente(self):
+        """O fragmento vem do cache, mas mês e ano refletem o valor atual"""
+        widget = CompetenciaWidget()
+        widget.render('competencia', Competencia(2025, 13), {'id': 'id_competencia'})
+        html = widget.render('competencia', Competencia(2026, 2), {'id': 'id_competencia'})
+
+        assert '<option value="2" selected>Fevereiro</option>' in html
+        assert '<option value="13" selected>' not in html
+        assert 'value="2026"' in html
+
+    def test_fragmento_estatico_por_id(self):
+        html = CompetenciaWidget().render('outro', None, {'id': 'id_outro'})
+        assert 'id="modal_id_outro"' in html
+        assert 'modal_id_competencia' not in html
+
+    def test_render_sem_attrs(self):
+        html = CompetenciaWidget().render('competencia', 202501)
+        assert '<div id="wrapper_id_competencia">' in html
@@ -0,0 +1,76 @@
+import csv
+import json
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from financeiro.models import Lancamento, ResumoCompetencia
+
+
+@pytest.mark.django_db
+class TestImportarLancamentos:
+
+    def _importar(self, arquivo, *args):
+        saida = StringIO()
+        call_command('importar_lancamentos', str(arquivo), *args, stdout=saida)
+        return saida.getvalue()
+
+    def test_csv_com_formatos_de_competencia(self, tmp_path):
+        """Aceita AAAAMM e MM/AAAA e grava em lotes"""
+        arquivo = tmp_path / "lanc.csv"
+        arquivo.write_text(
+            "descricao,valor,competencia\n"
+            "Salário,100.50,202513\n"
+            "Aluguel,\"20,00\",01/2026\n"
+            "Bônus,5,202512\n",
+            encoding='utf-8',
+        )
+
+        saida = self._importar(arquivo, '--lote', '2')
+
+        assert "3 lançamento(s) importado(s), 0 rejeitado(s)" in saida
+        assert sorted(c.as_int for c in Lancamento.objects.values_list('competencia', flat=True)) == [
+            202512, 202513, 202601,
+        ]
+        # O resumo acompanha o bulk_create
+        assert ResumoCompetencia.objects.get(competencia=202513).total == Decimal("100.50")
+
+    def test_csv_com_bom_e_valores_formatados(self, tmp_path):
+        arquivo = tmp_path / "planilha.csv"
+        arquivo.write_text(
+            "\ufeffdescricao,valor,competencia\n"
+            "Milhar,\"1.234,56\",202501\n"
+            "Reais,\"R$ 10,00\",202501\n"
+            "Três casas,1.005,202501\n",
+            encoding='utf-8',
+        )
+
+        saida = self._importar(arquivo)
+
+        assert "2 lançamento(s) importado(s), 1 rejeitado(s)" in saida
+        assert sorted(Lancamento.objects.values_list('valor', flat=True)) == [Decimal("10.00"), Decimal("1234.56")]
+        rejeitados = (tmp_path / "planilha.csv.rejeitados.csv").read_text(encoding='utf-8')
+        assert "Valor inválido: '1.005'" in rejeitados
+
+    def test_jsonl_rejeita_linhas_invalidas(self, tmp_path):
+        arquivo = tmp_path / "lanc.jsonl"
+        linhas = [
+            json.dumps({'descricao': 'OK', 'valor': '1', 'competencia': 202501}),
+            json.dumps({'descricao': 'Antigo', 'valor': '1', 'competencia': 201901}),
+            json.dumps({'descricao': 'Mês 14', 'valor': '1', 'competencia': '14/2025'}),
+            '{quebrado',
+            json.dumps({'descricao': '', 'valor': '1', 'competencia': 202501}),
+        ]
+        arquivo.write_text("\n".join(linhas) + "\n", encoding='utf-8')
+        rejeitados = tmp_path / "rej.csv"
+
+        saida = self._importar(arquivo, '--rejeitados', str(rejeitados))
+
+        assert "1 lançamento(s) importado(s), 4 rejeitado(s)" in saida
+        assert Lancamento.objects.count() == 1
+
+        with open(rejeitados, newline='', encoding='utf-8') as f:
+            linhas_rejeitadas = list(csv.DictReader(f))
+        assert [r['linha'] for r in linhas_rejeitadas] == ['2', '3', '4', '5']
+        assert "anteriores a 2020" in linhas_rejeitadas[0]['erro']
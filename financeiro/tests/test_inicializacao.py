@@ -0,0 +1,77 @@
+"""
+Inicialização de comandos e workers: django.setup() (e os próprios
+comandos) não devem carregar form fields, widgets, views nem NumPy, que
+só são usados ao atender requisições ou com o cache colunar ligado.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[2]
+
+COMANDOS = (
+    'financeiro.management.commands.importar_lancamentos',
+    'financeiro.management.commands.exportar_lancamentos',
+    'financeiro.management.commands.fechar_competencia',
+    'financeiro.management.commands.reprocessar_lancamentos',
+)
+PREGUICOSOS = (
+    'financeiro.fields',
+    'financeiro.forms',
+    'financeiro.views',
+    'financeiro.api',
+    'financeiro.colunar',
+    'numpy',
+)
+# Soma do tempo próprio (-X importtime) dos módulos do financeiro, em µs.
+# Folgado de propósito: pega regressões grosseiras (um import pesado no
+# topo de um módulo), não variações da máquina.
+ORCAMENTO_FINANCEIRO_US = 50_000
+
+
+def _rodar(codigo, *opcoes):
+    ambiente = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'core.settings', 'PYTHONPATH': str(RAIZ)}
+    return subprocess.run(
+        [sys.executable, *opcoes, '-c', codigo],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True, check=True,
+    )
+
+
+def _inicializar(preguicosos=PREGUICOSOS):
+    return (
+        "import json, sys, django\n"
+        "django.setup()\n"
+        + "".join(f"import {modulo}\n" for modulo in COMANDOS)
+        + f"print(json.dumps([m for m in {list(preguicosos)!r} if m in sys.modules]))\n"
+    )
+
+
+def test_setup_e_comandos_nao_carregam_modulos_preguicosos():
+    carregados = json.loads(_rodar(_inicializar()).stdout)
+    assert carregados == []
+
+
+def test_formfield_carrega_fields_sob_demanda():
+    codigo = (
+        "import sys, django\n"
+        "django.setup()\n"
+        "from financeiro.models import Lancamento\n"
+        "assert 'financeiro.fields' not in sys.modules\n"
+        "campo = Lancamento._meta.get_field('valor').formfield()\n"
+        "print(type(campo).__name__)\n"
+    )
+    assert _rodar(codigo).stdout.strip() == 'DinheiroField'
+
+
+def test_orcamento_de_importtime():
+    saida = _rodar(_inicializar(), '-X', 'importtime').stderr
+    proprio = 0
+    for linha in saida.splitlines():
+        if not linha.startswith('import time:') or '|' not in linha:
+            continue
+        tempo, _, modulo = linha[len('import time:'):].split('|')
+        if modulo.strip().startswith('financeiro') and tempo.strip().isdigit():
+            proprio += int(tempo)
+    assert 0 < proprio < ORCAMENTO_FINANCEIRO_US
@@ -0,0 +1,55 @@
+import datetime
+
+import pytest
+from financeiro.models import Competencia, Lancamento
+
+
+@pytest.fixture
+def ledger(db):
+    for comp in (202412, 202413, 202501, 202512, 202513, 202601):
+        Lancamento.objects.create(descricao=str(comp), valor=1, competencia=comp)
+
+
+def competencias(queryset):
+    return sorted(c.as_int for c in queryset.values_list('competencia', flat=True))
+
+
+class TestLookupsCompetencia:
+
+    def test_ano_inclui_mes_13(self, ledger):
+        assert competencias(Lancamento.objects.filter(competencia__ano=2025)) == [202501, 202512, 202513]
+
+    @pytest.mark.parametrize("lookup, esperado", [
+        ('gt', [202601]),
+        ('gte', [202501, 202512, 202513, 202601]),
+        ('lt', [202412, 202413]),
+        ('lte', [202412, 202413, 202501, 202512, 202513]),
+    ])
+    def test_ano_comparacoes(self, ledger, lookup, esperado):
+        qs = Lancamento.objects.filter(**{f'competencia__ano__{lookup}': 2025})
+        assert competencias(qs) == esperado
+
+    def test_ano_compila_para_intervalo_na_coluna(self, ledger):
+        """Sem divisão por linha: o WHERE compara a coluna crua"""
+        sql = str(Lancamento.objects.filter(competencia__ano=2025).query)
+        assert '"competencia" BETWEEN 202500 AND 202599' in sql
+        assert '/ 100' not in sql
+
+    def test_ano_em_annotate(self, ledger):
+        anos = Lancamento.objects.values_list('competencia__ano', flat=True).distinct()
+        assert sorted(anos) == [2024, 2025, 2026]
+
+    def test_between_aceita_formatos_mistos(self, ledger):
+        qs = Lancamento.objects.filter(competencia__between=('13/2024', Competencia(2025, 12)))
+        assert competencias(qs) == [202413, 202501, 202512]
+
+    def test_ultimos(self, ledger, monkeypatch):
+        class DataFixa(datetime.date):
+            @classmethod
+            def today(cls):
+                return cls(2026, 1, 15)
+
+        monkeypatch.setattr('financeiro.models.datetime.date', DataFixa)
+        # 01/2026 e os dois períodos anteriores: 13/2025 e 12/2025
+        qs = Lancamento.objects.filter(competencia__ultimos=3)
+        assert competencias(qs) == [202512, 202513, 202601]
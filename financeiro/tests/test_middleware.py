@@ -0,0 +1,79 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from financeiro.middleware import metricas
+from financeiro.models import Lancamento
+
+
+@pytest.fixture(autouse=True)
+def instrumentacao(settings):
+    settings.INSTRUMENTACAO_SERVER_TIMING = True
+    settings.INSTRUMENTACAO_AMOSTRAGEM = 1.0
+    settings.METRICAS_ATIVAS = True
+    # Mede o caminho completo da lista (sem páginas vindas do cache)
+    settings.LISTA_CACHE_TTL = 0
+    metricas.limpar()
+    yield
+    metricas.limpar()
+
+
+@pytest.mark.django_db
+class TestInstrumentacaoMiddleware:
+
+    def test_server_timing_na_lista(self, client):
+        resp = client.get(reverse('lista_lancamentos'))
+
+        header = resp['Server-Timing']
+        assert header.startswith('db;dur=')
+        # Versão do ledger + página
+        assert 'desc="2 queries"' in header
+        assert 'template;dur=' in header
+        assert 'total;dur=' in header
+
+    def test_tempo_de_validacao_do_form(self, client):
+        resp = client.post(reverse('criar_lancamento'), {
+            'descricao': 'X', 'valor': '1.00', 'competencia_0': '13', 'competencia_1': '2025',
+        })
+        assert resp.status_code == 302
+        assert 'form;dur=' in resp['Server-Timing']
+
+    def test_metricas_prometheus_por_url(self, client):
+        client.get(reverse('lista_lancamentos'))
+        client.get(reverse('lista_lancamentos'))
+
+        texto = client.get(reverse('metricas')).content.decode()
+
+        assert 'financeiro_requisicoes_total{url="lista_lancamentos"} 2' in texto
+        assert 'financeiro_tempo_segundos_count{url="lista_lancamentos",etapa="db"} 2' in texto
+
+    def test_metricas_somente_local(self, client):
+        resp = client.get(reverse('metricas'), REMOTE_ADDR='10.0.0.5')
+        assert resp.status_code == 403
+
+    def test_metricas_desligadas(self, client, settings):
+        settings.METRICAS_ATIVAS = False
+        assert client.get(reverse('metricas')).status_code == 404
+
+    def test_streaming_mede_ate_o_fim_do_corpo(self, client):
+        Lancamento.objects.create(descricao="A", valor=1, competencia=202501)
+
+        resp = client.get(reverse('exportar_lancamentos'))
+        assert 'Server-Timing' not in resp
+        assert 'exportar_lancamentos' not in metricas.como_prometheus()
+
+        b"".join(resp.streaming_content)
+        resp.close()
+        texto = metricas.como_prometheus()
+        assert 'financeiro_requisicoes_total{url="exportar_lancamentos"} 1' in texto
+        assert 'financeiro_queries_total{url="exportar_lancamentos"} 0' not in texto
+
+    def test_amostragem_zero_nao_mede(self, client, settings):
+        settings.INSTRUMENTACAO_AMOSTRAGEM = 0.0
+        resp = client.get(reverse('lista_lancamentos'))
+
+        assert 'Server-Timing' not in resp
+        assert 'lista_lancamentos' not in metricas.como_prometheus()
+
+    def test_conta_queries_do_orm_async(self, async_client):
+        resp = async_to_sync(async_client.get)(reverse('lista_lancamentos_async'))
+        assert 'desc="2 queries"' in resp['Server-Timing']
@@ -1,6 +1,7 @@
 import pytest
+from decimal import Decimal
 from django.core.exceptions import ValidationError
-from financeiro.models import Lancamento, Competencia
+from financeiro.models import Lancamento, Competencia, ResumoCompetencia, VersaoLedger
 from financeiro.forms import LancamentoForm
 
 @pytest.mark.django_db
@@ -77,4 +78,82 @@ class TestLancamentoFormValidators:
         }
         form = LancamentoForm(data=data)
         assert not form.is_valid()
-        assert "está muito no futuro" in form.errors['competencia'][0]
\ No newline at end of file
+        assert "está muito no futuro" in form.errors['competencia'][0]
+
+@pytest.mark.django_db
+class TestResumoCompetencia:
+
+    def _resumo(self, competencia):
+        return ResumoCompetencia.objects.filter(competencia=competencia).first()
+
+    def test_insercao_atualiza_resumo(self):
+        """Cada lançamento criado soma no resumo da sua competência"""
+        Lancamento.objects.create(descricao="A", valor=10, competencia=202513)
+        Lancamento.objects.create(descricao="B", valor="2.50", competencia=202513)
+
+        resumo = self._resumo(202513)
+        assert resumo.quantidade == 2
+        assert resumo.total == Decimal("12.50")
+
+    def test_edicao_move_valor_entre_competencias(self):
+        """Mudar a competência tira do período antigo e soma no novo"""
+        lanc = Lancamento.objects.create(descricao="A", valor=10, competencia=202512)
+        lanc.competencia = Competencia(2025, 13)
+        lanc.valor = Decimal("7.00")
+        lanc.save()
+
+        assert self._resumo(202512) is None
+        assert self._resumo(202513).total == Decimal("7.00")
+
+    def test_exclusao_subtrai(self):
+        a = Lancamento.objects.create(descricao="A", valor=10, competencia=202501)
+        Lancamento.objects.create(descricao="B", valor=5, competencia=202501)
+        a.delete()
+
+        resumo = self._resumo(202501)
+        assert resumo.quantidade == 1
+        assert resumo.total == Decimal("5.00")
+
+    def test_reconstruir_apos_bulk_create(self):
+        """bulk_create não dispara signals; reconstruir() corrige o resumo"""
+        Lancamento.objects.bulk_create([
+            Lancamento(descricao="A", valor=1, competencia=202501),
+            Lancamento(descricao="B", valor=2, competencia=202501),
+        ])
+        assert self._resumo(202501) is None
+
+        ResumoCompetencia.reconstruir()
+        assert self._resumo(202501).total == Decimal("3.00")
+
+    def test_delta_em_competencia_nova_e_upsert(self):
+        ResumoCompetencia.aplicar_delta(202601, Decimal("1.50"), 1)
+        ResumoCompetencia.aplicar_delta(202601, Decimal("2.00"), 1)
+        ResumoCompetencia.aplicar_delta(202601, Decimal("-1.50"), -1)
+
+        resumo = self._resumo(202601)
+        assert (resumo.quantidade, resumo.total) == (1, Decimal("2.00"))
+
+    def test_falha_no_signal_desfaz_a_gravacao(self, monkeypatch):
+        """Lançamento e resumo são gravados juntos ou nenhum dos dois"""
+        def falhar():
+            raise RuntimeError("falha no signal")
+        monkeypatch.setattr(VersaoLedger, 'incrementar', falhar)
+
+        with pytest.raises(RuntimeError):
+            Lancamento.objects.create(descricao="A", valor=10, competencia=202501)
+
+        assert not Lancamento.objects.exists()
+        assert self._resumo(202501) is None
+
+    def test_exclusao_com_resumo_fora_de_sincronia(self):
+        """Sem a linha do resumo (bulk_create sem reconstruir), a competência é recalculada"""
+        a, _ = Lancamento.objects.bulk_create([
+            Lancamento(descricao="A", valor=10, competencia=Competencia(2025, 1)),
+            Lancamento(descricao="B", valor=5, competencia=Competencia(2025, 1)),
+        ])
+        assert self._resumo(202501) is None
+
+        Lancamento.objects.get(pk=a.pk).delete()
+
+        resumo = self._resumo(202501)
+        assert (resumo.quantidade, resumo.total) == (1, Decimal("5.00"))
@@ -0,0 +1,46 @@
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from financeiro.models import Lancamento
+from financeiro.relatorios import saldos_por_competencia
+
+
+@pytest.fixture
+def ledger(db):
+    for comp, valor in [(202512, "10.10"), (202512, "5.00"), (202513, "2.25"),
+                        (202601, "-3.00"), (202603, "1.00")]:
+        Lancamento.objects.create(descricao=str(comp), valor=valor, competencia=comp)
+
+
+@pytest.mark.parametrize("usar_janelas", [True, False], ids=["janelas", "uma_passada"])
+class TestSaldosPorCompetencia:
+
+    def test_acumulados_e_variacao(self, ledger, usar_janelas):
+        linhas = saldos_por_competencia(usar_janelas=usar_janelas)
+
+        assert [l['competencia'].as_int for l in linhas] == [202512, 202513, 202601, 202603]
+        assert [l['total'] for l in linhas] == [Decimal(v) for v in ("15.10", "2.25", "-3.00", "1.00")]
+        assert [l['quantidade'] for l in linhas] == [2, 1, 1, 1]
+        assert [l['acumulado'] for l in linhas] == [Decimal(v) for v in ("15.10", "17.35", "14.35", "15.35")]
+        # O acumulado do ano reinicia em 01/2026 (depois do 13º)
+        assert [l['acumulado_ano'] for l in linhas] == [Decimal(v) for v in ("15.10", "17.35", "-3.00", "-2.00")]
+        # 13/2025 -> 01/2026 são consecutivos; 02/2026 não tem lançamentos, então conta como 0
+        assert [l['variacao'] for l in linhas] == [Decimal(v) for v in ("15.10", "-12.85", "-5.25", "1.00")]
+
+    def test_queryset_filtrado(self, ledger, usar_janelas):
+        queryset = Lancamento.objects.filter(competencia__ano=2026)
+        linhas = saldos_por_competencia(queryset, usar_janelas=usar_janelas)
+        assert [l['acumulado'] for l in linhas] == [Decimal("-3.00"), Decimal("-2.00")]
+
+    def test_uma_query(self, ledger, usar_janelas, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            saldos_por_competencia(usar_janelas=usar_janelas)
+
+
+@pytest.mark.django_db
+def test_view_relatorio_saldos(client, ledger):
+    dados = client.get(reverse('relatorio_saldos'), {'de': '13/2025', 'ate': '202601'}).json()
+
+    assert [l['formatada'] for l in dados['saldos']] == ["13/2025", "01/2026"]
+    assert dados['saldos'][1]['acumulado'] == "-0.75"
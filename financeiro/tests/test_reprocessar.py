@@ -0,0 +1,100 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from financeiro.models import Competencia, Lancamento, ResumoCompetencia
+from financeiro.reprocessamento import TRANSFORMACOES, faixas, processar_faixa, reprocessar
+
+
+@pytest.mark.django_db
+class TestReprocessarLancamentos:
+
+    def _reprocessar(self, *args):
+        saida = StringIO()
+        # workers=0: o banco de teste (SQLite em memória) não é visível em outros processos
+        call_command('reprocessar_lancamentos', '--workers', '0', '--hoje', '2026-01-15', *args, stdout=saida)
+        return saida.getvalue()
+
+    def _criar(self, *competencias):
+        criados = Lancamento.objects.bulk_create(
+            Lancamento(descricao=f"L{i}", valor=10, competencia=Competencia.from_int(c))
+            for i, c in enumerate(competencias)
+        )
+        ResumoCompetencia.reconstruir()
+        return criados
+
+    def test_reescreve_em_faixas_e_mantem_resumo(self):
+        self._criar(202513, 202512, 202413, 201913, 202501)
+
+        saida = self._reprocessar('--transformacao', 'decimo-terceiro-para-dezembro', '--faixa', '2', '--lote', '1')
+
+        assert "5 lançamento(s) lido(s), 2 alterado(s), 1 inválido(s) em 3 faixa(s)" in saida
+        assert "anteriores a 2020" in saida
+        assert sorted(c.as_int for c in Lancamento.objects.values_list('competencia', flat=True)) == [
+            201913, 202412, 202501, 202512, 202512,
+        ]
+        resumo = {r.competencia.as_int: r.quantidade for r in ResumoCompetencia.objects.all()}
+        assert resumo == {201913: 1, 202412: 1, 202501: 1, 202512: 2}
+
+    def test_simular_nao_grava(self):
+        self._criar(202513)
+        saida = self._reprocessar('--transformacao', 'decimo-terceiro-para-dezembro', '--simular')
+        assert "1 seriam alterado(s)" in saida
+        assert Lancamento.objects.get().competencia.as_int == 202513
+
+    def test_faixas_alinhadas(self):
+        lancamentos = self._criar(202501, 202501, 202501, 202501, 202501)
+        antes = faixas(4)
+        assert all(inicio % 4 == 0 for inicio, _ in antes)
+
+        # Sem o menor pk, as faixas que sobram são as mesmas
+        lancamentos[0].delete()
+        assert set(faixas(4)) <= set(antes)
+
+    def test_retoma_do_checkpoint(self, tmp_path):
+        lancamentos = self._criar(202513, 202513, 202513, 202513)
+        concluida = faixas(2)[0]
+        ja_feitos = [l.pk for l in lancamentos if concluida[0] <= l.pk < concluida[1]]
+        # Simula a primeira faixa já processada por uma execução anterior
+        Lancamento.objects.filter(pk__in=ja_feitos).update(competencia=202512)
+        checkpoint = tmp_path / "progresso.json"
+        checkpoint.write_text(json.dumps({
+            'parametros': {'transformacao': 'decimo-terceiro-para-dezembro', 'faixa': 2, 'simular': False},
+            'hoje': '2026-01-15',
+            'concluidas': [list(concluida)],
+            'totais': {'lidos': len(ja_feitos), 'alterados': len(ja_feitos), 'invalidos': 0},
+        }), encoding='utf-8')
+
+        saida = self._reprocessar(
+            '--transformacao', 'decimo-terceiro-para-dezembro', '--faixa', '2', '--checkpoint', str(checkpoint),
+        )
+
+        # A primeira faixa já constava como concluída e não foi reprocessada
+        assert "4 lançamento(s) lido(s), 4 alterado(s)" in saida
+        assert set(Lancamento.objects.values_list('competencia', flat=True)) == {Competencia(2025, 12)}
+        dados = json.loads(checkpoint.read_text(encoding='utf-8'))
+        assert dados['concluidas'] == [list(f) for f in faixas(2)]
+
+    def test_transformacao_nao_idempotente(self, monkeypatch):
+        self._criar(202501, 202505)
+        monkeypatch.setitem(TRANSFORMACOES, 'maio-vira-junho', lambda c: c.proxima if c.mes >= 5 else c)
+
+        # Antes de qualquer gravação, pelas competências do resumo
+        with pytest.raises(ValueError, match="Nada foi gravado"):
+            reprocessar('maio-vira-junho', workers=0, hoje='2026-01-15')
+        # Na faixa, lançamento a lançamento
+        with pytest.raises(ValueError, match="não é idempotente"):
+            processar_faixa(0, 10**9, 'maio-vira-junho', lote=1, hoje='2026-01-15')
+        assert sorted(c.as_int for c in Lancamento.objects.values_list('competencia', flat=True)) == [202501, 202505]
+
+    def test_checkpoint_de_outra_execucao(self, tmp_path):
+        self._criar(202501)
+        checkpoint = tmp_path / "progresso.json"
+        self._reprocessar('--checkpoint', str(checkpoint))
+        with pytest.raises(CommandError, match="outra execução"):
+            self._reprocessar('--checkpoint', str(checkpoint), '--faixa', '7')
+        # --reiniciar descarta o checkpoint antigo
+        assert "1 lançamento(s) lido(s)" in self._reprocessar('--checkpoint', str(checkpoint), '--faixa', '7', '--reiniciar')
@@ -0,0 +1,85 @@
+import datetime
+
+import pytest
+from django.core.exceptions import ValidationError
+from financeiro import calendarios, validators
+from financeiro.fields import CompetenciaField
+from financeiro.models import Competencia
+from financeiro.validators import ValidadorCompetencia, validar_lote
+
+HOJE = datetime.date(2025, 6, 1)
+
+
+class TestValidadorCompetencia:
+
+    def test_valor_valido(self):
+        ValidadorCompetencia(hoje=HOJE)(Competencia(2025, 13))
+        ValidadorCompetencia(hoje=HOJE)(202513)
+
+    def test_reune_todos_os_erros(self):
+        """Um único ValidationError com a mensagem de cada regra violada"""
+        with pytest.raises(ValidationError) as excinfo:
+            ValidadorCompetencia(hoje=HOJE)(201914)
+        mensagens = excinfo.value.messages
+        assert len(mensagens) == 2
+        assert "anteriores a 2020" in mensagens[0]
+        assert "Mês inválido: 14" in mensagens[1]
+
+    def test_regra_de_mes_segue_o_calendario(self):
+        fiscal = calendarios.Calendario('fiscal-validador', [f"P{i}" for i in range(1, 15)])
+        campo = CompetenciaField(calendario=fiscal)
+
+        assert campo.clean(['14', '2025']).as_int == 202514
+        with pytest.raises(ValidationError, match="entre 1 e 14"):
+            ValidadorCompetencia(hoje=HOJE, calendario=fiscal)(202515)
+        # Mesmo calendário, mesma regra: os validators continuam comparáveis
+        assert ValidadorCompetencia(calendario=fiscal) == ValidadorCompetencia(calendario=fiscal)
+
+    def test_hoje_fixo(self):
+        """O limite futuro usa o "hoje" informado, não a data do sistema"""
+        assert ValidadorCompetencia(hoje=HOJE).erros(203101)
+        assert not ValidadorCompetencia(hoje=datetime.date(2026, 1, 1)).erros(203101)
+
+    def test_decodifica_uma_vez(self, monkeypatch):
+        chamadas = []
+        original = validators.decodificar
+        monkeypatch.setattr(validators, 'decodificar', lambda v: chamadas.append(v) or original(v))
+
+        ValidadorCompetencia(hoje=HOJE)(202501)
+        assert chamadas == [202501]
+
+    def test_validators_individuais_continuam_funcionando(self):
+        with pytest.raises(ValidationError):
+            validators.validar_ano_inicio(201901)
+        with pytest.raises(ValidationError):
+            validators.validar_mes_range(202514)
+        validators.validar_ano_limite_futuro(None)
+
+
+class TestValidarLote:
+
+    def test_erros_por_indice(self):
+        erros = validar_lote([202501, 201901, Competencia(2025, 13), 202514, 'abc'], hoje=HOJE)
+
+        assert sorted(erros) == [1, 3, 4]
+        assert "anteriores a 2020" in erros[1][0]
+        assert "Mês inválido" in erros[3][0]
+        assert "Competência inválida" in erros[4][0]
+
+    def test_hoje_lido_uma_vez_por_lote(self, monkeypatch):
+        leituras = []
+
+        class DataContada(datetime.date):
+            @classmethod
+            def today(cls):
+                leituras.append(1)
+                return HOJE
+
+        monkeypatch.setattr(validators.datetime, 'date', DataContada)
+        validar_lote([202501, 202502, 202503])
+        assert len(leituras) == 1
+
+    def test_array_numpy(self):
+        np = pytest.importorskip("numpy")
+        erros = validar_lote(np.array([202501, 202514, 202501], dtype=np.int32), hoje=HOJE)
+        assert list(erros) == [1]
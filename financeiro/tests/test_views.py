@@ -0,0 +1,206 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.urls import reverse
+from financeiro.lotes import gravar_lancamentos
+from financeiro.models import Lancamento
+from financeiro.views import ListaLancamentosView
+
+
+@pytest.mark.django_db
+class TestListaPaginacaoKeyset:
+
+    def _criar(self, competencias):
+        return [
+            Lancamento.objects.create(descricao=f"L{i}", valor=10, competencia=c)
+            for i, c in enumerate(competencias)
+        ]
+
+    def test_primeira_pagina_limitada(self, client, monkeypatch):
+        """A primeira página traz só itens_por_pagina e aponta para a próxima"""
+        monkeypatch.setattr(ListaLancamentosView, 'itens_por_pagina', 2)
+        self._criar([202501, 202513, 202512])
+
+        resp = client.get(reverse('lista_lancamentos'))
+
+        assert resp.status_code == 200
+        lancamentos = resp.context['lancamentos']
+        assert [l.competencia for l in lancamentos] == [202513, 202512]
+        assert resp.context['tem_proxima']
+        assert resp.context['proximo_cursor'] == f"202512.{lancamentos[1].pk}"
+
+    def test_percorre_todas_as_paginas_sem_repetir(self, client, monkeypatch):
+        """Seguir os cursores visita cada registro uma única vez, em ordem"""
+        monkeypatch.setattr(ListaLancamentosView, 'itens_por_pagina', 2)
+        # Competências repetidas forçam o desempate por id
+        criados = self._criar([202501, 202513, 202513, 202513, 202502])
+
+        vistos, cursor = [], None
+        while True:
+            params = {'cursor': cursor} if cursor else {}
+            resp = client.get(reverse('lista_lancamentos'), params)
+            vistos += [l.pk for l in resp.context['lancamentos']]
+            cursor = resp.context['proximo_cursor']
+            if not cursor:
+                break
+
+        esperado = sorted(criados, key=lambda l: (l.competencia, l.pk), reverse=True)
+        assert vistos == [l.pk for l in esperado]
+
+    def test_linhas_formatadas(self, client):
+        lanc = Lancamento.objects.create(descricao="Salário <13º>", valor="1234.5", competencia=202513)
+
+        resp = client.get(reverse('lista_lancamentos'))
+
+        assert resp.context['linhas'] == [{
+            'descricao': "Salário <13º>",
+            'valor': "R$ 1.234,50",
+            'competencia': "13/2025",
+            'competencia_banco': 202513,
+            'url_editar': reverse('editar_lancamento', args=[lanc.pk]),
+        }]
+        html = resp.content.decode()
+        assert "<td>Salário &lt;13º&gt;</td>" in html
+        assert f'href="{reverse("editar_lancamento", args=[lanc.pk])}"' in html
+
+    def test_cursor_invalido(self, client):
+        resp = client.get(reverse('lista_lancamentos'), {'cursor': 'abc'})
+        assert resp.status_code == 404
+
+
+@pytest.mark.django_db
+class TestListaCondicional:
+    """ETag/Last-Modified pela VersaoLedger e cache das páginas renderizadas."""
+
+    @pytest.fixture(autouse=True)
+    def cache_limpo(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    def test_304_enquanto_o_ledger_nao_muda(self, client):
+        Lancamento.objects.create(descricao="A", valor=1, competencia=202512)
+        resp = client.get(reverse('lista_lancamentos'))
+        assert resp.status_code == 200
+        assert 'no-cache' in resp['Cache-Control']
+        etag = resp['ETag']
+
+        resp = client.get(reverse('lista_lancamentos'), HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == 304
+
+        resp = client.get(reverse('lista_lancamentos'), HTTP_IF_MODIFIED_SINCE=resp['Last-Modified'])
+        assert resp.status_code == 304
+
+        Lancamento.objects.create(descricao="B", valor=1, competencia=202513)
+        resp = client.get(reverse('lista_lancamentos'), HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == 200
+        assert resp['ETag'] != etag
+        assert [l.descricao for l in resp.context['lancamentos']] == ["B", "A"]
+
+    def test_pagina_vem_do_cache(self, client, django_assert_num_queries):
+        Lancamento.objects.create(descricao="A", valor=1, competencia=202512)
+        primeira = client.get(reverse('lista_lancamentos'))
+
+        # Só a leitura da versão; nada de query da página nem template
+        with django_assert_num_queries(1):
+            segunda = client.get(reverse('lista_lancamentos'))
+        assert segunda.content == primeira.content
+        assert segunda['ETag'] == primeira['ETag']
+
+    def test_operacoes_em_lote_mudam_a_versao(self, client):
+        etag = client.get(reverse('lista_lancamentos'))['ETag']
+        gravar_lancamentos([Lancamento(descricao="Lote", valor=1, competencia=202501)])
+
+        resp = client.get(reverse('lista_lancamentos'), HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == 200
+        assert "Lote" in resp.content.decode()
+
+    def test_async(self, async_client):
+        resp = async_to_sync(async_client.get)(reverse('lista_lancamentos_async'))
+        resp = async_to_sync(async_client.get)(reverse('lista_lancamentos_async'), headers={'if-none-match': resp['ETag']})
+        assert resp.status_code == 304
+
+
+@pytest.mark.django_db
+class TestResumoCompetenciasView:
+
+    def test_totais_por_competencia_e_ano(self, client):
+        Lancamento.objects.create(descricao="A", valor=10, competencia=202512)
+        Lancamento.objects.create(descricao="B", valor=5, competencia=202513)
+        Lancamento.objects.create(descricao="C", valor=1, competencia=202601)
+
+        dados = client.get(reverse('resumo_competencias')).json()
+
+        assert [c['competencia'] for c in dados['competencias']] == [202512, 202513, 202601]
+        assert dados['competencias'][1]['mes'] == "13º Salário"
+        assert dados['anos'] == [
+            {'ano': 2025, 'total': "15.00", 'quantidade': 2},
+            {'ano': 2026, 'total': "1.00", 'quantidade': 1},
+        ]
+
+    def test_filtro_por_ano(self, client):
+        Lancamento.objects.create(descricao="A", valor=10, competencia=202513)
+        Lancamento.objects.create(descricao="B", valor=1, competencia=202601)
+
+        dados = client.get(reverse('resumo_competencias'), {'ano': 2025}).json()
+        assert [c['competencia'] for c in dados['competencias']] == [202513]
+
+
+@pytest.mark.django_db
+class TestViewsAsync:
+    """As views async rodam pelo AsyncClient (pilha ASGI), via async_to_sync."""
+
+    def test_lista_async_pagina(self, async_client, monkeypatch):
+        monkeypatch.setattr(ListaLancamentosView, 'itens_por_pagina', 1)
+        Lancamento.objects.create(descricao="A", valor=1, competencia=202512)
+        Lancamento.objects.create(descricao="B", valor=1, competencia=202513)
+
+        resp = async_to_sync(async_client.get)(reverse('lista_lancamentos_async'))
+
+        assert resp.status_code == 200
+        assert [l.competencia for l in resp.context['lancamentos']] == [202513]
+        assert resp.context['tem_proxima']
+
+    def test_lista_async_links(self, async_client):
+        lanc = Lancamento.objects.create(descricao="A", valor=1, competencia=202512)
+
+        resp = async_to_sync(async_client.get)(reverse('lista_lancamentos_async'), {'cursor': f'202601.{lanc.pk + 1}'})
+
+        assert resp.context['linhas'][0]['url_editar'] == reverse('editar_lancamento_async', args=[lanc.pk])
+        html = resp.content.decode()
+        assert f'href="{reverse("lista_lancamentos_async")}"' in html
+        assert f'href="{reverse("criar_lancamento_async")}"' in html
+        assert f'href="{reverse("lista_lancamentos")}"' not in html
+
+    def test_criar_async(self, async_client):
+        resp = async_to_sync(async_client.post)(reverse('criar_lancamento_async'), {
+            'descricao': 'Async', 'valor': '3.00', 'competencia_0': '13', 'competencia_1': '2025',
+        })
+
+        assert resp.status_code == 302
+        assert resp['Location'] == reverse('lista_lancamentos_async')
+        assert Lancamento.objects.get(descricao='Async').competencia == 202513
+
+    def test_criar_async_invalido(self, async_client):
+        resp = async_to_sync(async_client.post)(reverse('criar_lancamento_async'), {
+            'descricao': 'Antigo', 'valor': '3.00', 'competencia_0': '1', 'competencia_1': '2019',
+        })
+        assert resp.status_code == 200
+        assert not Lancamento.objects.exists()
+
+    def test_editar_async(self, async_client):
+        lanc = Lancamento.objects.create(descricao="A", valor=1, competencia=202512)
+        url = reverse('editar_lancamento_async', args=[lanc.pk])
+
+        assert async_to_sync(async_client.get)(url).status_code == 200
+        resp = async_to_sync(async_client.post)(url, {
+            'descricao': 'A', 'valor': '1.00', 'competencia_0': '1', 'competencia_1': '2026',
+        })
+
+        assert resp.status_code == 302
+        lanc.refresh_from_db()
+        assert lanc.competencia == 202601
+
+    def test_editar_async_inexistente(self, async_client):
+        resp = async_to_sync(async_client.get)(reverse('editar_lancamento_async', args=[999]))
+        assert resp.status_code == 404
@@ -1,64 +1,162 @@
 import datetime
+from functools import lru_cache
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
+from . import calendarios
 
-def validar_ano_inicio(valor):
+
+def decodificar(valor):
     """
-    Valida se a competência não é anterior a 2020.
-    Aceita tanto int (202513) quanto objeto Competencia.
+    Extrai (ano, mes) de um objeto Competencia ou de um inteiro AAAAMM.
+    Feito uma única vez por valor, e compartilhado por todas as regras.
     """
-    if not valor:
-        return
-    
-    # CORREÇÃO: Verifica se tem a propriedade .ano, senão faz a conta
-    if hasattr(valor, 'ano'):
-        ano = valor.ano
-    else:
-        ano = int(valor) // 100
-    
+    # CORREÇÃO: Verifica se tem as propriedades .ano/.mes, senão faz a conta
+    if hasattr(valor, 'ano') and hasattr(valor, 'mes'):
+        return valor.ano, valor.mes
+    valor = int(valor)
+    return valor // 100, valor % 100
+
+
+# --- Regras: recebem o valor já decodificado e o "hoje" da validação ---
+
+def regra_ano_inicio(ano, mes, hoje):
     if ano < 2020:
         raise ValidationError(
             _('Lançamentos anteriores a 2020 não são permitidos. (Ano: %(valor)s)'),
             params={'valor': ano},
         )
 
+def regra_ano_limite_futuro(ano, mes, hoje):
+    limite = hoje.year + 5
+    if ano > limite:
+        raise ValidationError(
+            _('O ano %(valor)s está muito no futuro (Limite: %(limite)s).'),
+            params={'valor': ano, 'limite': limite},
+        )
+
+@lru_cache(maxsize=None)
+def regra_mes_range_para(calendario):
+    """
+    Regra de mês para um calendário (ver calendarios.py): 1 até o número
+    de períodos dele. Uma função por calendário, para que validators com
+    o mesmo calendário continuem iguais (__eq__).
+    """
+    periodos = calendario.periodos
+
+    def regra_mes_range(ano, mes, hoje):
+        if not (1 <= mes <= periodos):
+            raise ValidationError(
+                _('Mês inválido: %(valor)s. Deve ser entre 1 e %(limite)s.'),
+                params={'valor': mes, 'limite': periodos},
+            )
+    return regra_mes_range
+
+# A do calendário padrão (12 meses + 13º)
+regra_mes_range = regra_mes_range_para(calendarios.PADRAO)
+
+REGRAS_PADRAO = (regra_ano_inicio, regra_ano_limite_futuro, regra_mes_range)
+
+
+# --- Validators individuais (compatíveis com validators=[...] do Django) ---
+
+def validar_ano_inicio(valor):
+    """
+    Valida se a competência não é anterior a 2020.
+    Aceita tanto int (202513) quanto objeto Competencia.
+    """
+    if not valor:
+        return
+    regra_ano_inicio(*decodificar(valor), None)
+
 def validar_ano_limite_futuro(valor):
     """
     Valida se a competência não está muito no futuro (Ano atual + 5).
     """
     if not valor:
         return
-
-    # CORREÇÃO: Usa a propriedade .ano do objeto
-    if hasattr(valor, 'ano'):
-        ano = valor.ano
-    else:
-        ano = int(valor) // 100
-
-    ano_atual = datetime.date.today().year
-    limite = ano_atual + 5
-
-    if ano > limite:
-        raise ValidationError(
-            _('O ano %(valor)s está muito no futuro (Limite: %(limite)s).'),
-            params={'valor': ano, 'limite': limite},
-        )
+    regra_ano_limite_futuro(*decodificar(valor), datetime.date.today())
 
 def validar_mes_range(valor):
     """
-    Garante que o mês está entre 1 e 13.
+    Garante que o mês está entre 1 e o número de períodos do calendário
+    (o da Competencia recebida; para int, o calendário padrão).
     """
     if not valor:
         return
-        
-    # CORREÇÃO: Usa a propriedade .mes do objeto
-    if hasattr(valor, 'mes'):
-        mes = valor.mes
-    else:
-        mes = int(valor) % 100
-
-    if not (1 <= mes <= 13):
-        raise ValidationError(
-            _('Mês inválido: %(valor)s. Deve ser entre 1 e 13.'),
-            params={'valor': mes},
-        )
\ No newline at end of file
+    calendario = getattr(valor, 'calendario', calendarios.PADRAO)
+    regra_mes_range_para(calendario)(*decodificar(valor), None)
+
+
+# --- Pipeline: decodifica uma vez e roda todas as regras ---
+
+class ValidadorCompetencia:
+    """
+    Validator composto: um único decodificar() e um único "hoje" para
+    todas as regras, reunindo todos os erros num só ValidationError.
+
+    Com hoje=None, a data é lida a cada chamada (um form valida uma
+    competência por requisição). Para lotes, passe a data já fixada
+    ou use validar_lote().
+
+    Com `calendario` (objeto ou nome registrado), a regra de mês padrão
+    é trocada pela desse calendário.
+    """
+
+    def __init__(self, regras=REGRAS_PADRAO, hoje=None, calendario=None):
+        if calendario is not None:
+            regra_do_calendario = regra_mes_range_para(calendarios.obter(calendario))
+            regras = [regra_do_calendario if regra is regra_mes_range else regra for regra in regras]
+        self.regras = tuple(regras)
+        self.hoje = hoje
+
+    def erros(self, valor, hoje=None):
+        """Lista de ValidationError (vazia se o valor for válido)."""
+        if not valor:
+            return []
+        ano, mes = decodificar(valor)
+        hoje = hoje or self.hoje or datetime.date.today()
+        erros = []
+        for regra in self.regras:
+            try:
+                regra(ano, mes, hoje)
+            except ValidationError as exc:
+                erros.append(exc)
+        return erros
+
+    def __call__(self, valor):
+        erros = self.erros(valor)
+        if erros:
+            raise ValidationError(erros)
+
+    def __eq__(self, other):
+        return isinstance(other, ValidadorCompetencia) and (self.regras, self.hoje) == (other.regras, other.hoje)
+
+
+def validar_lote(valores, regras=REGRAS_PADRAO, hoje=None):
+    """
+    Valida uma sequência (ou array NumPy) de AAAAMM / Competencia.
+
+    Retorna {índice: [mensagens]} só para os inválidos. "Hoje" é lido uma
+    vez para o lote inteiro, e cada valor distinto é validado uma só vez.
+    """
+    validador = ValidadorCompetencia(regras, hoje or datetime.date.today())
+    if hasattr(valores, 'tolist'):
+        valores = valores.tolist()
+
+    por_valor = {}
+    erros = {}
+    for indice, valor in enumerate(valores):
+        try:
+            mensagens = por_valor[valor]
+        except KeyError:
+            try:
+                mensagens = [m for exc in validador.erros(valor) for m in exc.messages]
+            except (TypeError, ValueError):
+                mensagens = [str(_('Competência inválida: %(valor)s.') % {'valor': valor})]
+            por_valor[valor] = mensagens
+        except TypeError:
+            # Valor não hashable: não dá para memorizar
+            mensagens = [str(_('Competência inválida: %(valor)s.') % {'valor': valor})]
+        if mensagens:
+            erros[indice] = mensagens
+    return erros
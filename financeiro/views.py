@@ -1,9 +1,39 @@
+import time
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.conf import settings
+from django.core.cache import cache
+from django.http import (
+    Http404, HttpResponse, HttpResponseForbidden, HttpResponseRedirect, JsonResponse, StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views import View
 from django.views.generic import CreateView, ListView, UpdateView
-from django.urls import reverse_lazy
-from .models import Lancamento
+from django.urls import reverse, reverse_lazy
+from .models import Lancamento, ResumoCompetencia, VersaoLedger
+from . import exportacao, relatorios
 from .forms import LancamentoForm
+from .middleware import metricas, registrar_tempo
 
-class CriarLancamentoView(CreateView):
+class MedirValidacaoMixin:
+    """Informa à instrumentação quanto tempo o form.is_valid() levou (etapa 'form')."""
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        is_valid = form.is_valid
+
+        def is_valid_medido():
+            inicio = time.perf_counter()
+            try:
+                return is_valid()
+            finally:
+                registrar_tempo(self.request, 'form', time.perf_counter() - inicio)
+
+        form.is_valid = is_valid_medido
+        return form
+
+class CriarLancamentoView(MedirValidacaoMixin, CreateView):
     model = Lancamento
     form_class = LancamentoForm
     template_name = 'form.html'
@@ -15,12 +45,148 @@ class CriarLancamentoView(CreateView):
         return context
     
 class ListaLancamentosView(ListView):
+    """
+    Lista paginada por "keyset" (seek) em (competencia, id).
+
+    Em vez de OFFSET, cada página continua a partir do último registro da
+    anterior (cursor "AAAAMM.id" na querystring). Com o índice composto
+    do model, a página N custa o mesmo que a página 1.
+
+    Cada resposta leva ETag/Last-Modified da VersaoLedger: enquanto o
+    ledger não muda, o navegador recebe 304, e as páginas já renderizadas
+    saem do cache (chave: versão + cursor) sem query nem template.
+    """
     model = Lancamento
     template_name = 'lista.html'
     context_object_name = 'lancamentos'
-    ordering = ['-competencia']
+    ordering = ['-competencia', '-id']
+    itens_por_pagina = 50
+    cursor_kwarg = 'cursor'
+    # Nomes de URL dos links da página; a versão async aponta para as suas
+    url_lista = 'lista_lancamentos'
+    url_criar = 'criar_lancamento'
+    url_editar = 'editar_lancamento'
+
+    @staticmethod
+    def montar_cursor(lancamento):
+        """Serializa a posição de um lançamento como 'AAAAMM.id'."""
+        return f"{lancamento.competencia.as_int}.{lancamento.pk}"
+
+    @staticmethod
+    def decodificar_cursor(cursor):
+        """'AAAAMM.id' -> (competencia_int, id). ValueError se malformado."""
+        competencia, pk = cursor.split('.')
+        return int(competencia), int(pk)
+
+    @staticmethod
+    def apos_cursor(queryset, competencia, pk):
+        """Registros depois de (competencia, id) na ordem decrescente."""
+        # O filtro "<=" na coluna líder mantém a busca no índice;
+        # o OR só desempata dentro da mesma competência.
+        return queryset.filter(competencia__lte=competencia).filter(
+            Q(competencia__lt=competencia) | Q(id__lt=pk)
+        )
+
+    def ler_cursor(self):
+        """Retorna (competencia_int, id) do cursor, ou None na primeira página."""
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if not cursor:
+            return None
+        try:
+            return self.decodificar_cursor(cursor)
+        except ValueError:
+            raise Http404("Cursor de paginação inválido.")
+
+    # --- Conditional GET e cache de páginas ---
+
+    def chave_cache(self, versao):
+        return f"lista:{self.request.path}:{versao.etag}:{self.request.GET.get(self.cursor_kwarg, '')}"
+
+    @classmethod
+    def nao_modificado(cls, request, versao):
+        """Resposta 304 se o cliente já tem esta versão; senão None."""
+        resposta = get_conditional_response(
+            request, etag=quote_etag(versao.etag), last_modified=int(versao.alterado_em.timestamp()),
+        )
+        return resposta and cls.carimbar(resposta, versao)
 
-class LancamentoEditView(UpdateView):
+    @staticmethod
+    def carimbar(resposta, versao):
+        resposta['ETag'] = quote_etag(versao.etag)
+        resposta['Last-Modified'] = http_date(versao.alterado_em.timestamp())
+        # O navegador pode guardar, mas revalida a cada uso (e recebe 304)
+        patch_cache_control(resposta, no_cache=True)
+        return resposta
+
+    def responder(self, versao, conteudo, renderizar):
+        """
+        A página do cache (`conteudo`) ou a renderizada por `renderizar()`,
+        que é guardada no cache depois do render.
+        """
+        ttl = getattr(settings, 'LISTA_CACHE_TTL', 300)
+        if conteudo is not None:
+            return self.carimbar(HttpResponse(conteudo), versao)
+        resposta = renderizar()
+        if ttl:
+            chave = self.chave_cache(versao)
+            resposta.add_post_render_callback(lambda r: cache.set(chave, r.content, ttl))
+        return self.carimbar(resposta, versao)
+
+    def get(self, request, *args, **kwargs):
+        # A versão é lida antes dos dados: uma página nunca fica guardada
+        # sob uma versão mais nova que o conteúdo dela
+        versao = VersaoLedger.atual()
+        if (resposta := self.nao_modificado(request, versao)) is not None:
+            return resposta
+        conteudo = cache.get(self.chave_cache(versao)) if getattr(settings, 'LISTA_CACHE_TTL', 300) else None
+        return self.responder(versao, conteudo, lambda: super(ListaLancamentosView, self).get(request, *args, **kwargs))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        cursor = self.ler_cursor()
+        if cursor is not None:
+            queryset = self.apos_cursor(queryset, *cursor)
+        # Busca um registro a mais só para saber se existe próxima página
+        return queryset[:self.itens_por_pagina + 1]
+
+    @classmethod
+    def contexto_da_pagina(cls, lancamentos):
+        """
+        Linhas da tabela já formatadas, em dicts: o template só interpola
+        strings, sem filtros nem {% url %} por linha. A competência usa o
+        str() memorizado na instância (compartilhada pelo cache do
+        from_int). Os links saem dos nomes url_* da classe.
+        """
+        return {
+            'url_lista': reverse(cls.url_lista),
+            'url_criar': reverse(cls.url_criar),
+            'lancamentos': lancamentos,
+            'linhas': [
+                {
+                    'descricao': lancamento.descricao,
+                    'valor': str(lancamento.valor),
+                    'competencia': str(lancamento.competencia),
+                    'competencia_banco': lancamento.competencia.as_int,
+                    'url_editar': reverse(cls.url_editar, args=[lancamento.pk]),
+                }
+                for lancamento in lancamentos
+            ],
+        }
+
+    def get_context_data(self, **kwargs):
+        pagina = list(self.object_list)
+        tem_proxima = len(pagina) > self.itens_por_pagina
+        pagina = pagina[:self.itens_por_pagina]
+
+        kwargs['object_list'] = pagina
+        context = super().get_context_data(**kwargs)
+        context.update(self.contexto_da_pagina(pagina))
+        context['tem_proxima'] = tem_proxima
+        context['proximo_cursor'] = self.montar_cursor(pagina[-1]) if tem_proxima else None
+        context['e_primeira_pagina'] = self.ler_cursor() is None
+        return context
+
+class LancamentoEditView(MedirValidacaoMixin, UpdateView):
     model = Lancamento
     form_class = LancamentoForm
     template_name = 'form.html' # Reutilizamos o mesmo template de criação
@@ -30,4 +196,174 @@ class LancamentoEditView(UpdateView):
         context = super().get_context_data(**kwargs)
         # Mudamos o título para o usuário saber que está editando
         context['titulo'] = "Editar Lançamento"
-        return context
\ No newline at end of file
+        return context
+
+
+# --- Versões assíncronas (ASGI) ---
+# Mesma lógica das views acima, mas o acesso ao banco usa o ORM assíncrono
+# (async for / aget / asave): a requisição não prende uma thread enquanto
+# espera o banco. Os querysets são materializados antes do render, pois o
+# template não pode disparar queries síncronas.
+
+class ListaLancamentosAsyncView(ListaLancamentosView):
+    url_lista = 'lista_lancamentos_async'
+    url_criar = 'criar_lancamento_async'
+    url_editar = 'editar_lancamento_async'
+
+    async def get(self, request, *args, **kwargs):
+        versao = await VersaoLedger.aatual()
+        if (resposta := self.nao_modificado(request, versao)) is not None:
+            return resposta
+        conteudo = await cache.aget(self.chave_cache(versao)) if getattr(settings, 'LISTA_CACHE_TTL', 300) else None
+        if conteudo is None:
+            self.object_list = [lancamento async for lancamento in self.get_queryset()]
+        return self.responder(versao, conteudo, lambda: self.render_to_response(self.get_context_data()))
+
+class CriarLancamentoAsyncView(CriarLancamentoView):
+    success_url = reverse_lazy('lista_lancamentos_async')
+
+    async def get(self, request, *args, **kwargs):
+        self.object = None
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        self.object = None
+        form = self.get_form()
+        # A validação consulta o banco (competência fechada): fora do loop de eventos
+        if not await sync_to_async(form.is_valid)():
+            return self.form_invalid(form)
+        self.object = form.save(commit=False)
+        await self.object.asave()
+        return HttpResponseRedirect(self.get_success_url())
+
+    async def put(self, *args, **kwargs):
+        return await self.post(*args, **kwargs)
+
+class LancamentoEditAsyncView(LancamentoEditView):
+    success_url = reverse_lazy('lista_lancamentos_async')
+
+    async def aget_object(self):
+        try:
+            return await self.get_queryset().aget(pk=self.kwargs[self.pk_url_kwarg])
+        except self.model.DoesNotExist:
+            raise Http404("Lançamento não encontrado.")
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        form = self.get_form()
+        # A validação consulta o banco (competência fechada): fora do loop de eventos
+        if not await sync_to_async(form.is_valid)():
+            return self.form_invalid(form)
+        self.object = form.save(commit=False)
+        await self.object.asave()
+        return HttpResponseRedirect(self.get_success_url())
+
+    async def put(self, *args, **kwargs):
+        return await self.post(*args, **kwargs)
+
+class ResumoCompetenciasView(View):
+    """
+    Totais por competência e por ano (13º incluso), em JSON.
+
+    Lê apenas a tabela ResumoCompetencia: o custo depende do número de
+    períodos, não do número de lançamentos. Aceita ?ano=AAAA.
+    """
+
+    def get(self, request, *args, **kwargs):
+        resumos = ResumoCompetencia.objects.all()
+        ano = request.GET.get('ano')
+        if ano:
+            try:
+                ano = int(ano)
+            except ValueError:
+                return JsonResponse({'erro': "Parâmetro 'ano' deve ser numérico."}, status=400)
+            resumos = resumos.filter(competencia__ano=ano)
+
+        competencias = []
+        anos = {}
+        for resumo in resumos:
+            comp = resumo.competencia
+            competencias.append({
+                'competencia': comp.as_int,
+                'formatada': str(comp),
+                'mes': comp.descricao_mes,
+                'total': resumo.total.decimal,
+                'quantidade': resumo.quantidade,
+            })
+            acumulado = anos.setdefault(comp.ano, {'ano': comp.ano, 'total': 0, 'quantidade': 0})
+            acumulado['total'] += resumo.total.decimal
+            acumulado['quantidade'] += resumo.quantidade
+
+        return JsonResponse({'competencias': competencias, 'anos': list(anos.values())})
+
+class RelatorioSaldosView(View):
+    """
+    Saldos por competência em JSON: total, acumulado, acumulado no ano e
+    variação contra a competência anterior. Aceita ?de=&ate= (AAAAMM ou MM/AAAA).
+    """
+
+    def get(self, request, *args, **kwargs):
+        try:
+            de, ate = exportacao.intervalo_competencias(request.GET.get('de'), request.GET.get('ate'))
+        except (ValueError, TypeError):
+            return JsonResponse({'erro': "Competência inválida em 'de'/'ate'."}, status=400)
+
+        # Sem queryset: tabela quente + arquivo das competências fechadas
+        linhas = relatorios.saldos_por_competencia(de=de, ate=ate)
+        for linha in linhas:
+            competencia = linha['competencia']
+            linha['competencia'] = competencia.as_int
+            linha['formatada'] = str(competencia)
+            for campo in ('total', 'acumulado', 'acumulado_ano', 'variacao'):
+                linha[campo] = linha[campo].decimal
+        return JsonResponse({'saldos': linhas})
+
+class ExportarLancamentosView(View):
+    """
+    Exporta o ledger em streaming: ?formato=csv|jsonl&de=AAAAMM&ate=AAAAMM.
+    As linhas são geradas sob demanda, então a memória não cresce com a tabela.
+    """
+    content_types = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+
+    def get(self, request, *args, **kwargs):
+        formato = request.GET.get('formato', 'csv')
+        if formato not in exportacao.FORMATOS:
+            return JsonResponse({'erro': f"Formato inválido: {formato}."}, status=400)
+        try:
+            de, ate = exportacao.intervalo_competencias(request.GET.get('de'), request.GET.get('ate'))
+        except (ValueError, TypeError):
+            return JsonResponse({'erro': "Competência inválida em 'de'/'ate'."}, status=400)
+
+        resposta = StreamingHttpResponse(
+            exportacao.serializar(exportacao.registros(de, ate), formato),
+            content_type=self.content_types[formato],
+        )
+        resposta['Content-Disposition'] = f'attachment; filename="lancamentos.{formato}"'
+        return resposta
+
+class MetricasView(View):
+    """
+    Métricas da instrumentação em texto Prometheus.
+    Só existe com settings.METRICAS_ATIVAS (404 sem ela) e só atende
+    chamadas locais (loopback ou INTERNAL_IPS). Atrás de um proxy reverso
+    na mesma máquina todo cliente parece local: aí, deixe METRICAS_ATIVAS
+    desligado ou bloqueie /metricas/ no proxy.
+    """
+    ips_locais = {'127.0.0.1', '::1'}
+
+    def get(self, request, *args, **kwargs):
+        if not getattr(settings, 'METRICAS_ATIVAS', False):
+            raise Http404
+        ip = request.META.get('REMOTE_ADDR')
+        if ip not in self.ips_locais and ip not in getattr(settings, 'INTERNAL_IPS', ()):
+            return HttpResponseForbidden("Métricas disponíveis apenas localmente.")
+        corpo = metricas.como_prometheus()
+        if getattr(settings, 'LEDGER_COLUNAR_ATIVO', False):
+            from . import colunar
+            if colunar.atual() is not None:
+                corpo += colunar.atual().como_prometheus()
+        return HttpResponse(corpo, content_type='text/plain; version=0.0.4')